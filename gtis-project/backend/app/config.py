@@ -7,10 +7,55 @@ class Settings(BaseSettings):
     API_HOST: str = "0.0.0.0"
     API_PORT: int = 8000
     DATABASE_URL: str = "sqlite:///data/gtis.db"
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_CACHE_SIZE_KB: int = 65536
+    SQLITE_MMAP_SIZE: int = 268435456
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    DB_READER_THREADS: int = 4
+    TREND_ARCHIVE_DIR: str = ""
+    RETENTION_DAILY_DAYS: int = 90
+    RETENTION_WEEKLY_DAYS: int = 730
+    COMPACTION_INTERVAL_HOURS: float = 0
+    WATCHLIST_ENABLED: bool = True
+    WATCHLIST_POLL_SECONDS: float = 60
+    WATCHLIST_REFRESH_MINUTES: int = 360
+    WATCHLIST_CONCURRENCY: int = 2
     MODEL_CACHE_DIR: str = "models/cache"
-    PYTRENDS_RATE_LIMIT: int = 1
+    MODEL_CACHE_MAX_ENTRIES: int = 64
+    MODEL_CACHE_PERSIST: bool = True
+    MODEL_CACHE_MAX_DISK_MB: float = 1024
+    EMBEDDING_CACHE_DIR: str = "models/embeddings"
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 4096
+    EMBEDDING_BATCH_SIZE: int = 64
+    PYTRENDS_RATE_LIMIT: float = 1.0
+    PYTRENDS_BURST: int = 1
+    PYTRENDS_WORKERS: int = 2
+    PYTRENDS_MAX_RETRIES: int = 4
+    PYTRENDS_BACKOFF_SECONDS: float = 2.0
+    PYTRENDS_CACHE_ENABLED: bool = True
+    PYTRENDS_CACHE_MAX_ENTRIES: int = 512
+    PYTRENDS_CACHE_PERSIST: bool = False
     DEFAULT_PREDICTION_PERIODS: int = 30
     FORECAST_CONFIDENCE_LEVEL: float = 0.95
+    FORECAST_WORKERS: int = 2
+    FORECAST_MAX_PENDING: int = 32
+    FORECAST_TIMEOUT_SECONDS: float = 120.0
+    FORECAST_MP_CONTEXT: str = "spawn"
+    ARIMA_MAX_P: int = 3
+    ARIMA_MAX_D: int = 2
+    ARIMA_MAX_Q: int = 3
+    ARIMA_CRITERION: str = "aic"
+    ARIMA_ORDER_MAX_AGE_HOURS: float = 168
+    ARIMA_ORDER_MAX_LENGTH_CHANGE: float = 0.25
+    BACKTEST_HOLDOUT_DAYS: int = 28
+    BACKTEST_HORIZON: int = 7
+    BACKTEST_ORIGINS: int = 4
+    BACKTEST_CACHE_ENTRIES: int = 256
+    GLOBAL_MODEL_KIND: str = "ridge"
+    GLOBAL_MODEL_HISTORY_DAYS: int = 365
+    GLOBAL_MODEL_TRAIN_INTERVAL_HOURS: float = 24
+    ML_WARMUP_ON_STARTUP: bool = True
     
     class Config:
         env_file = ".env"
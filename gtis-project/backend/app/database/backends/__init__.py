@@ -0,0 +1,18 @@
+from .base import StorageBackend
+
+def sqlite_path_from_url(url: str):
+    path = url.split("://", 1)[1]
+    return path[1:] if path.startswith("/") else path
+
+def create_backend(database_url: str) -> StorageBackend:
+    scheme = database_url.split("://", 1)[0].split("+", 1)[0].lower()
+    if scheme == "sqlite":
+        from .sqlite_backend import SQLiteBackend
+        return SQLiteBackend(sqlite_path_from_url(database_url))
+    if scheme == "duckdb":
+        from .duckdb_backend import DuckDBBackend
+        return DuckDBBackend(sqlite_path_from_url(database_url))
+    if scheme in ("postgres", "postgresql"):
+        from .postgres_backend import PostgresBackend
+        return PostgresBackend(database_url.replace("postgresql+psycopg://", "postgresql://", 1))
+    raise ValueError(f"Unsupported DATABASE_URL scheme: {scheme}")
@@ -0,0 +1,137 @@
+import json
+from abc import ABC, abstractmethod
+import pandas as pd
+
+FORECAST_SERIES_KEYS = ('dates', 'values', 'lower_bound', 'upper_bound')
+EMPTY_INGEST = {"rows_written": 0, "rows_inserted": 0, "rows_updated": 0}
+
+def melt_trends(data: pd.DataFrame, keywords: list, geo: str = ""):
+    columns = [keyword for keyword in keywords if keyword in data.columns]
+    if data.empty or not columns:
+        return None
+    df = data[columns].rename_axis('date').reset_index()
+    df = df.melt(id_vars='date', var_name='keyword', value_name='interest_value')
+    df = df.dropna(subset=['interest_value'])
+    df['date'] = pd.to_datetime(df['date'])
+    df['interest_value'] = df['interest_value'].astype(float)
+    df['geo'] = geo
+    df = df.drop_duplicates(subset=['keyword', 'date', 'geo'], keep='last')
+    return df[['keyword', 'date', 'interest_value', 'geo']].reset_index(drop=True)
+
+def widen_histories(df: pd.DataFrame, keywords: list):
+    wide = df.pivot(index='date', columns='keyword', values='interest_value').reindex(columns=keywords)
+    wide.index = pd.to_datetime(wide.index)
+    wide.index.name = 'date'
+    wide.columns.name = None
+    return wide.sort_index()
+
+def day_bounds(start=None, end=None):
+    start = pd.Timestamp(start) if start is not None else None
+    end = pd.Timestamp(end).normalize() + pd.Timedelta(days=1) if end is not None else None
+    return start, end
+
+def flatten_forecasts(forecasts: list):
+    run_rows = []
+    prediction_rows = []
+    for forecast in forecasts:
+        keyword = forecast['keyword']
+        horizon = int(forecast['horizon'])
+        fingerprint = forecast['fingerprint']
+        for model_name, pred in forecast['predictions'].items():
+            metrics = {k: v for k, v in pred.items() if k not in FORECAST_SERIES_KEYS}
+            run_rows.append((keyword, model_name, horizon, fingerprint, json.dumps(metrics, default=float)))
+            lower = pred.get('lower_bound') or [None] * len(pred['dates'])
+            upper = pred.get('upper_bound') or [None] * len(pred['dates'])
+            for date, value, low, high in zip(pred['dates'], pred['values'], lower, upper):
+                prediction_rows.append((keyword, date, float(value), model_name, low, high, horizon, fingerprint))
+    return run_rows, prediction_rows
+
+def assemble_forecast(runs, rows):
+    predictions = {model_name: {'dates': [], 'values': [], **json.loads(metrics or '{}')}
+                   for model_name, metrics in runs}
+    for model_name, date, value, low, high in rows:
+        pred = predictions.get(model_name)
+        if pred is None:
+            continue
+        pred['dates'].append(date)
+        pred['values'].append(value)
+        if low is not None and high is not None:
+            pred.setdefault('lower_bound', []).append(low)
+            pred.setdefault('upper_bound', []).append(high)
+    return predictions
+
+WATCH_COLUMNS = ("keyword", "geo", "timeframe", "refresh_minutes", "horizon", "created_at",
+                 "last_refreshed_at", "last_error")
+
+def watch_records(rows):
+    watches = []
+    for row in rows:
+        watch = dict(zip(WATCH_COLUMNS, row))
+        for column in ("created_at", "last_refreshed_at"):
+            if watch[column] is not None:
+                watch[column] = pd.Timestamp(watch[column]).to_pydatetime()
+        watches.append(watch)
+    return watches
+
+class StorageBackend(ABC):
+    name = "base"
+    supports_compaction = False
+
+    @abstractmethod
+    def store_trends(self, data: pd.DataFrame, keywords: list, geo: str = ""):
+        ...
+
+    @abstractmethod
+    def get_trend_history(self, keyword: str, days: int = 365, geo: str = ""):
+        ...
+
+    @abstractmethod
+    def get_trend_histories(self, keywords: list, geo: str = "", start=None, end=None):
+        ...
+
+    @abstractmethod
+    def list_keywords(self, geo: str = ""):
+        ...
+
+    @abstractmethod
+    def store_predictions(self, forecasts: list):
+        ...
+
+    @abstractmethod
+    def get_predictions(self, keys: list):
+        ...
+
+    @abstractmethod
+    def add_watch(self, keyword: str, geo: str, timeframe: str, refresh_minutes: int, horizon: int):
+        ...
+
+    @abstractmethod
+    def remove_watch(self, keyword: str, geo: str = ""):
+        ...
+
+    @abstractmethod
+    def list_watches(self):
+        ...
+
+    @abstractmethod
+    def mark_watch_refreshed(self, keyword: str, geo: str, refreshed_at, error: str = None):
+        ...
+
+    def compact(self, downsample_trends: bool = True):
+        raise NotImplementedError(f"Compaction is not supported by the {self.name} backend")
+
+    def last_compaction(self):
+        return None
+
+    def get_trend_rollups(self, keyword: str, geo: str = "", resolution: str = None):
+        return pd.DataFrame(columns=['resolution', 'interest_value', 'n_rows'], index=pd.DatetimeIndex([], name='date'))
+
+    @abstractmethod
+    def check_connection(self):
+        ...
+
+    def stats(self):
+        return {"backend": self.name}
+
+    def close(self):
+        pass
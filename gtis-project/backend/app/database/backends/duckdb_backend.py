@@ -0,0 +1,261 @@
+import os
+import threading
+import pandas as pd
+
+from .base import (
+    EMPTY_INGEST, WATCH_COLUMNS, StorageBackend, assemble_forecast, day_bounds, flatten_forecasts, melt_trends,
+    watch_records, widen_histories
+)
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS trends (
+        keyword VARCHAR NOT NULL,
+        date TIMESTAMP NOT NULL,
+        interest_value DOUBLE NOT NULL,
+        geo VARCHAR NOT NULL DEFAULT '',
+        created_at TIMESTAMP DEFAULT current_timestamp,
+        PRIMARY KEY (keyword, date, geo)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS predictions (
+        keyword VARCHAR NOT NULL,
+        prediction_date DATE NOT NULL,
+        predicted_value DOUBLE NOT NULL,
+        model_name VARCHAR NOT NULL,
+        confidence_lower DOUBLE,
+        confidence_upper DOUBLE,
+        horizon INTEGER,
+        fingerprint VARCHAR,
+        created_at TIMESTAMP DEFAULT current_timestamp
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS prediction_runs (
+        keyword VARCHAR NOT NULL,
+        model_name VARCHAR NOT NULL,
+        horizon INTEGER NOT NULL,
+        fingerprint VARCHAR NOT NULL,
+        metrics VARCHAR,
+        created_at TIMESTAMP DEFAULT current_timestamp,
+        PRIMARY KEY (keyword, fingerprint, horizon, model_name)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS watchlist (
+        keyword VARCHAR NOT NULL,
+        geo VARCHAR NOT NULL DEFAULT '',
+        timeframe VARCHAR NOT NULL,
+        refresh_minutes INTEGER NOT NULL,
+        horizon INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT current_timestamp,
+        last_refreshed_at TIMESTAMP,
+        last_error VARCHAR,
+        PRIMARY KEY (keyword, geo)
+    )
+    """,
+]
+
+class DuckDBBackend(StorageBackend):
+    name = "duckdb"
+
+    def __init__(self, db_path: str):
+        if duckdb is None:
+            raise ImportError("duckdb is required for duckdb:// database URLs")
+        self.db_path = db_path
+        if db_path != ":memory:" and os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = duckdb.connect(db_path)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._cursors = []
+        for statement in SCHEMA:
+            self._conn.execute(statement)
+
+    def _cursor(self):
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            cursor = self._conn.cursor()
+            self._local.cursor = cursor
+            with self._lock:
+                self._cursors.append(cursor)
+        return cursor
+
+    def store_trends(self, data: pd.DataFrame, keywords: list, geo: str = ""):
+        incoming = melt_trends(data, keywords, geo)
+        if incoming is None:
+            return dict(EMPTY_INGEST)
+
+        incoming['date'] = incoming['date'].astype('datetime64[us]')
+        cursor = self._cursor()
+        cursor.register("incoming_trends", incoming)
+        try:
+            cursor.begin()
+            rows_updated = cursor.execute("""
+                SELECT COUNT(*) FROM incoming_trends s
+                JOIN trends t ON t.keyword = s.keyword AND t.date = s.date AND t.geo = s.geo
+            """).fetchone()[0]
+            cursor.execute("""
+                INSERT INTO trends (keyword, date, interest_value, geo)
+                SELECT keyword, date, interest_value, geo FROM incoming_trends
+                ON CONFLICT (keyword, date, geo) DO UPDATE SET
+                    interest_value = excluded.interest_value,
+                    created_at = now()::TIMESTAMP
+            """)
+            cursor.commit()
+        except Exception:
+            cursor.rollback()
+            raise
+        finally:
+            cursor.unregister("incoming_trends")
+
+        return {
+            "rows_written": len(incoming),
+            "rows_inserted": len(incoming) - rows_updated,
+            "rows_updated": rows_updated
+        }
+
+    def get_trend_history(self, keyword: str, days: int = 365, geo: str = ""):
+        df = self._cursor().execute("""
+            SELECT date, interest_value
+            FROM trends
+            WHERE keyword = ? AND geo = ?
+            ORDER BY date DESC
+            LIMIT ?
+        """, [keyword, geo, days]).df()
+        if not df.empty:
+            df = df.set_index('date').sort_index()
+        return df
+
+    def get_trend_histories(self, keywords: list, geo: str = "", start=None, end=None):
+        start, end = day_bounds(start, end)
+        df = self._cursor().execute("""
+            SELECT keyword, date, interest_value
+            FROM trends
+            WHERE list_contains(?, keyword) AND geo = ?
+            AND (? IS NULL OR date >= ?)
+            AND (? IS NULL OR date < ?)
+        """, [keywords, geo, start, start, end, end]).df()
+        return widen_histories(df, keywords)
+
+    def list_keywords(self, geo: str = ""):
+        rows = self._cursor().execute(
+            "SELECT DISTINCT keyword FROM trends WHERE geo = ? ORDER BY keyword", [geo]
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def store_predictions(self, forecasts: list):
+        run_rows, prediction_rows = flatten_forecasts(forecasts)
+        if not run_rows:
+            return 0
+
+        runs = pd.DataFrame(run_rows, columns=['keyword', 'model_name', 'horizon', 'fingerprint', 'metrics'])
+        points = pd.DataFrame(prediction_rows, columns=[
+            'keyword', 'prediction_date', 'predicted_value', 'model_name',
+            'confidence_lower', 'confidence_upper', 'horizon', 'fingerprint'
+        ])
+        points['prediction_date'] = pd.to_datetime(points['prediction_date']).dt.date
+        points[['confidence_lower', 'confidence_upper']] = points[['confidence_lower', 'confidence_upper']].astype(float)
+
+        cursor = self._cursor()
+        cursor.register("incoming_runs", runs)
+        cursor.register("incoming_points", points)
+        try:
+            cursor.begin()
+            cursor.execute("""
+                DELETE FROM predictions p USING incoming_runs r
+                WHERE p.keyword = r.keyword AND p.model_name = r.model_name
+                AND p.horizon = r.horizon AND p.fingerprint = r.fingerprint
+            """)
+            cursor.execute("""
+                INSERT INTO prediction_runs (keyword, model_name, horizon, fingerprint, metrics)
+                SELECT keyword, model_name, horizon, fingerprint, metrics FROM incoming_runs
+                ON CONFLICT (keyword, fingerprint, horizon, model_name) DO UPDATE SET
+                    metrics = excluded.metrics,
+                    created_at = now()::TIMESTAMP
+            """)
+            cursor.execute("""
+                INSERT INTO predictions (keyword, prediction_date, predicted_value, model_name,
+                                         confidence_lower, confidence_upper, horizon, fingerprint)
+                SELECT keyword, prediction_date, predicted_value, model_name,
+                       confidence_lower, confidence_upper, horizon, fingerprint
+                FROM incoming_points
+            """)
+            cursor.commit()
+        except Exception:
+            cursor.rollback()
+            raise
+        finally:
+            cursor.unregister("incoming_runs")
+            cursor.unregister("incoming_points")
+        return len(prediction_rows)
+
+    def get_predictions(self, keys: list):
+        cursor = self._cursor()
+        results = {}
+        for keyword, horizon, fingerprint in keys:
+            params = [keyword, fingerprint, int(horizon)]
+            runs = cursor.execute("""
+                SELECT model_name, metrics FROM prediction_runs
+                WHERE keyword = ? AND fingerprint = ? AND horizon = ?
+            """, params).fetchall()
+            if runs:
+                rows = cursor.execute("""
+                    SELECT model_name, strftime(prediction_date, '%Y-%m-%d'), predicted_value,
+                           confidence_lower, confidence_upper
+                    FROM predictions
+                    WHERE keyword = ? AND fingerprint = ? AND horizon = ?
+                    ORDER BY model_name, prediction_date
+                """, params).fetchall()
+                results[(keyword, int(horizon), fingerprint)] = assemble_forecast(runs, rows)
+        return results
+
+    def add_watch(self, keyword: str, geo: str, timeframe: str, refresh_minutes: int, horizon: int):
+        self._cursor().execute("""
+            INSERT INTO watchlist (keyword, geo, timeframe, refresh_minutes, horizon)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (keyword, geo) DO UPDATE SET
+                timeframe = excluded.timeframe,
+                refresh_minutes = excluded.refresh_minutes,
+                horizon = excluded.horizon
+        """, [keyword, geo, timeframe, int(refresh_minutes), int(horizon)])
+
+    def remove_watch(self, keyword: str, geo: str = ""):
+        removed = self._cursor().execute(
+            "DELETE FROM watchlist WHERE keyword = ? AND geo = ? RETURNING keyword", [keyword, geo]
+        ).fetchall()
+        return len(removed) > 0
+
+    def list_watches(self):
+        rows = self._cursor().execute(
+            f"SELECT {', '.join(WATCH_COLUMNS)} FROM watchlist ORDER BY keyword, geo"
+        ).fetchall()
+        return watch_records(rows)
+
+    def mark_watch_refreshed(self, keyword: str, geo: str, refreshed_at, error: str = None):
+        self._cursor().execute("""
+            UPDATE watchlist SET last_refreshed_at = ?, last_error = ?
+            WHERE keyword = ? AND geo = ?
+        """, [refreshed_at, error, keyword, geo])
+
+    def check_connection(self):
+        self._cursor().execute("SELECT 1").fetchone()
+        return True
+
+    def stats(self):
+        with self._lock:
+            return {"backend": self.name, "open_cursors": len(self._cursors)}
+
+    def close(self):
+        with self._lock:
+            for cursor in self._cursors:
+                cursor.close()
+            self._cursors.clear()
+        self._local = threading.local()
+        self._conn.close()
@@ -0,0 +1,258 @@
+import threading
+import pandas as pd
+
+from .base import (
+    EMPTY_INGEST, WATCH_COLUMNS, StorageBackend, assemble_forecast, day_bounds, flatten_forecasts, melt_trends,
+    watch_records, widen_histories
+)
+
+try:
+    import psycopg
+except ImportError:
+    psycopg = None
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS trends (
+        id BIGSERIAL PRIMARY KEY,
+        keyword TEXT NOT NULL,
+        date TIMESTAMP NOT NULL,
+        interest_value DOUBLE PRECISION NOT NULL,
+        geo TEXT NOT NULL DEFAULT '',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE (keyword, date, geo)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_trends_keyword_geo_date
+    ON trends (keyword, geo, date) INCLUDE (interest_value)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS predictions (
+        id BIGSERIAL PRIMARY KEY,
+        keyword TEXT NOT NULL,
+        prediction_date DATE NOT NULL,
+        predicted_value DOUBLE PRECISION NOT NULL,
+        model_name TEXT NOT NULL,
+        confidence_lower DOUBLE PRECISION,
+        confidence_upper DOUBLE PRECISION,
+        horizon INTEGER,
+        fingerprint TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_predictions_fingerprint
+    ON predictions (keyword, fingerprint, horizon, model_name, prediction_date)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS prediction_runs (
+        id BIGSERIAL PRIMARY KEY,
+        keyword TEXT NOT NULL,
+        model_name TEXT NOT NULL,
+        horizon INTEGER NOT NULL,
+        fingerprint TEXT NOT NULL,
+        metrics TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE (keyword, fingerprint, horizon, model_name)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS watchlist (
+        id BIGSERIAL PRIMARY KEY,
+        keyword TEXT NOT NULL,
+        geo TEXT NOT NULL DEFAULT '',
+        timeframe TEXT NOT NULL,
+        refresh_minutes INTEGER NOT NULL,
+        horizon INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        last_refreshed_at TIMESTAMP,
+        last_error TEXT,
+        UNIQUE (keyword, geo)
+    )
+    """,
+]
+
+class PostgresBackend(StorageBackend):
+    name = "postgresql"
+
+    def __init__(self, url: str):
+        if psycopg is None:
+            raise ImportError("psycopg is required for postgresql:// database URLs")
+        self.url = url
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+        with self._connection().transaction():
+            for statement in SCHEMA:
+                self._connection().execute(statement)
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or conn.closed:
+            conn = psycopg.connect(self.url, autocommit=True)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def store_trends(self, data: pd.DataFrame, keywords: list, geo: str = ""):
+        incoming = melt_trends(data, keywords, geo)
+        if incoming is None:
+            return dict(EMPTY_INGEST)
+
+        conn = self._connection()
+        with conn.transaction(), conn.cursor() as cursor:
+            cursor.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS trends_staging (
+                    keyword TEXT NOT NULL,
+                    date TIMESTAMP NOT NULL,
+                    interest_value DOUBLE PRECISION NOT NULL,
+                    geo TEXT NOT NULL
+                ) ON COMMIT DELETE ROWS
+            """)
+            with cursor.copy("COPY trends_staging (keyword, date, interest_value, geo) FROM STDIN") as copy:
+                for row in incoming.itertuples(index=False, name=None):
+                    copy.write_row(row)
+            rows_updated = cursor.execute("""
+                SELECT COUNT(*) FROM trends_staging s
+                JOIN trends t ON t.keyword = s.keyword AND t.date = s.date AND t.geo = s.geo
+            """).fetchone()[0]
+            cursor.execute("""
+                INSERT INTO trends (keyword, date, interest_value, geo)
+                SELECT keyword, date, interest_value, geo FROM trends_staging
+                ON CONFLICT (keyword, date, geo) DO UPDATE SET
+                    interest_value = excluded.interest_value,
+                    created_at = CURRENT_TIMESTAMP
+            """)
+
+        return {
+            "rows_written": len(incoming),
+            "rows_inserted": len(incoming) - rows_updated,
+            "rows_updated": rows_updated
+        }
+
+    def _frame(self, query: str, params):
+        with self._connection().cursor() as cursor:
+            cursor.execute(query, params)
+            columns = [column.name for column in cursor.description]
+            return pd.DataFrame(cursor.fetchall(), columns=columns)
+
+    def get_trend_history(self, keyword: str, days: int = 365, geo: str = ""):
+        df = self._frame("""
+            SELECT date, interest_value
+            FROM trends
+            WHERE keyword = %s AND geo = %s
+            ORDER BY date DESC
+            LIMIT %s
+        """, (keyword, geo, days))
+        if not df.empty:
+            df['date'] = pd.to_datetime(df['date'])
+            df = df.set_index('date').sort_index()
+        return df
+
+    def get_trend_histories(self, keywords: list, geo: str = "", start=None, end=None):
+        start, end = [bound.to_pydatetime() if bound is not None else None for bound in day_bounds(start, end)]
+        df = self._frame("""
+            SELECT keyword, date, interest_value
+            FROM trends
+            WHERE keyword = ANY(%s) AND geo = %s
+            AND (%s::timestamp IS NULL OR date >= %s::timestamp)
+            AND (%s::timestamp IS NULL OR date < %s::timestamp)
+        """, (keywords, geo, start, start, end, end))
+        return widen_histories(df, keywords)
+
+    def list_keywords(self, geo: str = ""):
+        df = self._frame("SELECT DISTINCT keyword FROM trends WHERE geo = %s ORDER BY keyword", (geo,))
+        return df['keyword'].tolist()
+
+    def store_predictions(self, forecasts: list):
+        run_rows, prediction_rows = flatten_forecasts(forecasts)
+        if not run_rows:
+            return 0
+
+        conn = self._connection()
+        with conn.transaction(), conn.cursor() as cursor:
+            cursor.executemany("""
+                DELETE FROM predictions
+                WHERE keyword = %s AND model_name = %s AND horizon = %s AND fingerprint = %s
+            """, [row[:4] for row in run_rows])
+            cursor.executemany("""
+                INSERT INTO prediction_runs (keyword, model_name, horizon, fingerprint, metrics)
+                VALUES (%s, %s, %s, %s, %s)
+                ON CONFLICT (keyword, fingerprint, horizon, model_name) DO UPDATE SET
+                    metrics = excluded.metrics,
+                    created_at = CURRENT_TIMESTAMP
+            """, run_rows)
+            with cursor.copy("""
+                COPY predictions (keyword, prediction_date, predicted_value, model_name,
+                                  confidence_lower, confidence_upper, horizon, fingerprint)
+                FROM STDIN
+            """) as copy:
+                for row in prediction_rows:
+                    copy.write_row(row)
+        return len(prediction_rows)
+
+    def get_predictions(self, keys: list):
+        results = {}
+        with self._connection().cursor() as cursor:
+            for keyword, horizon, fingerprint in keys:
+                params = (keyword, fingerprint, int(horizon))
+                runs = cursor.execute("""
+                    SELECT model_name, metrics FROM prediction_runs
+                    WHERE keyword = %s AND fingerprint = %s AND horizon = %s
+                """, params).fetchall()
+                if runs:
+                    rows = cursor.execute("""
+                        SELECT model_name, to_char(prediction_date, 'YYYY-MM-DD'), predicted_value,
+                               confidence_lower, confidence_upper
+                        FROM predictions
+                        WHERE keyword = %s AND fingerprint = %s AND horizon = %s
+                        ORDER BY model_name, prediction_date
+                    """, params).fetchall()
+                    results[(keyword, int(horizon), fingerprint)] = assemble_forecast(runs, rows)
+        return results
+
+    def add_watch(self, keyword: str, geo: str, timeframe: str, refresh_minutes: int, horizon: int):
+        self._connection().execute("""
+            INSERT INTO watchlist (keyword, geo, timeframe, refresh_minutes, horizon)
+            VALUES (%s, %s, %s, %s, %s)
+            ON CONFLICT (keyword, geo) DO UPDATE SET
+                timeframe = excluded.timeframe,
+                refresh_minutes = excluded.refresh_minutes,
+                horizon = excluded.horizon
+        """, (keyword, geo, timeframe, int(refresh_minutes), int(horizon)))
+
+    def remove_watch(self, keyword: str, geo: str = ""):
+        cursor = self._connection().execute("DELETE FROM watchlist WHERE keyword = %s AND geo = %s", (keyword, geo))
+        return cursor.rowcount > 0
+
+    def list_watches(self):
+        rows = self._connection().execute(
+            f"SELECT {', '.join(WATCH_COLUMNS)} FROM watchlist ORDER BY keyword, geo"
+        ).fetchall()
+        return watch_records(rows)
+
+    def mark_watch_refreshed(self, keyword: str, geo: str, refreshed_at, error: str = None):
+        self._connection().execute("""
+            UPDATE watchlist SET last_refreshed_at = %s, last_error = %s
+            WHERE keyword = %s AND geo = %s
+        """, (refreshed_at, error, keyword, geo))
+
+    def check_connection(self):
+        self._connection().execute("SELECT 1").fetchone()
+        return True
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": self.name,
+                "open_connections": len([conn for conn in self._connections if not conn.closed])
+            }
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
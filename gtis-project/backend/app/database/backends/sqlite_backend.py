@@ -0,0 +1,225 @@
+import os
+import pandas as pd
+
+from ...config import settings
+from ..compaction import MIN_DAILY_DAYS, TrendCompactor
+from ..connection import ConnectionPool
+from ..migrations import apply_migrations, schema_version
+from .base import (
+    EMPTY_INGEST, WATCH_COLUMNS, StorageBackend, assemble_forecast, day_bounds, flatten_forecasts, melt_trends,
+    watch_records, widen_histories
+)
+
+SQLITE_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+TREND_HISTORY_QUERY = """
+    SELECT date, interest_value
+    FROM trends
+    WHERE keyword = ? AND geo = ?
+    ORDER BY date DESC
+    LIMIT ?
+"""
+
+def trend_histories_query(n_keywords: int, has_start: bool = False, has_end: bool = False):
+    placeholders = ", ".join("?" * n_keywords)
+    return f"""
+        SELECT keyword, date, interest_value
+        FROM trends
+        WHERE keyword IN ({placeholders}) AND geo = ?
+        {"AND date >= ?" if has_start else ""}
+        {"AND date < ?" if has_end else ""}
+        ORDER BY keyword, date
+    """
+
+TREND_ROLLUPS_QUERY = """
+    SELECT date, resolution, interest_value, n_rows
+    FROM trend_rollups
+    WHERE keyword = ? AND geo = ? AND (? IS NULL OR resolution = ?)
+    ORDER BY date
+"""
+
+PREDICTIONS_QUERY = """
+    SELECT model_name, prediction_date, predicted_value, confidence_lower, confidence_upper
+    FROM predictions
+    WHERE keyword = ? AND fingerprint = ? AND horizon = ?
+    ORDER BY model_name, prediction_date
+"""
+
+PREDICTION_RUNS_QUERY = """
+    SELECT model_name, metrics
+    FROM prediction_runs
+    WHERE keyword = ? AND fingerprint = ? AND horizon = ?
+"""
+
+class SQLiteBackend(StorageBackend):
+    name = "sqlite"
+    supports_compaction = True
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.pool = ConnectionPool(
+            db_path,
+            journal_mode=settings.SQLITE_JOURNAL_MODE,
+            synchronous=settings.SQLITE_SYNCHRONOUS,
+            cache_size_kb=settings.SQLITE_CACHE_SIZE_KB,
+            mmap_size=settings.SQLITE_MMAP_SIZE,
+            busy_timeout_ms=settings.SQLITE_BUSY_TIMEOUT_MS
+        )
+        self.compactor = TrendCompactor(
+            self.pool,
+            daily_days=settings.RETENTION_DAILY_DAYS,
+            weekly_days=settings.RETENTION_WEEKLY_DAYS,
+            min_daily_days=max(MIN_DAILY_DAYS, settings.GLOBAL_MODEL_HISTORY_DAYS)
+        )
+        self.applied_migrations = apply_migrations(self.pool.connection())
+
+    def schema_version(self):
+        return schema_version(self.pool.connection())
+
+    def store_trends(self, data: pd.DataFrame, keywords: list, geo: str = ""):
+        df = melt_trends(data, keywords, geo)
+        if df is None:
+            return dict(EMPTY_INGEST)
+        df['date'] = df['date'].dt.strftime(SQLITE_DATE_FORMAT)
+        rows = list(df.itertuples(index=False, name=None))
+
+        with self.pool.transaction() as conn:
+            conn.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS trends_staging (
+                    keyword TEXT NOT NULL,
+                    date DATE NOT NULL,
+                    interest_value REAL NOT NULL,
+                    geo TEXT NOT NULL
+                )
+            """)
+            conn.execute("DELETE FROM trends_staging")
+            conn.executemany("""
+                INSERT INTO trends_staging (keyword, date, interest_value, geo)
+                VALUES (?, ?, ?, ?)
+            """, rows)
+            rows_updated = conn.execute("""
+                SELECT COUNT(*) FROM trends_staging s
+                JOIN trends t ON t.keyword = s.keyword AND t.date = s.date AND t.geo = s.geo
+            """).fetchone()[0]
+            conn.execute("""
+                INSERT INTO trends (keyword, date, interest_value, geo)
+                SELECT keyword, date, interest_value, geo FROM trends_staging WHERE true
+                ON CONFLICT(keyword, date, geo) DO UPDATE SET
+                    interest_value = excluded.interest_value,
+                    created_at = CURRENT_TIMESTAMP
+            """)
+            conn.execute("DELETE FROM trends_staging")
+
+        return {
+            "rows_written": len(rows),
+            "rows_inserted": len(rows) - rows_updated,
+            "rows_updated": rows_updated
+        }
+
+    def get_trend_history(self, keyword: str, days: int = 365, geo: str = ""):
+        df = pd.read_sql_query(TREND_HISTORY_QUERY, self.pool.connection(), params=(keyword, geo, days))
+        if not df.empty:
+            df['date'] = pd.to_datetime(df['date'], format='ISO8601')
+            df = df.set_index('date').sort_index()
+        return df
+
+    def get_trend_histories(self, keywords: list, geo: str = "", start=None, end=None):
+        start, end = day_bounds(start, end)
+        bounds = [bound.strftime(SQLITE_DATE_FORMAT) for bound in (start, end) if bound is not None]
+        query = trend_histories_query(len(keywords), start is not None, end is not None)
+        df = pd.read_sql_query(query, self.pool.connection(), params=[*keywords, geo, *bounds])
+        df['date'] = pd.to_datetime(df['date'], format='ISO8601')
+        return widen_histories(df, keywords)
+
+    def list_keywords(self, geo: str = ""):
+        rows = self.pool.connection().execute(
+            "SELECT DISTINCT keyword FROM trends WHERE geo = ? ORDER BY keyword", (geo,)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def store_predictions(self, forecasts: list):
+        run_rows, prediction_rows = flatten_forecasts(forecasts)
+        if not run_rows:
+            return 0
+
+        with self.pool.transaction() as conn:
+            conn.executemany("""
+                DELETE FROM predictions
+                WHERE keyword = ? AND model_name = ? AND horizon = ? AND fingerprint = ?
+            """, [row[:4] for row in run_rows])
+            conn.executemany("""
+                INSERT INTO prediction_runs (keyword, model_name, horizon, fingerprint, metrics)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(keyword, fingerprint, horizon, model_name) DO UPDATE SET
+                    metrics = excluded.metrics,
+                    created_at = CURRENT_TIMESTAMP
+            """, run_rows)
+            conn.executemany("""
+                INSERT INTO predictions (keyword, prediction_date, predicted_value, model_name,
+                                         confidence_lower, confidence_upper, horizon, fingerprint)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, prediction_rows)
+        return len(prediction_rows)
+
+    def get_predictions(self, keys: list):
+        conn = self.pool.connection()
+        results = {}
+        for keyword, horizon, fingerprint in keys:
+            params = (keyword, fingerprint, int(horizon))
+            runs = conn.execute(PREDICTION_RUNS_QUERY, params).fetchall()
+            if runs:
+                rows = conn.execute(PREDICTIONS_QUERY, params).fetchall()
+                results[(keyword, int(horizon), fingerprint)] = assemble_forecast(runs, rows)
+        return results
+
+    def add_watch(self, keyword: str, geo: str, timeframe: str, refresh_minutes: int, horizon: int):
+        with self.pool.transaction() as conn:
+            conn.execute("""
+                INSERT INTO watchlist (keyword, geo, timeframe, refresh_minutes, horizon)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(keyword, geo) DO UPDATE SET
+                    timeframe = excluded.timeframe,
+                    refresh_minutes = excluded.refresh_minutes,
+                    horizon = excluded.horizon
+            """, (keyword, geo, timeframe, int(refresh_minutes), int(horizon)))
+
+    def remove_watch(self, keyword: str, geo: str = ""):
+        with self.pool.transaction() as conn:
+            return conn.execute("DELETE FROM watchlist WHERE keyword = ? AND geo = ?", (keyword, geo)).rowcount > 0
+
+    def list_watches(self):
+        rows = self.pool.connection().execute(
+            f"SELECT {', '.join(WATCH_COLUMNS)} FROM watchlist ORDER BY keyword, geo"
+        ).fetchall()
+        return watch_records(rows)
+
+    def mark_watch_refreshed(self, keyword: str, geo: str, refreshed_at, error: str = None):
+        with self.pool.transaction() as conn:
+            conn.execute("""
+                UPDATE watchlist SET last_refreshed_at = ?, last_error = ?
+                WHERE keyword = ? AND geo = ?
+            """, (refreshed_at.strftime(SQLITE_DATE_FORMAT), error, keyword, geo))
+
+    def compact(self, downsample_trends: bool = True):
+        return self.compactor.run(downsample_trends=downsample_trends)
+
+    def last_compaction(self):
+        return self.compactor.last_run
+
+    def get_trend_rollups(self, keyword: str, geo: str = "", resolution: str = None):
+        df = pd.read_sql_query(TREND_ROLLUPS_QUERY, self.pool.connection(),
+                               params=(keyword, geo, resolution, resolution))
+        df['date'] = pd.to_datetime(df['date'], format='ISO8601')
+        return df.set_index('date')
+
+    def check_connection(self):
+        self.pool.connection().execute("SELECT 1").fetchone()
+        return True
+
+    def stats(self):
+        return {"backend": self.name, **self.pool.stats()}
+
+    def close(self):
+        self.pool.close_all()
@@ -0,0 +1,150 @@
+import time
+from datetime import datetime, timedelta
+
+WEEK_START = "strftime('%Y-%m-%d 00:00:00', {column}, '-6 days', 'weekday 0')"
+MONTH_START = "strftime('%Y-%m-01 00:00:00', {column})"
+DAILY_ROWS = "SELECT keyword, geo, date, interest_value, 1 AS n_rows FROM trends"
+WEEKLY_ROLLUPS = "SELECT keyword, geo, date, interest_value, n_rows FROM trend_rollups WHERE resolution = 'W'"
+# History readers only query trends, so compaction keeps the windows they ask for there: a year of daily points
+# for forecasting and global training, and the five-year weekly range of an incremental refresh
+MIN_DAILY_DAYS = 366
+MIN_WEEKLY_DAYS = 1890
+
+class TrendCompactor:
+    def __init__(self, pool, daily_days: int = 90, weekly_days: int = 730, vacuum_pages: int = 0,
+                 min_daily_days: int = MIN_DAILY_DAYS, min_weekly_days: int = MIN_WEEKLY_DAYS):
+        self.pool = pool
+        self.daily_days = daily_days
+        self.weekly_days = weekly_days
+        self.min_daily_days = min_daily_days
+        self.min_weekly_days = min_weekly_days
+        self.vacuum_pages = vacuum_pages
+        self.last_run = None
+
+    def _cutoffs(self, now: datetime):
+        daily_days = max(self.daily_days, self.min_daily_days)
+        weekly_days = max(self.weekly_days, self.min_weekly_days, daily_days)
+        daily_cutoff = (now - timedelta(days=daily_days)).replace(hour=0, minute=0, second=0, microsecond=0)
+        daily_cutoff -= timedelta(days=(daily_cutoff.weekday() + 1) % 7)
+        weekly_cutoff = (now - timedelta(days=weekly_days)).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        fmt = '%Y-%m-%d %H:%M:%S'
+        return daily_cutoff.strftime(fmt), weekly_cutoff.strftime(fmt)
+
+    def _database_bytes(self, conn):
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return page_size * page_count, page_size * freelist
+
+    def _downsample(self, conn, resolution: str, period_start: str, lower: str, upper: str, sources: tuple):
+        # Aggregates go to trend_rollups so that the trends table never mixes in a coarser resolution.
+        # A lone point on its period start is already at that resolution and is left alone.
+        bucket_sql = f"MAX({period_start}, :lower)"
+        params = {"lower": lower, "upper": upper, "resolution": resolution}
+        conn.execute("DROP TABLE IF EXISTS temp.trends_compacted")
+        conn.execute(f"""
+            CREATE TEMP TABLE trends_compacted AS
+            SELECT keyword, geo, {bucket_sql.format(column="date")} AS bucket,
+                   SUM(interest_value * n_rows) / SUM(n_rows) AS interest_value,
+                   SUM(n_rows) AS n_rows, COUNT(*) AS n_source_rows
+            FROM ({" UNION ALL ".join(sources)})
+            WHERE date >= :lower AND date < :upper
+            GROUP BY keyword, geo, bucket
+            HAVING SUM(n_rows) > 1 OR MIN(date) != {period_start.format(column="MIN(date)")}
+        """, params)
+        n_groups, n_rows = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(n_source_rows), 0) FROM trends_compacted"
+        ).fetchone()
+        if n_groups:
+            # Cutoffs fall on bucket boundaries, so a bucket is only seen again when its rows were refetched
+            # after an earlier run; the newer fetch replaces the old aggregate instead of being weighted into it
+            conn.execute("""
+                INSERT INTO trend_rollups (keyword, geo, resolution, date, interest_value, n_rows)
+                SELECT keyword, geo, :resolution, bucket, interest_value, n_rows FROM trends_compacted WHERE true
+                ON CONFLICT(keyword, geo, resolution, date) DO UPDATE SET
+                    interest_value = excluded.interest_value,
+                    n_rows = excluded.n_rows
+            """, params)
+            compacted = [("trends", "")]
+            if WEEKLY_ROLLUPS in sources:
+                compacted.append(("trend_rollups", "AND resolution = 'W'"))
+            for table, resolution_filter in compacted:
+                conn.execute(f"""
+                    DELETE FROM {table}
+                    WHERE date >= :lower AND date < :upper {resolution_filter}
+                    AND EXISTS (
+                        SELECT 1 FROM trends_compacted c
+                        WHERE c.keyword = {table}.keyword AND c.geo = {table}.geo
+                        AND c.bucket = {bucket_sql.format(column=f"{table}.date")}
+                    )
+                """, params)
+        conn.execute("DROP TABLE temp.trends_compacted")
+        return n_groups, n_rows
+
+    def _prune_superseded_predictions(self, conn):
+        superseded = """
+            SELECT r.keyword, r.horizon, r.fingerprint, r.model_name FROM prediction_runs r
+            WHERE r.created_at < (
+                SELECT MAX(latest.created_at) FROM prediction_runs latest
+                WHERE latest.keyword = r.keyword AND latest.horizon = r.horizon
+                AND latest.model_name = r.model_name
+            )
+        """
+        n_predictions = conn.execute(f"""
+            DELETE FROM predictions
+            WHERE fingerprint IS NULL
+            OR (keyword, horizon, fingerprint, model_name) IN ({superseded})
+        """).rowcount
+        conn.execute(f"""
+            DELETE FROM prediction_runs
+            WHERE (keyword, horizon, fingerprint, model_name) IN ({superseded})
+        """)
+        return n_predictions
+
+    def _vacuum(self, conn):
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+        elif self.vacuum_pages:
+            conn.execute(f"PRAGMA incremental_vacuum({int(self.vacuum_pages)})").fetchall()
+        else:
+            conn.execute("PRAGMA incremental_vacuum").fetchall()
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("ANALYZE")
+
+    def run(self, downsample_trends: bool = True, now: datetime = None):
+        started = time.perf_counter()
+        conn = self.pool.connection()
+        bytes_before, _ = self._database_bytes(conn)
+        rows_before = conn.execute("SELECT COUNT(*) FROM trends").fetchone()[0]
+        daily_cutoff, weekly_cutoff = self._cutoffs(now or datetime.now())
+
+        weekly = monthly = (0, 0)
+        with self.pool.transaction() as conn:
+            if downsample_trends:
+                weekly = self._downsample(conn, "W", WEEK_START, weekly_cutoff, daily_cutoff, (DAILY_ROWS,))
+                monthly = self._downsample(conn, "M", MONTH_START, "0000-00-00", weekly_cutoff,
+                                           (DAILY_ROWS, WEEKLY_ROLLUPS))
+            predictions_pruned = self._prune_superseded_predictions(conn)
+
+        self._vacuum(conn)
+        bytes_after, free_bytes = self._database_bytes(conn)
+        self.last_run = {
+            "finished_at": datetime.now().isoformat(),
+            "duration_seconds": round(time.perf_counter() - started, 3),
+            "daily_cutoff": daily_cutoff,
+            "weekly_cutoff": weekly_cutoff,
+            "rows_before": rows_before,
+            "rows_after": conn.execute("SELECT COUNT(*) FROM trends").fetchone()[0],
+            "rollup_rows": conn.execute("SELECT COUNT(*) FROM trend_rollups").fetchone()[0],
+            "weekly_buckets_written": weekly[0],
+            "weekly_rows_compacted": weekly[1],
+            "monthly_buckets_written": monthly[0],
+            "monthly_rows_compacted": monthly[1],
+            "predictions_pruned": predictions_pruned,
+            "bytes_before": bytes_before,
+            "bytes_after": bytes_after,
+            "bytes_reclaimed": bytes_before - bytes_after,
+            "free_bytes_remaining": free_bytes
+        }
+        return self.last_run
@@ -0,0 +1,95 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+class ConnectionPool:
+    def __init__(self, db_path: str, journal_mode: str = "WAL", synchronous: str = "NORMAL",
+                 cache_size_kb: int = 65536, mmap_size: int = 268435456,
+                 busy_timeout_ms: int = 5000, cached_statements: int = 256):
+        self.db_path = db_path
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.cache_size_kb = cache_size_kb
+        self.mmap_size = mmap_size
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = {}
+        self._metrics = {
+            "connections_opened": 0,
+            "connections_closed": 0,
+            "checkouts": 0,
+            "transactions": 0,
+            "transaction_errors": 0
+        }
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout_ms / 1000,
+            check_same_thread=False,
+            cached_statements=self.cached_statements
+        )
+        conn.execute(f"PRAGMA journal_mode={self.journal_mode}")
+        conn.execute(f"PRAGMA synchronous={self.synchronous}")
+        conn.execute(f"PRAGMA cache_size=-{int(self.cache_size_kb)}")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    def _prune_dead_threads(self):
+        dead = [thread for thread in self._connections if not thread.is_alive()]
+        for thread in dead:
+            self._connections.pop(thread).close()
+            self._metrics["connections_closed"] += 1
+
+    def connection(self):
+        conn = getattr(self._local, "conn", None)
+        with self._lock:
+            self._metrics["checkouts"] += 1
+            if conn is not None:
+                return conn
+            self._prune_dead_threads()
+            conn = self._connect()
+            self._connections[threading.current_thread()] = conn
+            self._metrics["connections_opened"] += 1
+        self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        conn = self.connection()
+        try:
+            with conn:
+                yield conn
+        except Exception:
+            with self._lock:
+                self._metrics["transaction_errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._metrics["transactions"] += 1
+
+    def close_all(self):
+        with self._lock:
+            for conn in self._connections.values():
+                conn.close()
+                self._metrics["connections_closed"] += 1
+            self._connections.clear()
+            self._local = threading.local()
+
+    def stats(self):
+        with self._lock:
+            self._prune_dead_threads()
+            return {
+                **self._metrics,
+                "open_connections": len(self._connections),
+                "journal_mode": self.journal_mode,
+                "synchronous": self.synchronous,
+                "cache_size_kb": self.cache_size_kb,
+                "mmap_size": self.mmap_size,
+                "cached_statements": self.cached_statements
+            }
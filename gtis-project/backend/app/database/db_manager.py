@@ -1,84 +1,134 @@
-import sqlite3
+import asyncio
+import functools
 import pandas as pd
-from datetime import datetime
-import os
+from concurrent.futures import ThreadPoolExecutor
+
+from ..config import settings
+from .backends import create_backend
+from .parquet_store import ParquetTrendStore
 
 class DatabaseManager:
-    def __init__(self, db_path: str = "data/gtis.db"):
-        self.db_path = db_path
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
-        self._init_database()
-    
-    def _init_database(self):
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS trends (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                keyword TEXT NOT NULL,
-                date DATE NOT NULL,
-                interest_value REAL NOT NULL,
-                geo TEXT DEFAULT '',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(keyword, date, geo)
-            )
-        """)
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS predictions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                keyword TEXT NOT NULL,
-                prediction_date DATE NOT NULL,
-                predicted_value REAL NOT NULL,
-                model_name TEXT NOT NULL,
-                confidence_lower REAL,
-                confidence_upper REAL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        conn.commit()
-        conn.close()
-    
-    def store_trends(self, data: pd.DataFrame, keywords: list):
-        conn = sqlite3.connect(self.db_path)
-        for keyword in keywords:
-            if keyword in data.columns:
-                df = data[[keyword]].reset_index()
-                df.columns = ['date', 'interest_value']
-                df['keyword'] = keyword
-                df['geo'] = ''
-                
-                for _, row in df.iterrows():
-                    conn.execute("""
-                        INSERT OR REPLACE INTO trends (keyword, date, interest_value, geo)
-                        VALUES (?, ?, ?, ?)
-                    """, (row['keyword'], row['date'], row['interest_value'], row['geo']))
-        conn.commit()
-        conn.close()
-    
-    def get_trend_history(self, keyword: str, days: int = 365):
-        conn = sqlite3.connect(self.db_path)
-        query = """
-            SELECT date, interest_value
-            FROM trends
-            WHERE keyword = ?
-            ORDER BY date DESC
-            LIMIT ?
-        """
-        df = pd.read_sql_query(query, conn, params=(keyword, days))
-        conn.close()
-        
-        if not df.empty:
-            df['date'] = pd.to_datetime(df['date'])
-            df = df.set_index('date').sort_index()
-        return df
+    def __init__(self, db_path: str = None, trend_archive_dir: str = None, database_url: str = None):
+        if database_url is None:
+            database_url = f"sqlite:///{db_path}" if db_path else settings.DATABASE_URL
+        self.database_url = database_url
+        self.backend = create_backend(database_url)
+        self.db_path = getattr(self.backend, "db_path", None)
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gtis-db-writer")
+        self._readers = ThreadPoolExecutor(max_workers=settings.DB_READER_THREADS, thread_name_prefix="gtis-db-reader")
+        if trend_archive_dir is None:
+            trend_archive_dir = settings.TREND_ARCHIVE_DIR
+        self.trend_archive = ParquetTrendStore(trend_archive_dir) if trend_archive_dir else None
+    
+    def store_trends(self, data: pd.DataFrame, keywords: list, geo: str = ""):
+        if self.trend_archive is not None:
+            return self.trend_archive.store_trends(data, keywords, geo=geo)
+        return self.backend.store_trends(data, keywords, geo=geo)
+    
+    def get_trend_history(self, keyword: str, days: int = 365, geo: str = ""):
+        if self.trend_archive is not None:
+            return self.trend_archive.get_trend_history(keyword, days=days, geo=geo)
+        return self.backend.get_trend_history(keyword, days=days, geo=geo)
+    
+    def get_trend_histories(self, keywords: list, geo: str = "", start=None, end=None):
+        keywords = list(dict.fromkeys(keywords))
+        if not keywords:
+            return pd.DataFrame()
+        if self.trend_archive is not None:
+            return self.trend_archive.get_trend_histories(keywords, geo=geo, start=start, end=end)
+        return self.backend.get_trend_histories(keywords, geo=geo, start=start, end=end)
+    
+    def get_trend_rollups(self, keyword: str, geo: str = "", resolution: str = None):
+        return self.backend.get_trend_rollups(keyword, geo=geo, resolution=resolution)
+    
+    def list_keywords(self, geo: str = ""):
+        if self.trend_archive is not None:
+            return self.trend_archive.list_keywords(geo=geo)
+        return self.backend.list_keywords(geo=geo)
+    
+    def store_predictions(self, forecasts: list):
+        return self.backend.store_predictions(forecasts)
+    
+    def get_predictions(self, keys: list):
+        return self.backend.get_predictions(keys)
+    
+    def add_watch(self, keyword: str, geo: str = "", timeframe: str = "today 12-m", refresh_minutes: int = None,
+                  horizon: int = None):
+        self.backend.add_watch(
+            keyword, geo, timeframe,
+            refresh_minutes or settings.WATCHLIST_REFRESH_MINUTES,
+            horizon or settings.DEFAULT_PREDICTION_PERIODS
+        )
+
+    def remove_watch(self, keyword: str, geo: str = ""):
+        return self.backend.remove_watch(keyword, geo)
+
+    def list_watches(self):
+        return self.backend.list_watches()
+
+    def mark_watch_refreshed(self, keyword: str, geo: str, refreshed_at, error: str = None):
+        self.backend.mark_watch_refreshed(keyword, geo, refreshed_at, error)
+
+    def supports_compaction(self):
+        return self.backend.supports_compaction
+    
+    def compact(self):
+        return self.backend.compact(downsample_trends=self.trend_archive is None)
+    
+    def last_compaction(self):
+        return self.backend.last_compaction()
+    
+    async def _run_in(self, executor, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+    
+    async def store_trends_async(self, data: pd.DataFrame, keywords: list, geo: str = ""):
+        return await self._run_in(self._writer, self.store_trends, data, keywords, geo=geo)
+    
+    async def get_trend_history_async(self, keyword: str, days: int = 365, geo: str = ""):
+        return await self._run_in(self._readers, self.get_trend_history, keyword, days=days, geo=geo)
+    
+    async def get_trend_histories_async(self, keywords: list, geo: str = "", start=None, end=None):
+        return await self._run_in(self._readers, self.get_trend_histories, keywords, geo=geo, start=start, end=end)
+    
+    async def list_keywords_async(self, geo: str = ""):
+        return await self._run_in(self._readers, self.list_keywords, geo=geo)
+    
+    async def store_predictions_async(self, forecasts: list):
+        return await self._run_in(self._writer, self.store_predictions, forecasts)
+    
+    async def get_predictions_async(self, keys: list):
+        return await self._run_in(self._readers, self.get_predictions, keys)
+    
+    async def add_watch_async(self, keyword: str, geo: str = "", timeframe: str = "today 12-m",
+                              refresh_minutes: int = None, horizon: int = None):
+        return await self._run_in(self._writer, self.add_watch, keyword, geo, timeframe, refresh_minutes, horizon)
+
+    async def remove_watch_async(self, keyword: str, geo: str = ""):
+        return await self._run_in(self._writer, self.remove_watch, keyword, geo)
+
+    async def list_watches_async(self):
+        return await self._run_in(self._readers, self.list_watches)
+
+    async def mark_watch_refreshed_async(self, keyword: str, geo: str, refreshed_at, error: str = None):
+        return await self._run_in(self._writer, self.mark_watch_refreshed, keyword, geo, refreshed_at, error)
+
+    async def compact_async(self):
+        return await self._run_in(self._writer, self.compact)
+    
+    async def check_connection_async(self):
+        return await self._run_in(self._readers, self.check_connection)
     
     def check_connection(self):
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.close()
-            return True
+            return self.backend.check_connection()
         except:
             return False
+    
+    def pool_stats(self):
+        return self.backend.stats()
+    
+    def close(self):
+        self._writer.shutdown(wait=True)
+        self._readers.shutdown(wait=True)
+        self.backend.close()
@@ -0,0 +1,111 @@
+MIGRATIONS = [
+    (1, "initial_schema", [
+        """
+        CREATE TABLE IF NOT EXISTS trends (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            keyword TEXT NOT NULL,
+            date DATE NOT NULL,
+            interest_value REAL NOT NULL,
+            geo TEXT DEFAULT '',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(keyword, date, geo)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS predictions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            keyword TEXT NOT NULL,
+            prediction_date DATE NOT NULL,
+            predicted_value REAL NOT NULL,
+            model_name TEXT NOT NULL,
+            confidence_lower REAL,
+            confidence_upper REAL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    ]),
+    (2, "trends_covering_index", [
+        """
+        CREATE INDEX IF NOT EXISTS idx_trends_keyword_geo_date
+        ON trends (keyword, geo, date, interest_value)
+        """
+    ]),
+    (3, "predictions_lookup_index", [
+        """
+        CREATE INDEX IF NOT EXISTS idx_predictions_keyword_model_date
+        ON predictions (keyword, model_name, prediction_date)
+        """
+    ]),
+    (4, "prediction_fingerprints", [
+        "ALTER TABLE predictions ADD COLUMN horizon INTEGER",
+        "ALTER TABLE predictions ADD COLUMN fingerprint TEXT",
+        """
+        CREATE INDEX IF NOT EXISTS idx_predictions_fingerprint
+        ON predictions (keyword, fingerprint, horizon, model_name, prediction_date)
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS prediction_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            keyword TEXT NOT NULL,
+            model_name TEXT NOT NULL,
+            horizon INTEGER NOT NULL,
+            fingerprint TEXT NOT NULL,
+            metrics TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(keyword, fingerprint, horizon, model_name)
+        )
+        """
+    ]),
+    (5, "watchlist", [
+        """
+        CREATE TABLE IF NOT EXISTS watchlist (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            keyword TEXT NOT NULL,
+            geo TEXT NOT NULL DEFAULT '',
+            timeframe TEXT NOT NULL,
+            refresh_minutes INTEGER NOT NULL,
+            horizon INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_refreshed_at TIMESTAMP,
+            last_error TEXT,
+            UNIQUE(keyword, geo)
+        )
+        """
+    ]),
+    (6, "trend_rollups", [
+        """
+        CREATE TABLE IF NOT EXISTS trend_rollups (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            keyword TEXT NOT NULL,
+            geo TEXT NOT NULL DEFAULT '',
+            resolution TEXT NOT NULL,
+            date DATE NOT NULL,
+            interest_value REAL NOT NULL,
+            n_rows INTEGER NOT NULL,
+            UNIQUE(keyword, geo, resolution, date)
+        )
+        """
+    ]),
+]
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def apply_migrations(conn, migrations=MIGRATIONS):
+    current = schema_version(conn)
+    applied = []
+    for version, name, statements in sorted(migrations, key=lambda m: m[0]):
+        if version <= current:
+            continue
+        conn.execute("BEGIN")
+        try:
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(name)
+        current = version
+    return applied
@@ -0,0 +1,138 @@
+import os
+import threading
+import uuid
+import zlib
+import pandas as pd
+
+from .backends.base import EMPTY_INGEST, melt_trends, widen_histories
+
+pa = ds = pq = None
+
+TREND_SCHEMA_COLUMNS = ['keyword', 'geo', 'date', 'interest_value']
+
+def _load_pyarrow():
+    # Deferred to the first archive so SQLite-only deployments never import pyarrow
+    global pa, ds, pq
+    if pq is None:
+        try:
+            import pyarrow
+            import pyarrow.dataset
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("pyarrow is required for the Parquet trend store") from None
+        pa, ds, pq = pyarrow, pyarrow.dataset, pyarrow.parquet
+
+def _to_pandas(table):
+    # Per-column blocks skip the consolidation copy; self_destruct frees each Arrow column as it converts
+    return table.combine_chunks().to_pandas(split_blocks=True, self_destruct=True)
+
+class ParquetTrendStore:
+    def __init__(self, root: str, n_buckets: int = 64):
+        _load_pyarrow()
+        self.root = root
+        self.n_buckets = n_buckets
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def bucket_for(self, keyword: str):
+        return zlib.crc32(keyword.encode('utf-8')) % self.n_buckets
+
+    def _partition_path(self, bucket: int, month: str):
+        return os.path.join(self.root, f"bucket={bucket:03d}", f"month={month}", "data.parquet")
+
+    def _read_partition(self, path: str, filters=None):
+        if not os.path.exists(path):
+            return None
+        return pq.read_table(path, memory_map=True, filters=filters)
+
+    def _write_partition(self, path: str, df: pd.DataFrame):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        table = pa.Table.from_pandas(df[TREND_SCHEMA_COLUMNS], preserve_index=False)
+        # Dataset discovery skips dot-files, so readers never pick up a half-written partition
+        tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.{uuid.uuid4().hex}.tmp")
+        pq.write_table(table, tmp_path, compression='zstd')
+        os.replace(tmp_path, path)
+
+    def store_trends(self, data: pd.DataFrame, keywords: list, geo: str = ""):
+        df = melt_trends(data, keywords, geo)
+        if df is None:
+            return dict(EMPTY_INGEST)
+        df['bucket'] = df['keyword'].map(self.bucket_for)
+        df['month'] = df['date'].dt.strftime('%Y-%m')
+
+        rows_updated = 0
+        with self._lock:
+            for (bucket, month), incoming in df.groupby(['bucket', 'month'], sort=False):
+                path = self._partition_path(bucket, month)
+                existing = self._read_partition(path)
+                if existing is not None:
+                    existing = _to_pandas(existing)
+                    keys = ['keyword', 'geo', 'date']
+                    rows_updated += len(incoming[keys].merge(existing[keys], on=keys))
+                    incoming = pd.concat([existing, incoming[TREND_SCHEMA_COLUMNS]], ignore_index=True)
+                merged = incoming.drop_duplicates(subset=['keyword', 'geo', 'date'], keep='last')
+                self._write_partition(path, merged.sort_values(['keyword', 'geo', 'date']))
+
+        return {
+            "rows_written": len(df),
+            "rows_inserted": len(df) - rows_updated,
+            "rows_updated": rows_updated
+        }
+
+    def _months_for(self, keyword: str):
+        bucket_dir = os.path.join(self.root, f"bucket={self.bucket_for(keyword):03d}")
+        if not os.path.isdir(bucket_dir):
+            return []
+        return sorted(
+            (name.split('=', 1)[1] for name in os.listdir(bucket_dir) if name.startswith('month=')),
+            reverse=True
+        )
+
+    def get_trend_history(self, keyword: str, days: int = 365, geo: str = ""):
+        bucket = self.bucket_for(keyword)
+        filters = [('keyword', '=', keyword), ('geo', '=', geo)]
+        tables = []
+        n_rows = 0
+        for month in self._months_for(keyword):
+            table = self._read_partition(self._partition_path(bucket, month), filters=filters)
+            if table is None or table.num_rows == 0:
+                continue
+            tables.append(table.select(['date', 'interest_value']))
+            n_rows += table.num_rows
+            if n_rows >= days:
+                break
+
+        if not tables:
+            return pd.DataFrame(columns=['date', 'interest_value'])
+        df = _to_pandas(pa.concat_tables(tables))
+        df = df.set_index('date').sort_index().tail(days)
+        return df
+
+    def get_trend_histories(self, keywords: list, geo: str = "", start=None, end=None):
+        if not os.listdir(self.root):
+            return pd.DataFrame(columns=keywords)
+
+        buckets = sorted({self.bucket_for(keyword) for keyword in keywords})
+        expression = (
+            ds.field('bucket').isin(buckets)
+            & ds.field('keyword').isin(keywords)
+            & (ds.field('geo') == geo)
+        )
+        if start is not None:
+            start = pd.Timestamp(start)
+            expression &= (ds.field('month') >= start.strftime('%Y-%m')) & (ds.field('date') >= start)
+        if end is not None:
+            end = pd.Timestamp(end).normalize() + pd.Timedelta(days=1)
+            expression &= (ds.field('month') <= end.strftime('%Y-%m')) & (ds.field('date') < end)
+
+        table = self.dataset().to_table(columns=['keyword', 'date', 'interest_value'], filter=expression)
+        return widen_histories(_to_pandas(table), keywords)
+
+    def list_keywords(self, geo: str = ""):
+        if not os.listdir(self.root):
+            return []
+        table = self.dataset().to_table(columns=['keyword'], filter=ds.field('geo') == geo)
+        return sorted(set(table.column('keyword').to_pylist()))
+
+    def dataset(self):
+        return ds.dataset(self.root, format='parquet', partitioning='hive')
@@ -1,16 +1,28 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Literal, Optional
 import uvicorn
+import asyncio
+import json
+import os
 from datetime import datetime
 import pandas as pd
 
-from app.services.pytrends_service import PyTrendsService
-from app.models.trend_predictor import TrendPredictor
+from app.services.pytrends_service import PyTrendsService, usable_daily_history
+from app.services.incremental_refresh import IncrementalRefresher
+from app.services.watchlist_scheduler import WatchlistScheduler, watch_jobs
+from app.services.forecast_service import ForecastService
+from app.services.global_training import GlobalModelTrainer
+from app.models.trend_predictor import TrendPredictor, global_model_path
+from app.models.forecast_executor import ForecastExecutor, ForecastQueueFull
+from app.models.global_model import GlobalModelUnavailable
 from app.models.nlp_analyzer import NLPAnalyzer
 from app.services.correlation_service import CorrelationService
 from app.database.db_manager import DatabaseManager
+from app.config import settings
 
 app = FastAPI(
     title="Global Trend Intelligence System API",
@@ -27,19 +39,53 @@ app.add_middleware(
 )
 
 pytrends_service = PyTrendsService()
-trend_predictor = TrendPredictor()
+forecast_executor = ForecastExecutor(
+    max_workers=settings.FORECAST_WORKERS,
+    max_pending=settings.FORECAST_MAX_PENDING,
+    timeout=settings.FORECAST_TIMEOUT_SECONDS,
+    mp_context=settings.FORECAST_MP_CONTEXT
+)
+trend_predictor = TrendPredictor(executor=forecast_executor)
 nlp_analyzer = NLPAnalyzer()
 correlation_service = CorrelationService()
 db_manager = DatabaseManager()
+trend_refresher = IncrementalRefresher(db_manager, pytrends_service)
+forecast_service = ForecastService(
+    db_manager,
+    trend_predictor,
+    pytrends_service=pytrends_service,
+    batch_concurrency=settings.FORECAST_WORKERS
+)
+global_trainer = GlobalModelTrainer(db_manager, trend_predictor, history_days=settings.GLOBAL_MODEL_HISTORY_DAYS)
 
 class TrendRequest(BaseModel):
     keywords: List[str]
     timeframe: str = "today 12-m"
     geo: str = ""
+    anchor: Optional[str] = None
+    resolution: str = "native"
+    incremental: bool = True
 
 class PredictionRequest(BaseModel):
     keyword: str
+    geo: str = ""
+    periods: int = 30
+    force_refresh: bool = False
+    mode: Literal["fast", "accurate", "global"] = "accurate"
+
+class BatchPredictionRequest(BaseModel):
+    keywords: List[str]
+    geo: str = ""
     periods: int = 30
+    force_refresh: bool = False
+    mode: Literal["fast", "accurate", "global"] = "accurate"
+
+class WatchRequest(BaseModel):
+    keyword: str
+    geo: str = ""
+    timeframe: str = "today 12-m"
+    refresh_minutes: Optional[int] = None
+    horizon: Optional[int] = None
 
 class CorrelationRequest(BaseModel):
     keyword: str
@@ -56,16 +102,40 @@ async def root():
 @app.post("/api/fetch-trends")
 async def fetch_trends(request: TrendRequest):
     try:
-        data = pytrends_service.fetch_interest_over_time(
-            keywords=request.keywords,
-            timeframe=request.timeframe,
-            geo=request.geo
-        )
-        db_manager.store_trends(data, request.keywords)
+        if request.resolution == "daily":
+            stored = await db_manager.get_trend_histories_async(request.keywords, geo=request.geo)
+            data = await pytrends_service.fetch_daily_interest_over_time_async(
+                keywords=request.keywords,
+                timeframe=request.timeframe,
+                geo=request.geo,
+                anchor=request.anchor,
+                existing=usable_daily_history(stored, request.keywords)
+            )
+            ingest = await db_manager.store_trends_async(data, request.keywords, geo=request.geo)
+            refresh = {"mode": "daily"}
+        elif request.incremental:
+            data, refresh = await trend_refresher.refresh(
+                keywords=request.keywords,
+                timeframe=request.timeframe,
+                geo=request.geo,
+                anchor=request.anchor
+            )
+            ingest = refresh.pop("ingest", None)
+        else:
+            data = await pytrends_service.fetch_interest_over_time_async(
+                keywords=request.keywords,
+                timeframe=request.timeframe,
+                geo=request.geo,
+                anchor=request.anchor
+            )
+            ingest = await db_manager.store_trends_async(data, request.keywords, geo=request.geo)
+            refresh = {"mode": "full"}
         return {
             "status": "success",
             "data": data.to_dict(orient="records"),
-            "keywords": request.keywords
+            "keywords": request.keywords,
+            "ingest": ingest,
+            "refresh": refresh
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -73,31 +143,63 @@ async def fetch_trends(request: TrendRequest):
 @app.post("/api/predict-trends")
 async def predict_trends(request: PredictionRequest):
     try:
-        historical_data = db_manager.get_trend_history(request.keyword)
-        if historical_data.empty:
-            historical_data = pytrends_service.fetch_interest_over_time(
-                keywords=[request.keyword],
-                timeframe="today 12-m"
-            )
-        predictions = trend_predictor.predict(
-            data=historical_data,
-            keyword=request.keyword,
-            periods=request.periods
+        return await forecast_service.forecast(
+            request.keyword, request.periods, force_refresh=request.force_refresh, mode=request.mode, geo=request.geo
         )
+    except (ForecastQueueFull, GlobalModelUnavailable) as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/predict-trends/batch")
+async def predict_trends_batch(request: BatchPredictionRequest):
+    async def ndjson_lines():
+        async for result in forecast_service.stream_batch(
+            request.keywords, request.periods, force_refresh=request.force_refresh, mode=request.mode, geo=request.geo
+        ):
+            yield json.dumps(jsonable_encoder(result)) + "\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+@app.get("/api/backtest/{keyword}")
+async def backtest_keyword(keyword: str, horizon: Optional[int] = None, geo: str = ""):
+    try:
         return {
             "status": "success",
-            "keyword": request.keyword,
-            "predictions": predictions,
-            "model_performance": trend_predictor.get_model_metrics()
+            "keyword": keyword,
+            "backtest": await forecast_service.backtest(keyword, horizon=horizon, geo=geo),
+            "holdout_days": settings.BACKTEST_HOLDOUT_DAYS
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/history")
+async def get_history(
+    keywords: List[str] = Query(...),
+    geo: str = "",
+    start: Optional[str] = None,
+    end: Optional[str] = None
+):
+    try:
+        histories = await db_manager.get_trend_histories_async(keywords, geo=geo, start=start, end=end)
+        series = histories.astype(object).where(histories.notna(), None)
+        return {
+            "status": "success",
+            "keywords": keywords,
+            "geo": geo,
+            "dates": histories.index.strftime('%Y-%m-%d').tolist() if not histories.empty else [],
+            "series": {keyword: series[keyword].tolist() for keyword in series.columns}
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/related-queries/{keyword}")
-async def get_related_queries(keyword: str):
+async def get_related_queries(keyword: str, geo: str = ""):
     try:
-        related = pytrends_service.get_related_queries(keyword)
-        topics = nlp_analyzer.cluster_related_topics(related)
+        related = await pytrends_service.get_related_queries_async(keyword, geo=geo)
+        topics = await asyncio.to_thread(nlp_analyzer.cluster_related_topics, related)
         return {
             "status": "success",
             "keyword": keyword,
@@ -108,9 +210,9 @@ async def get_related_queries(keyword: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/regional-interest/{keyword}")
-async def get_regional_interest(keyword: str):
+async def get_regional_interest(keyword: str, geo: str = ""):
     try:
-        regional_data = pytrends_service.get_interest_by_region(keyword)
+        regional_data = await pytrends_service.get_interest_by_region_async(keyword, geo=geo)
         return {
             "status": "success",
             "keyword": keyword,
@@ -137,7 +239,7 @@ async def analyze_correlations(request: CorrelationRequest):
 @app.get("/api/emerging-topics")
 async def detect_emerging_topics():
     try:
-        emerging = pytrends_service.detect_emerging_trends()
+        emerging = await pytrends_service.detect_emerging_trends_async()
         return {
             "status": "success",
             "emerging_topics": emerging,
@@ -148,15 +250,169 @@ async def detect_emerging_topics():
 
 @app.get("/api/health")
 async def health_check():
+    ml_models = {"forecasting": trend_predictor.is_ready(), "nlp": nlp_analyzer.is_ready()}
     return {
         "status": "healthy",
+        "ready": all(ml_models.values()),
         "timestamp": datetime.now().isoformat(),
         "services": {
-            "database": db_manager.check_connection(),
+            "database": await db_manager.check_connection_async(),
             "pytrends": True,
-            "ml_models": trend_predictor.is_ready()
+            "ml_models": ml_models
+        },
+        "warmup": warmup_state,
+        "database_pool": db_manager.pool_stats(),
+        "pytrends_cache": pytrends_service.cache_stats(),
+        "pytrends_scheduler": pytrends_service.scheduler_stats(),
+        "watchlist_scheduler": watchlist_scheduler.stats(),
+        "forecast_executor": forecast_executor.stats()
+    }
+
+@app.get("/api/metrics")
+async def model_metrics():
+    return {
+        "status": "success",
+        "timestamp": datetime.now().isoformat(),
+        "models": trend_predictor.metrics_registry.snapshot(),
+        "model_cache": trend_predictor.model_cache_stats(),
+        "backtests": trend_predictor.backtests.stats(),
+        "embeddings": nlp_analyzer.embeddings_cache.stats(),
+        "forecast_executor": forecast_executor.stats()
+    }
+
+@app.get("/api/watchlist")
+async def list_watchlist():
+    try:
+        return {
+            "status": "success",
+            "watchlist": await db_manager.list_watches_async(),
+            "scheduler": watchlist_scheduler.stats()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/watchlist")
+async def add_to_watchlist(request: WatchRequest):
+    try:
+        await db_manager.add_watch_async(
+            request.keyword,
+            geo=request.geo,
+            timeframe=request.timeframe,
+            refresh_minutes=request.refresh_minutes,
+            horizon=request.horizon
+        )
+        return {"status": "success", "keyword": request.keyword, "geo": request.geo}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.delete("/api/watchlist/{keyword}")
+async def remove_from_watchlist(keyword: str, geo: str = ""):
+    if not await db_manager.remove_watch_async(keyword, geo=geo):
+        raise HTTPException(status_code=404, detail=f"{keyword} is not on the watchlist")
+    return {"status": "success", "keyword": keyword, "geo": geo}
+
+@app.post("/api/admin/compact")
+async def compact_database():
+    if not db_manager.supports_compaction():
+        raise HTTPException(status_code=501,
+                            detail=f"Compaction is not supported by the {db_manager.backend.name} backend")
+    try:
+        return {
+            "status": "success",
+            "compaction": await db_manager.compact_async()
         }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/admin/compact")
+async def compaction_status():
+    return {
+        "status": "success",
+        "last_run": db_manager.last_compaction()
     }
 
+@app.post("/api/admin/train-global")
+async def train_global_model(geo: str = ""):
+    try:
+        return {
+            "status": "success",
+            "training": await global_trainer.train(geo=geo)
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/admin/train-global")
+async def global_model_status():
+    return {
+        "status": "success",
+        "last_run": global_trainer.last_run
+    }
+
+watchlist_scheduler = WatchlistScheduler(
+    db_manager,
+    jobs=watch_jobs(trend_refresher, pytrends_service, forecast_service),
+    poll_seconds=settings.WATCHLIST_POLL_SECONDS,
+    concurrency=settings.WATCHLIST_CONCURRENCY
+)
+
+async def compaction_loop(interval_seconds: float):
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await db_manager.compact_async()
+        except Exception as e:
+            print(f"Compaction error: {e}")
+
+warmup_state = {"forecasting": "pending", "nlp": "pending"}
+
+async def warm_up_models():
+    for name, load in (("forecasting", trend_predictor.load), ("nlp", nlp_analyzer.load)):
+        warmup_state[name] = "loading"
+        started = datetime.now()
+        try:
+            await asyncio.to_thread(load)
+            warmup_state[name] = f"ready in {(datetime.now() - started).total_seconds():.1f}s"
+        except Exception as e:
+            warmup_state[name] = f"failed: {e}"
+            print(f"Warm-up error ({name}): {e}")
+
+async def global_training_loop(interval_seconds: float):
+    train_now = trend_predictor.global_model is None and not os.path.exists(global_model_path() or "")
+    while True:
+        if train_now:
+            try:
+                await global_trainer.train()
+            except Exception as e:
+                print(f"Global model training error: {e}")
+        await asyncio.sleep(interval_seconds)
+        train_now = True
+
+@app.on_event("startup")
+async def startup():
+    if settings.COMPACTION_INTERVAL_HOURS > 0 and not db_manager.supports_compaction():
+        print(f"Periodic compaction disabled: not supported by the {db_manager.backend.name} backend")
+    elif settings.COMPACTION_INTERVAL_HOURS > 0:
+        app.state.compaction_task = asyncio.create_task(compaction_loop(settings.COMPACTION_INTERVAL_HOURS * 3600))
+    if settings.WATCHLIST_ENABLED:
+        app.state.watchlist_task = asyncio.create_task(watchlist_scheduler.run_forever())
+    if settings.ML_WARMUP_ON_STARTUP:
+        app.state.warmup_task = asyncio.create_task(warm_up_models())
+    if settings.GLOBAL_MODEL_TRAIN_INTERVAL_HOURS > 0:
+        app.state.global_training_task = asyncio.create_task(
+            global_training_loop(settings.GLOBAL_MODEL_TRAIN_INTERVAL_HOURS * 3600)
+        )
+
+@app.on_event("shutdown")
+async def shutdown():
+    for name in ("compaction_task", "watchlist_task", "global_training_task", "warmup_task"):
+        task = getattr(app.state, name, None)
+        if task is not None:
+            task.cancel()
+    pytrends_service.shutdown()
+    forecast_executor.shutdown()
+    db_manager.close()
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,58 @@
+import warnings
+import numpy as np
+
+PRUNE_MARGIN = 2.0
+STATIONARITY_ALPHA = 0.05
+
+def choose_differencing(y: np.ndarray, max_d: int = 2):
+    from statsmodels.tsa.stattools import adfuller
+    series = np.asarray(y, dtype=float)
+    for d in range(max_d + 1):
+        if len(series) < 10 or np.ptp(series) == 0:
+            return d
+        try:
+            if adfuller(series, autolag='AIC')[1] < STATIONARITY_ALPHA:
+                return d
+        except (ValueError, np.linalg.LinAlgError):
+            return d
+        series = np.diff(series)
+    return max_d
+
+def score_order(y: np.ndarray, order: tuple, criterion: str = "aic"):
+    from statsmodels.tsa.arima.model import ARIMA
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            return float(getattr(ARIMA(y, order=order).fit(), criterion))
+    except Exception:
+        return np.inf
+
+def select_arima_order(y: np.ndarray, max_p: int = 3, max_d: int = 2, max_q: int = 3, criterion: str = "aic"):
+    # Candidates are fitted one after another: statsmodels holds the GIL for most of a fit, and the search already
+    # runs inside a forecast worker process, which is where keywords are parallelised
+    y = np.asarray(y, dtype=float)
+    d = choose_differencing(y, max_d)
+    scores = {}
+    promising = set()
+    best_score, best = np.inf, None
+
+    for complexity in range(max_p + max_q + 1):
+        wave = [
+            (p, complexity - p) for p in range(max_p + 1)
+            if 0 <= complexity - p <= max_q
+            and (complexity == 0 or (p - 1, complexity - p) in promising or (p, complexity - p - 1) in promising)
+        ]
+        if not wave:
+            break
+        for pq in wave:
+            scores[pq] = score_order(y, (pq[0], d, pq[1]), criterion)
+            if scores[pq] < best_score:
+                best_score, best = scores[pq], pq
+        promising = {pq for pq in wave if scores[pq] <= best_score + PRUNE_MARGIN}
+
+    n_candidates = (max_p + 1) * (max_q + 1)
+    info = {"criterion": criterion, "score": best_score, "evaluated": len(scores),
+            "pruned": n_candidates - len(scores)}
+    if best is None:
+        return None, info
+    return (best[0], d, best[1]), info
@@ -0,0 +1,65 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .baseline_forecasters import MAPE_EPSILON
+
+MIN_TRAIN_POINTS = 30
+
+def rolling_origins(n_obs: int, holdout: int, horizon: int, n_origins: int):
+    first, last = n_obs - holdout, n_obs - horizon
+    if horizon > holdout or first < MIN_TRAIN_POINTS:
+        raise ValueError(f"backtesting a {holdout}-point holdout needs at least {MIN_TRAIN_POINTS + holdout} "
+                         f"observations and a horizon of at most {holdout}")
+    return np.unique(np.linspace(first, last, n_origins).astype(int))
+
+def score_windows(actual: np.ndarray, predicted: np.ndarray):
+    errors = predicted - actual
+    ape = np.abs(errors) / np.maximum(np.abs(actual), MAPE_EPSILON)
+    return {
+        "mape": float(ape.mean()),
+        "rmse": float(np.sqrt((errors ** 2).mean())),
+        "mape_by_step": ape.mean(axis=0).tolist(),
+        "origins": int(actual.shape[0]),
+        "horizon": int(actual.shape[1])
+    }
+
+def backtest(y: np.ndarray, origins: np.ndarray, horizon: int, forecast_from):
+    y = np.asarray(y, dtype=float)
+    actual = sliding_window_view(y, horizon)[origins]
+    predicted = np.vstack([np.asarray(forecast_from(int(origin), horizon), dtype=float)[:horizon]
+                           for origin in origins])
+    return score_windows(actual, predicted)
+
+class BacktestCache:
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def get(self, key):
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return result
+
+    def peek(self, key):
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key, result: dict):
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries), "max_entries": self.max_entries}
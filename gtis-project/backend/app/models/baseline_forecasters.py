@@ -0,0 +1,107 @@
+import itertools
+from statistics import NormalDist
+import numpy as np
+
+SEASON_LENGTH = 7
+MAPE_EPSILON = np.finfo(np.float64).eps
+HOLT_WINTERS_GRID = {"alpha": (0.1, 0.3, 0.5, 0.8), "beta": (0.01, 0.1), "gamma": (0.05, 0.2)}
+DAMPED_TREND_GRID = {"alpha": (0.1, 0.3, 0.5, 0.8), "beta": (0.01, 0.1), "phi": (0.8, 0.9, 0.98)}
+
+def _grid(grid: dict, n_series: int):
+    combos = list(itertools.product(*grid.values()))
+    params = {name: np.repeat(np.array([c[i] for c in combos])[None, :], n_series, axis=0).ravel()
+              for i, name in enumerate(grid)}
+    return params, len(combos)
+
+def _select_best(Y: np.ndarray, fitted: np.ndarray, forecast: np.ndarray, n_combos: int, skip: int):
+    n, T = Y.shape
+    errors = (fitted.reshape(n, n_combos, T)[:, :, skip:] - Y[:, None, skip:]) ** 2
+    best = np.nanmean(errors, axis=2).argmin(axis=1)
+    rows = np.arange(n)
+    return fitted.reshape(n, n_combos, T)[rows, best], forecast.reshape(n, n_combos, -1)[rows, best]
+
+def seasonal_naive(Y: np.ndarray, horizon: int, season: int = SEASON_LENGTH):
+    n, T = Y.shape
+    if T < season:
+        raise ValueError(f"seasonal naive needs at least {season} observations")
+    fitted = np.full_like(Y, np.nan, dtype=float)
+    fitted[:, season:] = Y[:, :-season]
+    forecast = Y[:, T - season + np.arange(horizon) % season]
+    return fitted, forecast
+
+def holt_winters(Y: np.ndarray, horizon: int, season: int = SEASON_LENGTH, grid: dict = HOLT_WINTERS_GRID):
+    n, T = Y.shape
+    if T < 2 * season:
+        raise ValueError(f"Holt-Winters needs at least {2 * season} observations")
+    params, n_combos = _grid(grid, n)
+    alpha, beta, gamma = params["alpha"], params["beta"], params["gamma"]
+    X = np.repeat(Y, n_combos, axis=0)
+
+    level = X[:, :season].mean(axis=1)
+    trend = (X[:, season:2 * season].mean(axis=1) - level) / season
+    seasonal = X[:, :season] - level[:, None]
+    fitted = np.empty_like(X, dtype=float)
+    for t in range(T):
+        s = seasonal[:, t % season]
+        fitted[:, t] = level + trend + s
+        new_level = alpha * (X[:, t] - s) + (1 - alpha) * (level + trend)
+        trend = beta * (new_level - level) + (1 - beta) * trend
+        seasonal[:, t % season] = gamma * (X[:, t] - new_level) + (1 - gamma) * s
+        level = new_level
+
+    steps = np.arange(1, horizon + 1)
+    forecast = level[:, None] + steps[None, :] * trend[:, None] + seasonal[:, (T + steps - 1) % season]
+    return _select_best(Y, fitted, forecast, n_combos, skip=season)
+
+def damped_trend(Y: np.ndarray, horizon: int, grid: dict = DAMPED_TREND_GRID):
+    n, T = Y.shape
+    if T < 3:
+        raise ValueError("damped trend needs at least 3 observations")
+    params, n_combos = _grid(grid, n)
+    alpha, beta, phi = params["alpha"], params["beta"], params["phi"]
+    X = np.repeat(Y, n_combos, axis=0)
+
+    level = X[:, 0].astype(float)
+    trend = (X[:, 1] - X[:, 0]).astype(float)
+    fitted = np.empty_like(X, dtype=float)
+    for t in range(T):
+        fitted[:, t] = level + phi * trend
+        new_level = alpha * X[:, t] + (1 - alpha) * (level + phi * trend)
+        trend = beta * (new_level - level) + (1 - beta) * phi * trend
+        level = new_level
+
+    damping = np.cumsum(phi[:, None] ** np.arange(1, horizon + 1)[None, :], axis=1)
+    forecast = level[:, None] + damping * trend[:, None]
+    return _select_best(Y, fitted, forecast, n_combos, skip=2)
+
+FAST_MODELS = {
+    "seasonal_naive": seasonal_naive,
+    "holt_winters": holt_winters,
+    "damped_trend": damped_trend,
+}
+
+def in_sample_errors(Y: np.ndarray, fitted: np.ndarray):
+    mask = ~np.isnan(fitted)
+    residuals = np.where(mask, Y - fitted, np.nan)
+    mape = np.nanmean(np.abs(residuals) / np.maximum(np.abs(Y), MAPE_EPSILON), axis=1)
+    rmse = np.sqrt(np.nanmean(residuals ** 2, axis=1))
+    sigma = np.nanstd(residuals, axis=1)
+    return mape, rmse, sigma
+
+def forecast_matrix(Y: np.ndarray, horizon: int, models=tuple(FAST_MODELS), confidence: float = 0.95):
+    Y = np.asarray(Y, dtype=float)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    spread = np.sqrt(np.arange(1, horizon + 1))[None, :]
+    results = {}
+    for name in models:
+        fitted, forecast = FAST_MODELS[name](Y, horizon)
+        mape, rmse, sigma = in_sample_errors(Y, fitted)
+        width = z * sigma[:, None] * spread
+        results[name] = {
+            "values": forecast,
+            "lower_bound": forecast - width,
+            "upper_bound": forecast + width,
+            "mape": mape,
+            "rmse": rmse
+        }
+    return results
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+def content_key(text: str):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+class EmbeddingStore:
+    def __init__(self, root: str, model_name: str):
+        self.root = os.path.join(root, re.sub(r"[^A-Za-z0-9_.-]", "_", model_name))
+        self.matrix_path = os.path.join(self.root, "embeddings.f32")
+        self.index_path = os.path.join(self.root, "index.tsv")
+        self.meta_path = os.path.join(self.root, "meta.json")
+        self.model_name = model_name
+        self.dim = None
+        self.index = {}
+        self._n_rows = 0
+        self._matrix = None
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if os.path.exists(self.meta_path):
+            with self._file_lock():
+                self._sync()
+
+    @contextmanager
+    def _file_lock(self):
+        # Other processes may share the directory; appends and tail repairs hold an exclusive flock
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, ".lock"), "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+
+    def _sync(self):
+        if self.dim is None:
+            try:
+                with open(self.meta_path) as f:
+                    self.dim = json.load(f)["dim"]
+            except (OSError, ValueError, KeyError):
+                return
+        size = os.path.getsize(self.matrix_path) if os.path.exists(self.matrix_path) else 0
+        rows = size // (4 * self.dim)
+        if size != rows * 4 * self.dim:
+            # Writers hold the lock for the whole append, so a partial row here is left by a crashed one
+            os.truncate(self.matrix_path, rows * 4 * self.dim)
+        if rows != self._n_rows:
+            try:
+                with open(self.index_path, encoding="utf-8") as f:
+                    for line in f:
+                        key, _, row = line.rstrip("\n").partition("\t")
+                        if row.isdigit() and int(row) < rows:
+                            self.index[key] = int(row)
+            except OSError:
+                pass
+        self._n_rows = rows
+
+    def _rows(self):
+        if self._matrix is None or len(self._matrix) < self._n_rows:
+            self._matrix = np.memmap(self.matrix_path, dtype=np.float32, mode="r", shape=(self._n_rows, self.dim))
+        return self._matrix
+
+    def get_many(self, keys: list):
+        with self._lock:
+            found = {key: self.index[key] for key in keys if key in self.index}
+            if not found:
+                return {}
+            matrix = self._rows()
+            return {key: np.array(matrix[row]) for key, row in found.items()}
+
+    def put_many(self, keys: list, vectors: np.ndarray):
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        with self._lock, self._file_lock():
+            self._sync()
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+                with open(self.meta_path, "w") as f:
+                    json.dump({"model": self.model_name, "dim": self.dim}, f)
+            new = [(key, vector) for key, vector in zip(keys, vectors) if key not in self.index]
+            if not new:
+                return
+            start = self._n_rows
+            with open(self.matrix_path, "ab") as f:
+                f.write(np.vstack([vector for _, vector in new]).tobytes())
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.writelines(f"{key}\t{start + i}\n" for i, (key, _) in enumerate(new))
+            for i, (key, _) in enumerate(new):
+                self.index[key] = start + i
+            self._n_rows = start + len(new)
+
+    def __len__(self):
+        return len(self.index)
+
+class EmbeddingCache:
+    def __init__(self, encode, model_name: str, cache_dir: str = None, max_entries: int = 4096):
+        self.encode_batch = encode
+        self.max_entries = max_entries
+        self.store = EmbeddingStore(cache_dir, model_name) if cache_dir else None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0, "encode_calls": 0}
+
+    def _remember(self, key: str, vector: np.ndarray):
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def encode(self, texts: list):
+        keys = [content_key(text) for text in texts]
+        vectors = {}
+        with self._lock:
+            self._stats["requests"] += len(texts)
+            for key in keys:
+                if key in self._entries and key not in vectors:
+                    self._entries.move_to_end(key)
+                    vectors[key] = self._entries[key]
+            self._stats["memory_hits"] += sum(key in vectors for key in keys)
+
+        missing = [key for key in dict.fromkeys(keys) if key not in vectors]
+        if missing and self.store is not None:
+            from_disk = self.store.get_many(missing)
+            vectors.update(from_disk)
+            with self._lock:
+                self._stats["disk_hits"] += sum(key in from_disk for key in keys)
+                for key, vector in from_disk.items():
+                    self._remember(key, vector)
+
+        texts_by_key = dict(zip(keys, texts))
+        missing = [key for key in missing if key not in vectors]
+        if missing:
+            encoded = np.asarray(self.encode_batch([texts_by_key[key] for key in missing]), dtype=np.float32)
+            if self.store is not None:
+                self.store.put_many(missing, encoded)
+            with self._lock:
+                self._stats["encode_calls"] += 1
+                missed = set(missing)
+                self._stats["misses"] += sum(key in missed for key in keys)
+                for key, vector in zip(missing, encoded):
+                    vectors[key] = vector
+                    self._remember(key, vector)
+
+        return np.vstack([vectors[key] for key in keys]) if keys else np.empty((0, 0), dtype=np.float32)
+
+    def stats(self):
+        with self._lock:
+            requests = self._stats["requests"]
+            hits = self._stats["memory_hits"] + self._stats["disk_hits"]
+            return {
+                **self._stats,
+                "hit_rate": hits / requests if requests else None,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "stored_vectors": len(self.store) if self.store is not None else 0
+            }
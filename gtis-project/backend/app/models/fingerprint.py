@@ -0,0 +1,10 @@
+import hashlib
+import pandas as pd
+
+def data_fingerprint(data: pd.DataFrame) -> str:
+    if data is None or data.empty:
+        return ""
+    frame = data.reset_index()
+    frame.columns = range(frame.shape[1])
+    hashed = pd.util.hash_pandas_object(frame, index=False).values
+    return hashlib.sha1(hashed.tobytes()).hexdigest()
@@ -0,0 +1,206 @@
+import asyncio
+import functools
+import multiprocessing
+import os
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import pandas as pd
+
+MODEL_FITTERS = {
+    "prophet": "_predict_prophet",
+    "arima": "_predict_arima",
+}
+TIMEOUT_GRACE_SECONDS = 5.0
+
+class ForecastQueueFull(Exception):
+    pass
+
+class ForecastTimeout(Exception):
+    pass
+
+_worker_predictor = None
+
+def warm_worker():
+    global _worker_predictor
+    from .trend_predictor import TrendPredictor, load_forecasting_modules
+
+    load_forecasting_modules()
+    if _worker_predictor is None:
+        _worker_predictor = TrendPredictor()
+    return True
+
+def run_model(model_name: str, dates: list, values: list, periods: int, timeout: float = None, keyword: str = None):
+    global _worker_predictor
+    from .trend_predictor import TrendPredictor
+
+    if _worker_predictor is None:
+        _worker_predictor = TrendPredictor()
+    df = pd.DataFrame({'ds': pd.to_datetime(dates), 'y': values})
+    fit = getattr(_worker_predictor, MODEL_FITTERS[model_name])
+    result = _fit_with_timeout(fit, model_name, df, periods, timeout, keyword)
+    # Each worker has its own model cache; its stats ride back with the result so the parent can report them
+    return {"result": result, "pid": os.getpid(), "model_cache": _worker_predictor.models.stats()}
+
+def _fit_with_timeout(fit, model_name: str, df: pd.DataFrame, periods: int, timeout: float, keyword: str):
+    if not timeout or not hasattr(signal, "setitimer"):
+        return fit(df, periods, keyword)
+
+    expired = []
+
+    def raise_timeout(signum, frame):
+        expired.append(signum)
+        raise ForecastTimeout(f"{model_name} fit exceeded {timeout}s")
+
+    previous = signal.signal(signal.SIGALRM, raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout, 1.0)
+    try:
+        result = fit(df, periods, keyword)
+    except Exception as e:
+        if expired:
+            raise ForecastTimeout(f"{model_name} fit exceeded {timeout}s") from e
+        raise
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+    if expired:
+        raise ForecastTimeout(f"{model_name} fit exceeded {timeout}s")
+    return result
+
+class ForecastExecutor:
+    def __init__(self, max_workers: int = 2, max_pending: int = 32, timeout: float = 120.0,
+                 models=("prophet", "arima"), mp_context: str = "spawn"):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.models = tuple(models)
+        self.mp_context = mp_context
+        self._pool = None
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "timed_out": 0, "cancelled": 0, "rejected": 0,
+                       "abandoned": 0, "pool_restarts": 0}
+        self._pending = 0
+        self._warm = False
+        self._worker_caches = {}
+        self._generation = 0
+
+    def _executor(self, restart: bool = False):
+        with self._lock:
+            if restart and self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+                self._stats["pool_restarts"] += 1
+                # Cache stats are keyed by worker pid, and the old workers are gone
+                self._worker_caches.clear()
+                self._generation += 1
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(self.mp_context)
+                )
+            return self._pool
+
+    def _release(self, generation: int, future):
+        with self._lock:
+            self._pending -= 1
+            if future.cancelled():
+                self._stats["cancelled"] += 1
+            elif isinstance(future.exception(), ForecastTimeout):
+                self._stats["timed_out"] += 1
+            elif future.exception() is not None:
+                self._stats["failed"] += 1
+            else:
+                self._stats["completed"] += 1
+                self._warm = True
+                reply = future.result()
+                if generation == self._generation:
+                    self._worker_caches[reply["pid"]] = reply["model_cache"]
+        self._slots.release()
+
+    def submit(self, model_name: str, df: pd.DataFrame, periods: int, timeout: float = None, keyword: str = None):
+        if model_name not in MODEL_FITTERS:
+            raise ValueError(f"Unknown forecasting model: {model_name}")
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise ForecastQueueFull(f"Forecast queue is full ({self.max_pending} jobs pending)")
+        args = (model_name, df['ds'].dt.strftime('%Y-%m-%d').tolist(), df['y'].astype(float).tolist(), periods,
+                timeout or self.timeout, keyword)
+        try:
+            # Read before submitting, so a reply from a pool restarted in between is never counted as current
+            try:
+                generation = self._generation
+                future = self._executor().submit(run_model, *args)
+            except BrokenProcessPool:
+                self._executor(restart=True)
+                generation = self._generation
+                future = self._executor().submit(run_model, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._pending += 1
+            self._stats["submitted"] += 1
+        future.add_done_callback(functools.partial(self._release, generation))
+        return future
+
+    async def run(self, model_name: str, df: pd.DataFrame, periods: int, timeout: float = None, keyword: str = None):
+        timeout = timeout or self.timeout
+        future = self.submit(model_name, df, periods, timeout, keyword)
+        try:
+            reply = await asyncio.wait_for(asyncio.wrap_future(future), timeout + TIMEOUT_GRACE_SECONDS)
+            return reply["result"]
+        except asyncio.TimeoutError:
+            if not future.cancel():
+                with self._lock:
+                    self._stats["abandoned"] += 1
+            raise ForecastTimeout(f"{model_name} fit exceeded {timeout}s")
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+    def warm_up(self, timeout: float = None):
+        pool = self._executor()
+        futures = [pool.submit(warm_worker) for _ in range(self.max_workers)]
+        for future in futures:
+            future.result(timeout=timeout or self.timeout)
+        with self._lock:
+            self._warm = True
+
+    def is_warm(self):
+        return self._warm
+
+    def model_cache_stats(self):
+        with self._lock:
+            caches = list(self._worker_caches.values())
+        totals = {"hits": 0, "disk_hits": 0, "warm_starts": 0, "cold_fits": 0, "evictions": 0, "disk_evictions": 0,
+                  "entries": 0}
+        for cache in caches:
+            for key in totals:
+                totals[key] += cache.get(key, 0)
+        return {
+            **totals,
+            "max_entries": caches[0]["max_entries"] if caches else None,
+            "persistent": any(cache["persistent"] for cache in caches),
+            "workers_reporting": len(caches)
+        }
+
+    def stats(self):
+        with self._lock:
+            return {
+                **self._stats,
+                "pending": self._pending,
+                "max_pending": self.max_pending,
+                "workers": self.max_workers,
+                "timeout_seconds": self.timeout,
+                "started": self._pool is not None,
+                "warm": self._warm
+            }
+
+    def shutdown(self, wait: bool = False):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
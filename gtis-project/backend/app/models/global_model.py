@@ -0,0 +1,145 @@
+import os
+import pickle
+import time
+from statistics import NormalDist
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .baseline_forecasters import MAPE_EPSILON, SEASON_LENGTH
+
+GLOBAL_LAGS = (1, 2, 3, 7, 14, 21, 28)
+LEVEL_OFFSET = 1.0
+
+class GlobalModelUnavailable(Exception):
+    pass
+
+def split_daily_series(wide: pd.DataFrame):
+    # Histories keep the resolution they were fetched at (weekly for the default "today 12-m"); the lags and
+    # weekday features are daily, so coarser series are left out instead of being reindexed into gaps
+    steps = {column: wide[column].dropna().index.to_series().diff().median() for column in wide.columns}
+    daily = [column for column in wide.columns if steps[column] == pd.Timedelta(days=1)]
+    return wide[daily].dropna(how='all'), [column for column in wide.columns if column not in daily]
+
+def daily_matrix(wide: pd.DataFrame):
+    wide = wide.sort_index()
+    wide = wide.reindex(pd.date_range(wide.index.min(), wide.index.max(), freq='D'))
+    return wide.T.values.astype(float), wide.index.dayofweek.values, wide.index
+
+class GlobalForecaster:
+    def __init__(self, lags: tuple = GLOBAL_LAGS, kind: str = "ridge", alpha: float = 1.0,
+                 max_samples: int = 500000, seed: int = 0):
+        if kind not in ("ridge", "gbm"):
+            raise ValueError(f"Unknown global model kind: {kind}")
+        self.lags = tuple(sorted(lags))
+        self.window = self.lags[-1]
+        self.kind = kind
+        self.alpha = alpha
+        self.max_samples = max_samples
+        self.seed = seed
+        self.coef = None
+        self.regressor = None
+        self.sigma = None
+        self.info = {}
+
+    def _features(self, windows: np.ndarray, weekdays: np.ndarray):
+        level = windows.mean(axis=1) + LEVEL_OFFSET
+        scaled = windows / level[:, None]
+        return np.hstack([
+            scaled[:, [self.window - lag for lag in self.lags]],
+            scaled[:, -SEASON_LENGTH:].mean(axis=1, keepdims=True),
+            np.eye(SEASON_LENGTH)[weekdays]
+        ]), level
+
+    def _samples(self, Y: np.ndarray, weekdays: np.ndarray):
+        n, T = Y.shape
+        if T <= self.window:
+            return np.empty((0, self.window)), np.empty(0), np.empty(0, dtype=int), np.empty(0, dtype=int)
+        windows = sliding_window_view(Y, self.window + 1, axis=1)
+        series = np.repeat(np.arange(n), windows.shape[1])
+        target_weekdays = np.tile(weekdays[self.window:], n)
+        windows = windows.reshape(-1, self.window + 1)
+        valid = ~np.isnan(windows).any(axis=1)
+        return windows[valid, :-1], windows[valid, -1], target_weekdays[valid], series[valid]
+
+    def _predict_scaled(self, X: np.ndarray):
+        if self.kind == "gbm":
+            return self.regressor.predict(X)
+        return X @ self.coef
+
+    def fit(self, Y: np.ndarray, weekdays: np.ndarray):
+        started = time.perf_counter()
+        windows, target, target_weekdays, series = self._samples(np.asarray(Y, dtype=float), weekdays)
+        if len(target) == 0:
+            raise ValueError(f"global model needs series with at least {self.window + 1} consecutive days")
+        X, level = self._features(windows, target_weekdays)
+        y = target / level
+        train = np.arange(len(y))
+        if len(train) > self.max_samples:
+            train = np.random.default_rng(self.seed).choice(train, self.max_samples, replace=False)
+
+        if self.kind == "gbm":
+            from sklearn.ensemble import HistGradientBoostingRegressor
+            self.regressor = HistGradientBoostingRegressor(random_state=self.seed).fit(X[train], y[train])
+        else:
+            Xt = X[train]
+            self.coef = np.linalg.solve(Xt.T @ Xt + self.alpha * np.eye(X.shape[1]), Xt.T @ y[train])
+
+        self.sigma = float(np.std(self._predict_scaled(X) - y))
+        mape, _ = self.score(Y, weekdays)
+        self.info = {
+            "kind": self.kind,
+            "series": int(len(np.unique(series))),
+            "samples": int(len(y)),
+            "training_samples": int(len(train)),
+            "mean_mape": float(np.nanmean(mape)),
+            "train_seconds": round(time.perf_counter() - started, 3)
+        }
+        return self
+
+    def score(self, Y: np.ndarray, weekdays: np.ndarray):
+        Y = np.asarray(Y, dtype=float)
+        windows, target, target_weekdays, series = self._samples(Y, weekdays)
+        counts = np.bincount(series, minlength=len(Y)).astype(float)
+        if len(target) == 0:
+            return np.full(len(Y), np.nan), np.full(len(Y), np.nan)
+        X, level = self._features(windows, target_weekdays)
+        residuals = self._predict_scaled(X) * level - target
+        ape = np.abs(residuals) / np.maximum(np.abs(target), MAPE_EPSILON)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mape = np.bincount(series, ape, minlength=len(Y)) / counts
+            rmse = np.sqrt(np.bincount(series, residuals ** 2, minlength=len(Y)) / counts)
+        return mape, rmse
+
+    def forecast(self, history: np.ndarray, next_weekday: int, horizon: int, confidence: float = 0.95):
+        if self.sigma is None:
+            raise GlobalModelUnavailable("Global model has not been trained")
+        buffer = np.asarray(history, dtype=float)[:, -self.window:]
+        if buffer.shape[1] < self.window or np.isnan(buffer).any():
+            raise ValueError(f"global forecasts need the last {self.window} days without gaps")
+        n = len(buffer)
+        base_level = buffer.mean(axis=1) + LEVEL_OFFSET
+        values = np.empty((n, horizon))
+        for step in range(horizon):
+            X, level = self._features(buffer, np.full(n, (next_weekday + step) % SEASON_LENGTH))
+            values[:, step] = self._predict_scaled(X) * level
+            buffer = np.hstack([buffer[:, 1:], values[:, step:step + 1]])
+
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        width = z * self.sigma * base_level[:, None] * np.sqrt(np.arange(1, horizon + 1))[None, :]
+        return {"values": values, "lower_bound": values - width, "upper_bound": values + width}
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def load(path: str):
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError, AttributeError):
+            return None
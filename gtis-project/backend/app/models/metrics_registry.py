@@ -0,0 +1,90 @@
+import threading
+from bisect import bisect_left
+import numpy as np
+
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+MAPE_BUCKETS = (0.01, 0.02, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0)
+
+def _histogram(buckets: tuple, counts: np.ndarray, total: float):
+    n = int(counts.sum())
+    labels = [f"le_{bound:g}" for bound in buckets] + ["inf"]
+    return {
+        "count": n,
+        "mean": total / n if n else None,
+        "buckets": dict(zip(labels, np.cumsum(counts).astype(int).tolist()))
+    }
+
+class MetricsRegistry:
+    def __init__(self, latency_buckets: tuple = LATENCY_BUCKETS, mape_buckets: tuple = MAPE_BUCKETS):
+        self.latency_buckets = tuple(latency_buckets)
+        self.mape_buckets = tuple(mape_buckets)
+        self._local = threading.local()
+        self._shards = []
+
+    def _model_stats(self, model_name: str):
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            self._shards.append(shard)
+        stats = shard.get(model_name)
+        if stats is None:
+            stats = shard[model_name] = {
+                "fits": 0,
+                "fit_modes": {},
+                "failures": {},
+                "latency": [0] * (len(self.latency_buckets) + 1),
+                "latency_sum": 0.0,
+                "mape": [0] * (len(self.mape_buckets) + 1),
+                "mape_sum": 0.0
+            }
+        return stats
+
+    def record_fit(self, model_name: str, fit_seconds: float = None, mape: float = None, fit_mode: str = None):
+        stats = self._model_stats(model_name)
+        stats["fits"] += 1
+        if fit_mode:
+            stats["fit_modes"][fit_mode] = stats["fit_modes"].get(fit_mode, 0) + 1
+        if fit_seconds is not None:
+            stats["latency"][bisect_left(self.latency_buckets, fit_seconds)] += 1
+            stats["latency_sum"] += fit_seconds
+        if mape is not None and np.isfinite(mape):
+            stats["mape"][bisect_left(self.mape_buckets, mape)] += 1
+            stats["mape_sum"] += mape
+
+    def record_failure(self, model_name: str, reason: str):
+        failures = self._model_stats(model_name)["failures"]
+        failures[reason] = failures.get(reason, 0) + 1
+
+    def snapshot(self):
+        merged = {}
+        for shard in list(self._shards):
+            for model_name, stats in list(shard.items()):
+                total = merged.setdefault(model_name, {
+                    "fits": 0,
+                    "fit_modes": {},
+                    "failures": {},
+                    "latency": np.zeros(len(self.latency_buckets) + 1),
+                    "latency_sum": 0.0,
+                    "mape": np.zeros(len(self.mape_buckets) + 1),
+                    "mape_sum": 0.0
+                })
+                total["fits"] += stats["fits"]
+                for key in ("fit_modes", "failures"):
+                    for name, count in dict(stats[key]).items():
+                        total[key][name] = total[key].get(name, 0) + count
+                total["latency"] += stats["latency"]
+                total["latency_sum"] += stats["latency_sum"]
+                total["mape"] += stats["mape"]
+                total["mape_sum"] += stats["mape_sum"]
+
+        return {
+            model_name: {
+                "fits": total["fits"],
+                "failures": sum(total["failures"].values()),
+                "failure_reasons": total["failures"],
+                "fit_modes": total["fit_modes"],
+                "fit_latency_seconds": _histogram(self.latency_buckets, total["latency"], total["latency_sum"]),
+                "mape": _histogram(self.mape_buckets, total["mape"], total["mape_sum"])
+            }
+            for model_name, total in merged.items()
+        }
@@ -0,0 +1,158 @@
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+from .fingerprint import data_fingerprint
+
+COLD, WARM, CACHED = "cold", "warm", "cached"
+
+def _appended_only(entry: dict, df: pd.DataFrame):
+    dates = df['ds'].values.astype('datetime64[ns]').astype(np.int64)
+    if len(dates) == 0 or dates[-1] <= entry['dates'][-1]:
+        return False
+    overlap = dates <= entry['dates'][-1]
+    n_overlap = int(overlap.sum())
+    if n_overlap == 0 or n_overlap > len(entry['dates']):
+        return False
+    return (np.array_equal(dates[overlap], entry['dates'][-n_overlap:])
+            and np.allclose(df['y'].values[overlap], entry['values'][-n_overlap:]))
+
+class ModelCache:
+    def __init__(self, cache_dir: str = None, max_entries: int = 64, max_disk_bytes: int = None):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._disk_bytes = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "warm_starts": 0, "cold_fits": 0, "evictions": 0,
+                       "disk_evictions": 0}
+
+    def _disk_path(self, model_name: str, keyword: str):
+        digest = hashlib.sha1(keyword.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, model_name, f"{digest}.pkl")
+
+    def _load(self, model_name: str, keyword: str):
+        with self._lock:
+            entry = self._entries.get((model_name, keyword))
+            if entry is not None:
+                self._entries.move_to_end((model_name, keyword))
+                return entry
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(model_name, keyword)
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError, AttributeError, ValueError):
+            return None
+        if entry.get("keyword") != keyword:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self._stats["disk_hits"] += 1
+            self._remember((model_name, keyword), entry)
+        return entry
+
+    def _remember(self, key, entry: dict):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _disk_files(self):
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                if name.endswith(".pkl"):
+                    path = os.path.join(root, name)
+                    try:
+                        yield path, os.stat(path)
+                    except OSError:
+                        pass
+
+    def _enforce_disk_limit(self, written: int):
+        # The size is tracked incrementally and only rescanned once it looks over budget, which also
+        # accounts for entries written by other worker processes sharing the directory
+        if not self.max_disk_bytes:
+            return
+        with self._lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes += written
+                if self._disk_bytes <= self.max_disk_bytes:
+                    return
+        files = sorted(self._disk_files(), key=lambda item: item[1].st_mtime)
+        total = sum(stat.st_size for _, stat in files)
+        evicted = 0
+        if total > self.max_disk_bytes:
+            for path, stat in files:
+                if total <= self.max_disk_bytes * 0.9:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= stat.st_size
+                evicted += 1
+        with self._lock:
+            self._disk_bytes = total
+            self._stats["disk_evictions"] += evicted
+
+    def latest(self, model_name: str, keyword: str):
+        return self._load(model_name, keyword) if keyword else None
+
+    def lookup(self, model_name: str, keyword: str, df: pd.DataFrame, config=None):
+        entry = self._load(model_name, keyword) if keyword else None
+        mode = COLD
+        if entry is not None and entry.get("config") == config:
+            if entry["fingerprint"] == data_fingerprint(df):
+                mode = CACHED
+            elif _appended_only(entry, df):
+                mode = WARM
+        with self._lock:
+            self._stats[{COLD: "cold_fits", WARM: "warm_starts", CACHED: "hits"}[mode]] += 1
+        return mode, entry if mode != COLD else None
+
+    def store(self, model_name: str, keyword: str, df: pd.DataFrame, model, params, config=None, metrics=None,
+              meta: dict = None):
+        if not keyword:
+            return
+        entry = {
+            "keyword": keyword,
+            "fingerprint": data_fingerprint(df),
+            "dates": df['ds'].values.astype('datetime64[ns]').astype(np.int64),
+            "values": df['y'].values.astype(float),
+            "config": config,
+            "params": params,
+            "metrics": metrics,
+            "meta": meta or {},
+            "model": model
+        }
+        with self._lock:
+            self._remember((model_name, keyword), entry)
+        if not self.cache_dir:
+            return
+        path = self._disk_path(model_name, keyword)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+                written = f.tell()
+            os.replace(tmp_path, path)
+        except (OSError, pickle.PicklingError) as e:
+            print(f"Model cache write error: {e}")
+            return
+        self._enforce_disk_limit(written)
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries), "max_entries": self.max_entries,
+                    "persistent": bool(self.cache_dir), "disk_bytes": self._disk_bytes}
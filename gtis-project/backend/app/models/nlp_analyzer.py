@@ -1,22 +1,56 @@
+import threading
 import pandas as pd
 import numpy as np
-from sentence_transformers import SentenceTransformer
-from sklearn.cluster import HDBSCAN
-import umap
 from typing import List, Dict
+from ..config import settings
+from .embedding_cache import EmbeddingCache
 import warnings
 warnings.filterwarnings('ignore')
 
+EMBEDDING_MODEL = 'all-MiniLM-L6-v2'
+
 class NLPAnalyzer:
-    def __init__(self):
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
-        self.embeddings_cache = {}
+    def __init__(self, model_name: str = EMBEDDING_MODEL, cache_dir: str = None):
+        self.model_name = model_name
+        self._model = None
+        self._lock = threading.Lock()
+        self.embeddings_cache = EmbeddingCache(
+            self._encode_batch,
+            model_name,
+            cache_dir=settings.EMBEDDING_CACHE_DIR if cache_dir is None else cache_dir,
+            max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES
+        )
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    from sentence_transformers import SentenceTransformer
+                    self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    def _encode_batch(self, texts: List[str]):
+        return self.model.encode(texts, batch_size=settings.EMBEDDING_BATCH_SIZE, convert_to_numpy=True)
+
+    def embed(self, texts: List[str]):
+        return self.embeddings_cache.encode(list(texts))
+
+    def load(self):
+        import umap
+        from sklearn.cluster import HDBSCAN
+        return self.model
+
+    def is_ready(self):
+        return self._model is not None
         
     def cluster_related_topics(self, queries: List[str], n_clusters: int = 5):
         if not queries or len(queries) < 3:
             return {"clusters": [], "message": "Not enough queries for clustering"}
+        import umap
+        from sklearn.cluster import HDBSCAN
         
-        embeddings = self.model.encode(queries)
+        embeddings = self.embed(queries)
         reducer = umap.UMAP(n_components=min(5, len(queries)-1), random_state=42)
         reduced_embeddings = reducer.fit_transform(embeddings)
         clusterer = HDBSCAN(min_cluster_size=2, min_samples=1)
@@ -44,7 +78,6 @@ class NLPAnalyzer:
         }
     
     def get_topic_similarity(self, query1: str, query2: str):
-        emb1 = self.model.encode([query1])[0]
-        emb2 = self.model.encode([query2])[0]
+        emb1, emb2 = self.embed([query1, query2])
         similarity = np.dot(emb1, emb2) / (np.linalg.norm(emb1) * np.linalg.norm(emb2))
         return float(similarity)
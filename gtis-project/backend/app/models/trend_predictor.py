@@ -1,75 +1,339 @@
+import asyncio
+import os
+import sys
+import time
 import pandas as pd
 import numpy as np
-from prophet import Prophet
-from statsmodels.tsa.arima.model import ARIMA
-from sklearn.metrics import mean_absolute_percentage_error, mean_squared_error
+from ..config import settings
+from .arima_order import select_arima_order
+from .backtest import BacktestCache, backtest, rolling_origins
+from .baseline_forecasters import FAST_MODELS, MAPE_EPSILON, forecast_matrix
+from .fingerprint import data_fingerprint
+from .forecast_executor import ForecastQueueFull
+from .global_model import GlobalForecaster, GlobalModelUnavailable, daily_matrix, split_daily_series
+from .metrics_registry import MetricsRegistry
+from .model_cache import CACHED, WARM, ModelCache
 import warnings
 warnings.filterwarnings('ignore')
 
+PROPHET_CONFIG = {
+    "daily_seasonality": False,
+    "weekly_seasonality": True,
+    "yearly_seasonality": True,
+    "changepoint_prior_scale": 0.05
+}
+ARIMA_ORDER = (1, 1, 1)
+MODEL_MODES = {
+    "accurate": ("prophet", "arima"),
+    "fast": tuple(FAST_MODELS),
+    "global": ("global",),
+}
+ENSEMBLE_NAMES = {"accurate": "ensemble", "fast": "ensemble_fast"}
+FORECASTING_MODULES = ("prophet", "statsmodels.tsa.arima.model")
+VECTORISED_MODES = ("fast", "global")
+
+def mode_predictions(predictions: dict, mode: str):
+    selected = {name: pred for name, pred in predictions.items() if name in MODEL_MODES[mode]}
+    if selected and ENSEMBLE_NAMES.get(mode) in predictions:
+        selected[ENSEMBLE_NAMES[mode]] = predictions[ENSEMBLE_NAMES[mode]]
+    return selected
+
+def load_forecasting_modules():
+    import prophet.serialize
+    import statsmodels.tsa.arima.model
+    import statsmodels.tsa.stattools
+
+def forecasting_modules_loaded():
+    return all(module in sys.modules for module in FORECASTING_MODULES)
+
+def prophet_warm_start_params(model):
+    params = {name: model.params[name][0][0] for name in ('k', 'm', 'sigma_obs')}
+    params.update({name: model.params[name][0] for name in ('delta', 'beta')})
+    return params
+
+def prophet_fitted_values(model):
+    seasonal = model.predict_seasonal_components(model.history)
+    trend = model.predict_trend(model.history)
+    return (trend * (1 + seasonal['multiplicative_terms']) + seasonal['additive_terms']).values
+
+def in_sample_metrics(y: np.ndarray, fitted: np.ndarray):
+    errors = np.asarray(fitted, dtype=float) - y
+    return {
+        'mape': float(np.mean(np.abs(errors) / np.maximum(np.abs(y), MAPE_EPSILON))),
+        'rmse': float(np.sqrt(np.mean(errors ** 2)))
+    }
+
+def global_model_path():
+    return os.path.join(settings.MODEL_CACHE_DIR, "global_model.pkl") if settings.MODEL_CACHE_PERSIST else None
+
+def default_model_cache():
+    cache_dir = os.path.join(settings.MODEL_CACHE_DIR, "fitted") if settings.MODEL_CACHE_PERSIST else None
+    return ModelCache(cache_dir=cache_dir, max_entries=settings.MODEL_CACHE_MAX_ENTRIES,
+                      max_disk_bytes=int(settings.MODEL_CACHE_MAX_DISK_MB * 1024 * 1024))
+
 class TrendPredictor:
-    def __init__(self):
-        self.models = {}
+    def __init__(self, executor=None, model_cache: ModelCache = None, metrics_registry: MetricsRegistry = None):
+        self.models = model_cache if model_cache is not None else default_model_cache()
         self.scalers = {}
-        self.metrics = {}
-        
-    def predict(self, data: pd.DataFrame, keyword: str, periods: int = 30):
+        self.metrics_registry = metrics_registry if metrics_registry is not None else MetricsRegistry()
+        self.executor = executor
+        self.backtests = BacktestCache(max_entries=settings.BACKTEST_CACHE_ENTRIES)
+        self.global_model = None
+
+    def _prepare(self, data: pd.DataFrame):
         df = data.copy()
         df = df.reset_index()
         df.columns = ['ds', 'y']
+        return df
+        
+    def predict(self, data: pd.DataFrame, keyword: str, periods: int = 30, mode: str = "accurate"):
+        if mode in VECTORISED_MODES:
+            return self.predict_many({keyword: data}, periods, mode).get(keyword, {})
+        df = self._prepare(data)
         predictions = {}
         
         try:
-            prophet_pred = self._predict_prophet(df, periods)
+            prophet_pred = self._predict_prophet(df, periods, keyword)
             predictions['prophet'] = prophet_pred
+            self._record_fit('prophet', prophet_pred)
         except Exception as e:
             print(f"Prophet error: {e}")
+            self.metrics_registry.record_failure('prophet', type(e).__name__)
             
         try:
-            arima_pred = self._predict_arima(df, periods)
+            arima_pred = self._predict_arima(df, periods, keyword)
             predictions['arima'] = arima_pred
+            self._record_fit('arima', arima_pred)
         except Exception as e:
             print(f"ARIMA error: {e}")
+            self.metrics_registry.record_failure('arima', type(e).__name__)
             
         if predictions:
+            self._attach_backtests(df, predictions)
             ensemble = self._ensemble_predictions(predictions)
             predictions['ensemble'] = ensemble
             
         return predictions
-    
-    def _predict_prophet(self, df: pd.DataFrame, periods: int):
-        model = Prophet(
-            daily_seasonality=False,
-            weekly_seasonality=True,
-            yearly_seasonality=True,
-            changepoint_prior_scale=0.05
+
+    def predict_many(self, histories: dict, periods: int = 30, mode: str = "fast"):
+        if mode == "global":
+            return self.predict_global(histories, periods)
+        return self.predict_fast(histories, periods)
+
+    def predict_fast(self, histories: dict, periods: int = 30):
+        by_length = {}
+        for keyword, data in histories.items():
+            series = data.iloc[:, 0].dropna()
+            if not series.empty:
+                by_length.setdefault(len(series), []).append((keyword, series))
+
+        results = {}
+        for group in by_length.values():
+            Y = np.vstack([series.values for _, series in group])
+            forecasts = {}
+            fit_seconds = {}
+            for name in FAST_MODELS:
+                started = time.perf_counter()
+                try:
+                    forecasts.update(forecast_matrix(Y, periods, models=(name,),
+                                                     confidence=settings.FORECAST_CONFIDENCE_LEVEL))
+                except ValueError as e:
+                    print(f"{name} error: {e}")
+                    for _ in group:
+                        self.metrics_registry.record_failure(name, type(e).__name__)
+                    continue
+                fit_seconds[name] = (time.perf_counter() - started) / len(group)
+            for row, (keyword, series) in enumerate(group):
+                dates = pd.date_range(start=series.index.max(), periods=periods + 1, freq='D')[1:]
+                predictions = {
+                    name: {
+                        'dates': dates.strftime('%Y-%m-%d').tolist(),
+                        'values': forecast['values'][row].tolist(),
+                        'lower_bound': forecast['lower_bound'][row].tolist(),
+                        'upper_bound': forecast['upper_bound'][row].tolist(),
+                        'mape': float(forecast['mape'][row]),
+                        'rmse': float(forecast['rmse'][row]),
+                        'fit_seconds': fit_seconds[name]
+                    }
+                    for name, forecast in forecasts.items()
+                }
+                for name, pred in predictions.items():
+                    self._record_fit(name, pred)
+                if predictions:
+                    predictions[ENSEMBLE_NAMES['fast']] = self._ensemble_predictions(predictions)
+                results[keyword] = predictions
+        return results
+
+    def _global(self):
+        if self.global_model is None and global_model_path():
+            self.global_model = GlobalForecaster.load(global_model_path())
+        return self.global_model
+
+    def train_global(self, wide: pd.DataFrame):
+        daily, skipped = split_daily_series(wide)
+        if daily.empty:
+            raise ValueError(f"The global model trains on daily histories; all {len(skipped)} stored series are "
+                             f"weekly or coarser. Store daily data (timeframes up to 9 months or daily stitching).")
+        Y, weekdays, _ = daily_matrix(daily)
+        model = GlobalForecaster(kind=settings.GLOBAL_MODEL_KIND).fit(Y, weekdays)
+        model.info["skipped_series"] = len(skipped)
+        if global_model_path():
+            model.save(global_model_path())
+        self.global_model = model
+        return model.info
+
+    def predict_global(self, histories: dict, periods: int = 30):
+        model = self._global()
+        if model is None:
+            raise GlobalModelUnavailable("Global model has not been trained yet")
+        started = time.perf_counter()
+        series = {keyword: data.iloc[:, 0].dropna() for keyword, data in histories.items()}
+        series = {keyword: s for keyword, s in series.items() if not s.empty}
+        usable = {}
+        for keyword, s in series.items():
+            tail = s.reindex(pd.date_range(s.index.max() - pd.Timedelta(days=model.window - 1), s.index.max()))
+            if tail.isna().any():
+                print(f"global error for {keyword}: needs the last {model.window} daily points without gaps")
+                self.metrics_registry.record_failure('global', 'ValueError')
+                continue
+            usable[keyword] = (s.index.max(), tail.values)
+        if not usable:
+            return {}
+
+        last_dates = [last for last, _ in usable.values()]
+        forecast = model.forecast(
+            np.vstack([tail for _, tail in usable.values()]),
+            np.array([(last.dayofweek + 1) % 7 for last in last_dates]),
+            periods,
+            confidence=settings.FORECAST_CONFIDENCE_LEVEL
         )
-        model.fit(df)
-        future = model.make_future_dataframe(periods=periods)
-        forecast = model.predict(future)
-        
-        train_pred = forecast[forecast['ds'].isin(df['ds'])]['yhat'].values
-        mape = mean_absolute_percentage_error(df['y'].values, train_pred)
-        rmse = np.sqrt(mean_squared_error(df['y'].values, train_pred))
-        self.metrics['prophet'] = {'mape': mape, 'rmse': rmse}
+        Y, weekdays, _ = daily_matrix(pd.concat({keyword: series[keyword] for keyword in usable}, axis=1))
+        mape, rmse = model.score(Y, weekdays)
+        fit_seconds = (time.perf_counter() - started) / len(usable)
+
+        results = {}
+        for row, (keyword, last) in enumerate(zip(usable, last_dates)):
+            dates = pd.date_range(start=last, periods=periods + 1, freq='D')[1:]
+            results[keyword] = {'global': {
+                'dates': dates.strftime('%Y-%m-%d').tolist(),
+                'values': forecast['values'][row].tolist(),
+                'lower_bound': forecast['lower_bound'][row].tolist(),
+                'upper_bound': forecast['upper_bound'][row].tolist(),
+                'mape': float(mape[row]),
+                'rmse': float(rmse[row]),
+                'fit_seconds': fit_seconds
+            }}
+            self._record_fit('global', results[keyword]['global'])
+        return results
+
+    async def predict_async(self, data: pd.DataFrame, keyword: str, periods: int = 30, timeout: float = None,
+                            mode: str = "accurate"):
+        if mode in VECTORISED_MODES:
+            return await asyncio.to_thread(self.predict, data, keyword, periods, mode=mode)
+        if self.executor is None:
+            return await asyncio.to_thread(self.predict, data, keyword, periods)
+        df = self._prepare(data)
+        models = self.executor.models
+        results = await asyncio.gather(
+            *(self.executor.run(name, df, periods, timeout, keyword=keyword) for name in models),
+            return_exceptions=True
+        )
+        predictions = {}
+        for name, result in zip(models, results):
+            if isinstance(result, ForecastQueueFull):
+                raise result
+            if isinstance(result, BaseException):
+                print(f"{name} error for {keyword}: {result}")
+                self.metrics_registry.record_failure(name, type(result).__name__)
+                continue
+            predictions[name] = result
+            self._record_fit(name, result)
+
+        if predictions:
+            self._attach_backtests(df, predictions)
+            predictions['ensemble'] = self._ensemble_predictions(predictions)
+        return predictions
+    
+    def model_cache_stats(self):
+        if self.executor is not None:
+            return self.executor.model_cache_stats()
+        return self.models.stats()
+
+    def _record_fit(self, model_name: str, pred: dict):
+        self.metrics_registry.record_fit(model_name, pred.get('fit_seconds'), pred.get('mape'), pred.get('fit_mode'))
+
+    def _predict_prophet(self, df: pd.DataFrame, periods: int, keyword: str = None):
+        from prophet import Prophet
+        from prophet.serialize import model_from_json, model_to_json
+        started = time.perf_counter()
+        mode, entry = self.models.lookup('prophet', keyword, df, config=PROPHET_CONFIG)
+        if mode == CACHED:
+            model = model_from_json(entry['model'])
+            metrics = entry.get('metrics') or in_sample_metrics(df['y'].values, prophet_fitted_values(model))
+        else:
+            model = Prophet(**PROPHET_CONFIG)
+            if mode == WARM:
+                model.fit(df, init=entry['params'])
+            else:
+                model.fit(df)
+            metrics = in_sample_metrics(df['y'].values, prophet_fitted_values(model))
+            self.models.store('prophet', keyword, df, model_to_json(model), prophet_warm_start_params(model),
+                              config=PROPHET_CONFIG, metrics=metrics)
+        forecast = model.predict(model.make_future_dataframe(periods=periods, include_history=False))
+        mape, rmse = metrics['mape'], metrics['rmse']
         
         return {
-            'dates': forecast['ds'].tail(periods).dt.strftime('%Y-%m-%d').tolist(),
-            'values': forecast['yhat'].tail(periods).tolist(),
-            'lower_bound': forecast['yhat_lower'].tail(periods).tolist(),
-            'upper_bound': forecast['yhat_upper'].tail(periods).tolist(),
+            'dates': forecast['ds'].dt.strftime('%Y-%m-%d').tolist(),
+            'values': forecast['yhat'].tolist(),
+            'lower_bound': forecast['yhat_lower'].tolist(),
+            'upper_bound': forecast['yhat_upper'].tolist(),
             'mape': mape,
-            'rmse': rmse
+            'rmse': rmse,
+            'fit_mode': mode,
+            'fit_seconds': time.perf_counter() - started
         }
     
-    def _predict_arima(self, df: pd.DataFrame, periods: int):
-        model = ARIMA(df['y'].values, order=(5, 1, 2))
-        fitted_model = model.fit()
+    def _select_arima_order(self, y: np.ndarray):
+        order, _ = select_arima_order(
+            y,
+            max_p=settings.ARIMA_MAX_P,
+            max_d=settings.ARIMA_MAX_D,
+            max_q=settings.ARIMA_MAX_Q,
+            criterion=settings.ARIMA_CRITERION
+        )
+        return order or ARIMA_ORDER
+
+    def _order_search_due(self, previous: dict, n_obs: int):
+        search = previous.get('meta', {}).get('order_search') if previous is not None else None
+        if search is None:
+            return True
+        age_hours = (time.time() - search['at']) / 3600
+        length_change = abs(n_obs - search['n_obs']) / max(search['n_obs'], 1)
+        return age_hours > settings.ARIMA_ORDER_MAX_AGE_HOURS or length_change > settings.ARIMA_ORDER_MAX_LENGTH_CHANGE
+
+    def _predict_arima(self, df: pd.DataFrame, periods: int, keyword: str = None):
+        from statsmodels.tsa.arima.model import ARIMA
+        started = time.perf_counter()
+        previous = self.models.latest('arima', keyword)
+        order = previous['config'] if previous is not None else None
+        mode, entry = self.models.lookup('arima', keyword, df, config=order)
+        if mode == CACHED:
+            # Only the estimated parameters are cached; filtering rebuilds the fitted state without optimising
+            fitted_model = ARIMA(df['y'].values, order=order).filter(entry['params'])
+            metrics = entry.get('metrics') or in_sample_metrics(df['y'].values[1:], fitted_model.fittedvalues[1:])
+        else:
+            # Stored values are rescaled on every refresh, so most refits are cold; keep the searched order for those
+            meta = dict(previous.get('meta', {})) if previous is not None else {}
+            if mode != WARM and self._order_search_due(previous, len(df)):
+                order = self._select_arima_order(df['y'].values)
+                meta['order_search'] = {'at': time.time(), 'n_obs': len(df)}
+            model = ARIMA(df['y'].values, order=order)
+            fitted_model = model.fit(start_params=entry['params'] if mode == WARM else None)
+            metrics = in_sample_metrics(df['y'].values[1:], fitted_model.fittedvalues[1:])
+            self.models.store('arima', keyword, df, None, fitted_model.params, config=order, metrics=metrics,
+                              meta=meta)
         forecast = fitted_model.forecast(steps=periods)
-        
-        train_pred = fitted_model.fittedvalues
-        mape = mean_absolute_percentage_error(df['y'].values[1:], train_pred[1:])
-        rmse = np.sqrt(mean_squared_error(df['y'].values[1:], train_pred[1:]))
-        self.metrics['arima'] = {'mape': mape, 'rmse': rmse}
+        mape, rmse = metrics['mape'], metrics['rmse']
         
         future_dates = pd.date_range(start=df['ds'].max(), periods=periods + 1, freq='D')[1:]
         
@@ -77,9 +341,65 @@ class TrendPredictor:
             'dates': future_dates.strftime('%Y-%m-%d').tolist(),
             'values': forecast.tolist(),
             'mape': mape,
-            'rmse': rmse
+            'rmse': rmse,
+            'order': list(order),
+            'fit_mode': mode,
+            'fit_seconds': time.perf_counter() - started
         }
     
+    def _backtest_key(self, model_name: str, fingerprint: str, horizon: int):
+        return (model_name, fingerprint, settings.BACKTEST_HOLDOUT_DAYS, horizon, settings.BACKTEST_ORIGINS)
+
+    def _attach_backtests(self, df: pd.DataFrame, predictions: dict):
+        fingerprint = data_fingerprint(df)
+        for model_name, pred in predictions.items():
+            result = self.backtests.peek(self._backtest_key(model_name, fingerprint, settings.BACKTEST_HORIZON))
+            if result is not None:
+                pred['backtest'] = result
+
+    def _backtest_forecaster(self, model_name: str, df: pd.DataFrame, origins: np.ndarray, keyword: str = None):
+        y = df['y'].values.astype(float)
+        if model_name == 'arima':
+            from statsmodels.tsa.arima.model import ARIMA
+            previous = self.models.latest('arima', keyword)
+            order = previous['config'] if previous is not None else self._select_arima_order(y[:origins[0]])
+            fitted_model = ARIMA(y[:origins[0]], order=order).fit()
+            return lambda origin, horizon: fitted_model.apply(y[:origin]).forecast(steps=horizon)
+        if model_name == 'prophet':
+            from prophet import Prophet
+            state = {}
+
+            def forecast_from(origin: int, horizon: int):
+                model = Prophet(**PROPHET_CONFIG, uncertainty_samples=0)
+                if 'params' in state:
+                    model.fit(df.iloc[:origin], init=state['params'])
+                else:
+                    model.fit(df.iloc[:origin])
+                state['params'] = prophet_warm_start_params(model)
+                return model.predict(df.iloc[origin:origin + horizon][['ds']])['yhat'].values
+            return forecast_from
+        raise ValueError(f"Backtesting is not supported for {model_name}")
+
+    def backtest(self, data: pd.DataFrame, keyword: str = None, models=("prophet", "arima"), horizon: int = None):
+        df = self._prepare(data)
+        horizon = horizon or settings.BACKTEST_HORIZON
+        origins = rolling_origins(len(df), settings.BACKTEST_HOLDOUT_DAYS, horizon, settings.BACKTEST_ORIGINS)
+        fingerprint = data_fingerprint(df)
+        results = {}
+        for model_name in models:
+            key = self._backtest_key(model_name, fingerprint, horizon)
+            result = self.backtests.get(key)
+            if result is None:
+                try:
+                    result = backtest(df['y'].values, origins, horizon,
+                                      self._backtest_forecaster(model_name, df, origins, keyword))
+                except Exception as e:
+                    print(f"{model_name} backtest error: {e}")
+                    continue
+                self.backtests.put(key, result)
+            results[model_name] = result
+        return results
+
     def _ensemble_predictions(self, predictions: dict):
         weights = {}
         total_weight = 0
@@ -105,8 +425,12 @@ class TrendPredictor:
             'weights': weights
         }
     
-    def get_model_metrics(self):
-        return self.metrics
-    
+    def load(self):
+        load_forecasting_modules()
+        if self.executor is not None:
+            self.executor.warm_up()
+
     def is_ready(self):
-        return True
+        if self.executor is not None:
+            return self.executor.is_warm()
+        return forecasting_modules_loaded()
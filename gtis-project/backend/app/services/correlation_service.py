@@ -1,6 +1,5 @@
 import pandas as pd
 import numpy as np
-from scipy.stats import pearsonr, spearmanr
 from typing import Dict
 
 class CorrelationService:
@@ -48,6 +47,7 @@ class CorrelationService:
         min_len = min(len(s1), len(s2))
         s1, s2 = s1[:min_len], s2[:min_len]
         
+        from scipy.stats import pearsonr, spearmanr
         return pearsonr(s1, s2) if method == 'pearson' else spearmanr(s1, s2)
     
     def _get_external_data(self, source: str):
@@ -0,0 +1,179 @@
+import asyncio
+import time
+import pandas as pd
+from typing import List
+
+from ..models.fingerprint import data_fingerprint
+from ..models.forecast_executor import ForecastQueueFull
+from ..models.global_model import GlobalModelUnavailable
+from ..models.trend_predictor import VECTORISED_MODES, mode_predictions
+from .rate_limiter import INTERACTIVE
+
+HISTORY_DAYS = 365
+
+def model_key(keyword: str, geo: str = ""):
+    # Fitted models and ARIMA orders are cached per series, and a regional series is a different series
+    return f"{keyword}@{geo}" if geo else keyword
+
+def model_performance(predictions: dict):
+    return {
+        name: {"mape": pred["mape"], "rmse": pred["rmse"]}
+        for name, pred in predictions.items() if "mape" in pred
+    }
+
+class ForecastService:
+    def __init__(self, db_manager, trend_predictor, pytrends_service=None, batch_concurrency: int = 2):
+        self.db_manager = db_manager
+        self.trend_predictor = trend_predictor
+        self.pytrends_service = pytrends_service
+        self.batch_concurrency = batch_concurrency
+
+    async def _fetch_history(self, keyword: str, priority: int, geo: str = ""):
+        if self.pytrends_service is None:
+            return pd.DataFrame()
+        return await self.pytrends_service.fetch_interest_over_time_async(
+            keywords=[keyword],
+            timeframe="today 12-m",
+            geo=geo,
+            priority=priority
+        )
+
+    async def _fit(self, keyword: str, historical_data: pd.DataFrame, periods: int, fingerprint: str,
+                   mode: str = "accurate", geo: str = ""):
+        predictions = await self.trend_predictor.predict_async(
+            data=historical_data,
+            keyword=model_key(keyword, geo),
+            periods=periods,
+            mode=mode
+        )
+        if predictions:
+            await self.db_manager.store_predictions_async([{
+                "keyword": keyword,
+                "horizon": periods,
+                "fingerprint": fingerprint,
+                "predictions": predictions
+            }])
+        return predictions
+
+    async def _fit_vectorised_batch(self, histories: dict, periods: int, fingerprints: dict, mode: str):
+        forecasts = await asyncio.to_thread(self.trend_predictor.predict_many, histories, periods, mode)
+        forecasts = {keyword: predictions for keyword, predictions in forecasts.items() if predictions}
+        if forecasts:
+            await self.db_manager.store_predictions_async([
+                {"keyword": keyword, "horizon": periods, "fingerprint": fingerprints[keyword], "predictions": predictions}
+                for keyword, predictions in forecasts.items()
+            ])
+        return forecasts
+
+    def _result(self, keyword: str, predictions: dict, cached: bool):
+        return {
+            "status": "success",
+            "keyword": keyword,
+            "predictions": predictions,
+            "model_performance": model_performance(predictions),
+            "cached": cached
+        }
+
+    async def _history(self, keyword: str, priority: int, geo: str = ""):
+        historical_data = await self.db_manager.get_trend_history_async(keyword, days=HISTORY_DAYS, geo=geo)
+        if historical_data.empty:
+            historical_data = await self._fetch_history(keyword, priority, geo)
+        return historical_data
+
+    async def forecast(self, keyword: str, periods: int, force_refresh: bool = False, priority: int = INTERACTIVE,
+                       mode: str = "accurate", geo: str = ""):
+        historical_data = await self._history(keyword, priority, geo)
+        fingerprint = data_fingerprint(historical_data)
+        if not force_refresh:
+            stored = await self.db_manager.get_predictions_async([(keyword, periods, fingerprint)])
+            predictions = mode_predictions(stored.get((keyword, periods, fingerprint), {}), mode)
+            if predictions:
+                return self._result(keyword, predictions, cached=True)
+        predictions = await self._fit(keyword, historical_data, periods, fingerprint, mode, geo)
+        return self._result(keyword, predictions, cached=False)
+
+    async def backtest(self, keyword: str, horizon: int = None, priority: int = INTERACTIVE, geo: str = ""):
+        historical_data = await self._history(keyword, priority, geo)
+        if historical_data.empty:
+            raise ValueError(f"No history available for {keyword}")
+        return await asyncio.to_thread(self.trend_predictor.backtest, historical_data, model_key(keyword, geo),
+                                       horizon=horizon)
+
+    async def _load_histories(self, keywords: List[str], geo: str = ""):
+        wide = await self.db_manager.get_trend_histories_async(keywords, geo=geo)
+        histories = {}
+        for keyword in keywords:
+            series = wide[keyword].dropna().tail(HISTORY_DAYS) if keyword in wide.columns else pd.Series(dtype=float)
+            histories[keyword] = series.to_frame('interest_value')
+        return histories
+
+    async def stream_batch(self, keywords: List[str], periods: int, force_refresh: bool = False,
+                           priority: int = INTERACTIVE, mode: str = "accurate", geo: str = ""):
+        started = time.perf_counter()
+        keywords = list(dict.fromkeys(keywords))
+        histories = await self._load_histories(keywords, geo)
+        fingerprints = {keyword: data_fingerprint(history) for keyword, history in histories.items()}
+        stored = {}
+        if not force_refresh:
+            found = await self.db_manager.get_predictions_async([
+                (keyword, periods, fingerprint) for keyword, fingerprint in fingerprints.items() if fingerprint
+            ])
+            for keyword in keywords:
+                predictions = mode_predictions(found.get((keyword, periods, fingerprints[keyword]), {}), mode)
+                if predictions:
+                    stored[keyword] = predictions
+
+        fitted = {}
+        if mode in VECTORISED_MODES:
+            misses = {keyword: histories[keyword] for keyword in keywords
+                      if keyword not in stored and not histories[keyword].empty}
+            if misses:
+                try:
+                    fitted = await self._fit_vectorised_batch(misses, periods, fingerprints, mode)
+                except GlobalModelUnavailable as e:
+                    print(f"Batch forecast error: {e}")
+
+        summary = {"status": "complete", "keywords": len(keywords), "succeeded": 0, "failed": 0, "cached": 0}
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+
+        async def forecast_one(keyword: str):
+            try:
+                if keyword in stored:
+                    return self._result(keyword, stored[keyword], cached=True)
+                if keyword in fitted:
+                    return self._result(keyword, fitted[keyword], cached=False)
+                async with semaphore:
+                    history = histories[keyword]
+                    fingerprint = fingerprints[keyword]
+                    if history.empty:
+                        history = await self._fetch_history(keyword, priority, geo)
+                        fingerprint = data_fingerprint(history)
+                    if history.empty:
+                        return {"status": "error", "keyword": keyword, "detail": "no history available"}
+                    predictions = await self._fit(keyword, history, periods, fingerprint, mode, geo)
+                if not predictions:
+                    return {"status": "error", "keyword": keyword, "detail": "all models failed"}
+                return self._result(keyword, predictions, cached=False)
+            except ForecastQueueFull as e:
+                return {"status": "error", "keyword": keyword, "detail": str(e), "retryable": True}
+            except Exception as e:
+                return {"status": "error", "keyword": keyword, "detail": str(e)}
+
+        tasks = [asyncio.ensure_future(forecast_one(keyword)) for keyword in keywords]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                result = await next_result
+                if result["status"] == "success":
+                    summary["succeeded"] += 1
+                    summary["cached"] += int(result["cached"])
+                else:
+                    summary["failed"] += 1
+                yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        elapsed = time.perf_counter() - started
+        summary["elapsed_seconds"] = round(elapsed, 3)
+        summary["keywords_per_second"] = round(len(keywords) / elapsed, 3) if elapsed else None
+        yield summary
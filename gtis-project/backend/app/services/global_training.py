@@ -0,0 +1,40 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+import pandas as pd
+
+class GlobalModelTrainer:
+    def __init__(self, db_manager, trend_predictor, history_days: int = 365, chunk_size: int = 500):
+        self.db_manager = db_manager
+        self.trend_predictor = trend_predictor
+        self.history_days = history_days
+        self.chunk_size = chunk_size
+        self._lock = asyncio.Lock()
+        self.last_run = None
+
+    async def _load(self, keywords: list, geo: str):
+        start = datetime.now() - timedelta(days=self.history_days)
+        chunks = await asyncio.gather(*(
+            self.db_manager.get_trend_histories_async(keywords[i:i + self.chunk_size], geo=geo, start=start)
+            for i in range(0, len(keywords), self.chunk_size)
+        ))
+        chunks = [chunk for chunk in chunks if not chunk.empty]
+        return pd.concat(chunks, axis=1) if chunks else pd.DataFrame()
+
+    async def train(self, geo: str = ""):
+        async with self._lock:
+            started = time.perf_counter()
+            keywords = await self.db_manager.list_keywords_async(geo=geo)
+            wide = await self._load(keywords, geo)
+            if wide.empty:
+                raise ValueError("No stored trend histories to train the global model on")
+            load_seconds = time.perf_counter() - started
+            info = await asyncio.to_thread(self.trend_predictor.train_global, wide)
+            self.last_run = {
+                **info,
+                "keywords": len(keywords),
+                "geo": geo,
+                "load_seconds": round(load_seconds, 3),
+                "finished_at": datetime.now().isoformat()
+            }
+            return self.last_run
@@ -0,0 +1,106 @@
+import pandas as pd
+from datetime import timedelta
+from typing import List
+
+from .pytrends_service import timeframe_bounds
+from .rate_limiter import INTERACTIVE
+
+DAILY_MAX_DAYS = 269
+WEEKLY_MAX_DAYS = 1890
+RESOLUTION_STEPS = {"daily": 1, "weekly": 7, "monthly": 31}
+
+def native_resolution(days: int):
+    if days <= DAILY_MAX_DAYS:
+        return "daily"
+    if days <= WEEKLY_MAX_DAYS:
+        return "weekly"
+    return "monthly"
+
+def infer_resolution(index: pd.DatetimeIndex):
+    if len(index) < 2:
+        return None
+    step = pd.Series(index).diff().dt.days.median()
+    if step <= 1:
+        return "daily"
+    if step <= 7:
+        return "weekly"
+    return "monthly"
+
+def merge_tail(existing: pd.DataFrame, delta: pd.DataFrame):
+    overlap = existing.index.intersection(delta.index)
+    if len(overlap) == 0 or any(column not in delta.columns for column in existing.columns):
+        return None
+    scales = {}
+    for column in existing.columns:
+        reference = existing.loc[overlap, column].sum()
+        observed = delta.loc[overlap, column].sum()
+        scales[column] = reference / observed if reference > 0 and observed > 0 else 1.0
+    tail = delta.loc[delta.index > existing.index.max(), list(existing.columns)].astype(float) * pd.Series(scales)
+    merged = pd.concat([existing, tail])
+    peak = merged.max().max()
+    if peak > 100:
+        merged = merged * (100.0 / peak)
+        return merged, merged, True
+    return merged, tail, False
+
+class IncrementalRefresher:
+    def __init__(self, db_manager, pytrends_service, overlap_points: int = 4):
+        self.db_manager = db_manager
+        self.pytrends_service = pytrends_service
+        self.overlap_points = overlap_points
+
+    async def _full_refresh(self, keywords: List[str], timeframe: str, geo: str, anchor: str, priority: int,
+                            reason: str):
+        data = await self.pytrends_service.fetch_interest_over_time_async(
+            keywords=keywords, timeframe=timeframe, geo=geo, priority=priority, anchor=anchor
+        )
+        ingest = await self.db_manager.store_trends_async(data, keywords, geo=geo)
+        return data, {"mode": "full", "reason": reason, "ingest": ingest}
+
+    async def refresh(self, keywords: List[str], timeframe: str = "today 12-m", geo: str = "", anchor: str = None,
+                      priority: int = INTERACTIVE):
+        bounds = timeframe_bounds(timeframe)
+        if bounds is None:
+            return await self._full_refresh(keywords, timeframe, geo, anchor, priority, "timeframe has no fixed date range")
+        start, end = bounds
+        resolution = native_resolution((end - start).days)
+        step = timedelta(days=RESOLUTION_STEPS[resolution])
+
+        stored = await self.db_manager.get_trend_histories_async(keywords, geo=geo, start=start)
+        existing = stored.dropna() if not stored.empty else stored
+        if existing.empty or any(keyword not in existing.columns for keyword in keywords):
+            return await self._full_refresh(keywords, timeframe, geo, anchor, priority, "no stored history")
+        if infer_resolution(existing.index) != resolution:
+            return await self._full_refresh(keywords, timeframe, geo, anchor, priority, "stored resolution differs")
+        if existing.index.min() > start + step:
+            return await self._full_refresh(keywords, timeframe, geo, anchor, priority, "stored history starts too late")
+
+        latest = existing.index.max()
+        if latest + step > end:
+            return existing, {"mode": "up_to_date", "latest": latest.strftime('%Y-%m-%d'), "upstream_calls": 0}
+
+        delta_start = latest - step * self.overlap_points
+        if resolution == "weekly":
+            delta_start = min(delta_start, end - timedelta(days=DAILY_MAX_DAYS + 1))
+        elif resolution == "monthly":
+            delta_start = min(delta_start, end - timedelta(days=WEEKLY_MAX_DAYS + 1))
+        delta_timeframe = f"{delta_start:%Y-%m-%d} {end:%Y-%m-%d}"
+        delta = await self.pytrends_service.fetch_interest_over_time_async(
+            keywords=keywords, timeframe=delta_timeframe, geo=geo, priority=priority, anchor=anchor
+        )
+        if delta.empty:
+            return existing, {"mode": "stale", "reason": "delta fetch returned no data", "upstream_calls": 1}
+
+        merged = merge_tail(existing, delta)
+        if merged is None:
+            return await self._full_refresh(keywords, timeframe, geo, anchor, priority, "delta does not overlap stored history")
+        merged, to_store, rescaled = merged
+        ingest = await self.db_manager.store_trends_async(to_store, keywords, geo=geo)
+        return merged, {
+            "mode": "incremental",
+            "delta_timeframe": delta_timeframe,
+            "new_points": int((merged.index > latest).sum()),
+            "rescaled_history": rescaled,
+            "upstream_calls": 1,
+            "ingest": ingest
+        }
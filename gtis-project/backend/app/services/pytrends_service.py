@@ -1,58 +1,353 @@
 from pytrends.request import TrendReq
+import asyncio
+import re
+import numpy as np
 import pandas as pd
-import time
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 from typing import List
 
+from ..config import settings
+from .rate_limiter import INTERACTIVE, RequestScheduler
+from .trends_cache import TrendsCache, ttl_for_timeframe
+
+EMERGING_TRENDS_TTL = 15 * 60
+MAX_KEYWORDS_PER_REQUEST = 5
+DAILY_WINDOW_DAYS = 250
+DAILY_OVERLAP_DAYS = 60
+TRENDS_EPOCH = pd.Timestamp("2004-01-01")
+
+def _not_empty(value):
+    return len(value) > 0
+
+def chunk_keywords(keywords: List[str], anchor: str):
+    others = [keyword for keyword in dict.fromkeys(keywords) if keyword != anchor]
+    step = MAX_KEYWORDS_PER_REQUEST - 1
+    return [[anchor] + others[i:i + step] for i in range(0, len(others), step)] or [[anchor]]
+
+def normalize_batches(frames: List[pd.DataFrame], anchor: str, keywords: List[str]):
+    frames = [frame for frame in frames if not frame.empty and anchor in frame.columns]
+    if not frames:
+        return pd.DataFrame()
+
+    combined = frames[0].astype(float)
+    reference = combined[anchor]
+    for frame in frames[1:]:
+        frame = frame.astype(float).reindex(combined.index)
+        overlap = reference.notna() & frame[anchor].notna()
+        anchor_total = frame.loc[overlap, anchor].sum()
+        if anchor_total <= 0:
+            print(f"Anchor '{anchor}' has no interest in batch {list(frame.columns)}; skipping batch")
+            continue
+        scale = reference[overlap].sum() / anchor_total
+        new_columns = [column for column in frame.columns if column not in combined.columns]
+        combined = combined.join(frame[new_columns] * scale)
+
+    peak = np.nanmax(combined.values) if combined.size else 0
+    if peak > 0:
+        combined = combined * (100.0 / peak)
+    return combined[[keyword for keyword in keywords if keyword in combined.columns]]
+
+def timeframe_bounds(timeframe: str, today: pd.Timestamp = None):
+    today = (today or pd.Timestamp.today()).normalize()
+    if timeframe == "all":
+        return TRENDS_EPOCH, today
+    match = re.fullmatch(r"today (\d+)-([dmy])", timeframe)
+    if match:
+        amount, unit = int(match.group(1)), match.group(2)
+        offset = {"d": pd.DateOffset(days=amount), "m": pd.DateOffset(months=amount), "y": pd.DateOffset(years=amount)}[unit]
+        return max(TRENDS_EPOCH, today - offset), today
+    match = re.fullmatch(r"(\d{4}-\d{2}-\d{2}) (\d{4}-\d{2}-\d{2})", timeframe)
+    if match:
+        return pd.Timestamp(match.group(1)), pd.Timestamp(match.group(2))
+    return None
+
+def daily_windows(start: pd.Timestamp, end: pd.Timestamp, window_days: int = DAILY_WINDOW_DAYS,
+                  overlap_days: int = DAILY_OVERLAP_DAYS):
+    windows = []
+    window_start = start
+    while True:
+        window_end = min(window_start + timedelta(days=window_days - 1), end)
+        windows.append((window_start, window_end))
+        if window_end >= end:
+            return windows
+        window_start = window_end - timedelta(days=overlap_days - 1)
+
+def stitch_windows(frames: List[pd.DataFrame], existing: pd.DataFrame = None):
+    frames = sorted((frame.astype(float) for frame in frames if not frame.empty), key=lambda f: f.index.min())
+    combined = existing.astype(float) if existing is not None and not existing.empty else None
+    for frame in frames:
+        if combined is None:
+            combined = frame
+            continue
+        overlap = combined.index.intersection(frame.index)
+        columns = [column for column in frame.columns if column in combined.columns]
+        reference = combined.loc[overlap, columns].sum().sum()
+        observed = frame.loc[overlap, columns].sum().sum()
+        if reference <= 0 or observed <= 0:
+            print(f"No usable overlap before {frame.index.min().date()}; window appended unscaled")
+            scale = 1.0
+        else:
+            scale = reference / observed
+        tail = frame.loc[frame.index > combined.index.max()] * scale
+        combined = pd.concat([combined, tail])
+
+    if combined is None:
+        return pd.DataFrame()
+    peak = np.nanmax(combined.values) if combined.size else 0
+    if peak > 0:
+        combined = combined * (100.0 / peak)
+    combined.index.name = 'date'
+    return combined
+
+def usable_daily_history(existing: pd.DataFrame, keywords: List[str], overlap_days: int = DAILY_OVERLAP_DAYS):
+    if existing is None or existing.empty or any(keyword not in existing.columns for keyword in keywords):
+        return None
+    existing = existing[keywords].dropna()
+    recent = existing.index[-overlap_days:]
+    if len(recent) < overlap_days or (recent[1:] - recent[:-1]).max() != pd.Timedelta(days=1):
+        return None
+    return existing
+
+def interest_over_time_request(keywords: List[str], timeframe: str, geo: str):
+    def request(client):
+        client.build_payload(kw_list=keywords, cat=0, timeframe=timeframe, geo=geo, gprop='')
+        data = client.interest_over_time()
+        if 'isPartial' in data.columns:
+            data = data.drop(columns=['isPartial'])
+        return data
+    return request
+
+def related_queries_request(keyword: str, geo: str):
+    def request(client):
+        client.build_payload(kw_list=[keyword], timeframe='today 12-m', geo=geo)
+        related = client.related_queries()
+        if keyword in related and related[keyword]['top'] is not None:
+            return related[keyword]['top']['query'].tolist()[:20]
+        return []
+    return request
+
+def interest_by_region_request(keyword: str, geo: str):
+    def request(client):
+        client.build_payload(kw_list=[keyword], timeframe='today 12-m', geo=geo)
+        regional_data = client.interest_by_region(resolution='REGION' if geo else 'COUNTRY', inc_low_vol=True)
+        return regional_data.sort_values(by=keyword, ascending=False).head(50)
+    return request
+
+def emerging_trends_request(client):
+    trending = client.trending_searches(pn='united_states')
+    return trending[0].tolist()[:10] if not trending.empty else []
+
+def window_timeframe(window):
+    return f"{window[0]:%Y-%m-%d} {window[1]:%Y-%m-%d}"
+
+def _create_client():
+    return TrendReq(hl='en-US', tz=360)
+
 class PyTrendsService:
-    def __init__(self):
-        self.pytrends = TrendReq(hl='en-US', tz=360)
-        self.rate_limit_delay = 1
-        
-    def fetch_interest_over_time(self, keywords: List[str], timeframe: str = "today 12-m", geo: str = ""):
-        try:
-            self.pytrends.build_payload(kw_list=keywords, cat=0, timeframe=timeframe, geo=geo, gprop='')
-            data = self.pytrends.interest_over_time()
-            time.sleep(self.rate_limit_delay)
-            
-            if data.empty:
-                return pd.DataFrame()
-            if 'isPartial' in data.columns:
-                data = data.drop(columns=['isPartial'])
-            return data
-        except Exception as e:
-            print(f"Error fetching trends: {e}")
-            return pd.DataFrame()
-    
-    def get_related_queries(self, keyword: str):
-        try:
-            self.pytrends.build_payload(kw_list=[keyword], timeframe='today 12-m')
-            related = self.pytrends.related_queries()
-            time.sleep(self.rate_limit_delay)
-            
-            if keyword in related and related[keyword]['top'] is not None:
-                return related[keyword]['top']['query'].tolist()[:20]
-            return []
-        except Exception as e:
-            print(f"Error fetching related queries: {e}")
-            return []
-    
-    def get_interest_by_region(self, keyword: str):
+    def __init__(self, cache: TrendsCache = None, scheduler: RequestScheduler = None):
+        if cache is None and settings.PYTRENDS_CACHE_ENABLED:
+            cache_dir = os.path.join(settings.MODEL_CACHE_DIR, "pytrends") if settings.PYTRENDS_CACHE_PERSIST else None
+            cache = TrendsCache(max_entries=settings.PYTRENDS_CACHE_MAX_ENTRIES, cache_dir=cache_dir)
+        self.cache = cache
+        if scheduler is None:
+            scheduler = RequestScheduler(
+                _create_client,
+                rate=settings.PYTRENDS_RATE_LIMIT,
+                burst=settings.PYTRENDS_BURST,
+                workers=settings.PYTRENDS_WORKERS,
+                max_retries=settings.PYTRENDS_MAX_RETRIES,
+                backoff_base=settings.PYTRENDS_BACKOFF_SECONDS
+            )
+        self.scheduler = scheduler
+
+    def _cached(self, key, ttl, fetch, refresh: bool = False):
+        if self.cache is None:
+            return fetch()
+        if refresh:
+            self.cache.invalidate(key)
+        return self.cache.get_or_fetch(key, ttl, fetch, cacheable=_not_empty)
+
+    async def _cached_async(self, key, ttl, fetch, refresh: bool = False):
+        if self.cache is None:
+            return await fetch()
+        if refresh:
+            self.cache.invalidate(key)
+        return await self.cache.get_or_fetch_async(key, ttl, fetch, cacheable=_not_empty)
+
+    def _run(self, request, priority: int, error: str, empty):
         try:
-            self.pytrends.build_payload(kw_list=[keyword], timeframe='today 12-m')
-            regional_data = self.pytrends.interest_by_region(resolution='COUNTRY', inc_low_vol=True)
-            time.sleep(self.rate_limit_delay)
-            return regional_data.sort_values(by=keyword, ascending=False).head(50)
+            return self.scheduler.run(request, priority)
         except Exception as e:
-            print(f"Error fetching regional data: {e}")
-            return pd.DataFrame()
-    
-    def detect_emerging_trends(self, category: int = 0):
+            print(f"{error}: {e}")
+            return empty()
+
+    async def _run_async(self, request, priority: int, error: str, empty):
+        # Queued calls wait in the scheduler, not on a thread of the default executor
         try:
-            trending = self.pytrends.trending_searches(pn='united_states')
-            time.sleep(self.rate_limit_delay)
-            if not trending.empty:
-                return trending[0].tolist()[:10]
-            return []
+            return await self.scheduler.run_async(request, priority)
         except Exception as e:
-            print(f"Error detecting emerging trends: {e}")
-            return []
+            print(f"{error}: {e}")
+            return empty()
+
+    def cache_stats(self):
+        return self.cache.stats() if self.cache is not None else {"enabled": False}
+
+    def scheduler_stats(self):
+        return self.scheduler.stats()
+
+    def shutdown(self):
+        self.scheduler.shutdown()
+
+    def fetch_interest_over_time(self, keywords: List[str], timeframe: str = "today 12-m", geo: str = "",
+                                 priority: int = INTERACTIVE, anchor: str = None):
+        key = ("interest_over_time", tuple(keywords), timeframe, geo) + ((anchor,) if anchor else ())
+        return self._cached(key, ttl_for_timeframe(timeframe),
+                            lambda: self._fetch_interest_over_time(keywords, timeframe, geo, priority, anchor))
+
+    async def fetch_interest_over_time_async(self, keywords: List[str], timeframe: str = "today 12-m", geo: str = "",
+                                             priority: int = INTERACTIVE, anchor: str = None):
+        key = ("interest_over_time", tuple(keywords), timeframe, geo) + ((anchor,) if anchor else ())
+        return await self._cached_async(key, ttl_for_timeframe(timeframe),
+                                        lambda: self._fetch_interest_over_time_async(keywords, timeframe, geo,
+                                                                                     priority, anchor))
+
+    def _needs_chunking(self, keywords: List[str], anchor: str):
+        return len(keywords) > MAX_KEYWORDS_PER_REQUEST or (anchor and anchor not in keywords)
+
+    def _fetch_interest_over_time(self, keywords: List[str], timeframe: str, geo: str, priority: int,
+                                  anchor: str = None):
+        if self._needs_chunking(keywords, anchor):
+            return self._fetch_chunked(keywords, timeframe, geo, priority, anchor or keywords[0])
+        return self._run(interest_over_time_request(keywords, timeframe, geo), priority,
+                         "Error fetching trends", pd.DataFrame)
+
+    async def _fetch_interest_over_time_async(self, keywords: List[str], timeframe: str, geo: str, priority: int,
+                                              anchor: str = None):
+        if self._needs_chunking(keywords, anchor):
+            return await self._fetch_chunked_async(keywords, timeframe, geo, priority, anchor or keywords[0])
+        return await self._run_async(interest_over_time_request(keywords, timeframe, geo), priority,
+                                     "Error fetching trends", pd.DataFrame)
+
+    def _fetch_chunked(self, keywords: List[str], timeframe: str, geo: str, priority: int, anchor: str):
+        batches = chunk_keywords(keywords, anchor)
+        futures = [self.scheduler.submit(interest_over_time_request(batch, timeframe, geo), priority)
+                   for batch in batches]
+        frames = []
+        for batch, future in zip(batches, futures):
+            try:
+                frames.append(future.result())
+            except Exception as e:
+                print(f"Error fetching trends for batch {batch}: {e}")
+        return normalize_batches(frames, anchor, keywords)
+
+    async def _fetch_chunked_async(self, keywords: List[str], timeframe: str, geo: str, priority: int, anchor: str):
+        batches = chunk_keywords(keywords, anchor)
+        results = await asyncio.gather(
+            *(self.scheduler.run_async(interest_over_time_request(batch, timeframe, geo), priority) for batch in batches),
+            return_exceptions=True
+        )
+        frames = []
+        for batch, result in zip(batches, results):
+            if isinstance(result, Exception):
+                print(f"Error fetching trends for batch {batch}: {result}")
+            else:
+                frames.append(result)
+        return normalize_batches(frames, anchor, keywords)
+
+    def fetch_daily_interest_over_time(self, keywords: List[str], timeframe: str = "today 5-y", geo: str = "",
+                                       priority: int = INTERACTIVE, anchor: str = None,
+                                       existing: pd.DataFrame = None):
+        bounds = timeframe_bounds(timeframe)
+        if bounds is None or (bounds[1] - bounds[0]).days < DAILY_WINDOW_DAYS:
+            return self.fetch_interest_over_time(keywords, timeframe, geo, priority, anchor)
+        if existing is None:
+            key = ("daily_interest_over_time", tuple(keywords), timeframe, geo) + ((anchor,) if anchor else ())
+            return self._cached(key, ttl_for_timeframe(timeframe),
+                                lambda: self._fetch_stitched(keywords, bounds, geo, priority, anchor, None))
+        return self._fetch_stitched(keywords, bounds, geo, priority, anchor, existing)
+
+    async def fetch_daily_interest_over_time_async(self, keywords: List[str], timeframe: str = "today 5-y",
+                                                   geo: str = "", priority: int = INTERACTIVE, anchor: str = None,
+                                                   existing: pd.DataFrame = None):
+        bounds = timeframe_bounds(timeframe)
+        if bounds is None or (bounds[1] - bounds[0]).days < DAILY_WINDOW_DAYS:
+            return await self.fetch_interest_over_time_async(keywords, timeframe, geo, priority, anchor)
+        if existing is None:
+            key = ("daily_interest_over_time", tuple(keywords), timeframe, geo) + ((anchor,) if anchor else ())
+            return await self._cached_async(key, ttl_for_timeframe(timeframe),
+                                            lambda: self._fetch_stitched_async(keywords, bounds, geo, priority,
+                                                                               anchor, None))
+        return await self._fetch_stitched_async(keywords, bounds, geo, priority, anchor, existing)
+
+    def _stitch_plan(self, bounds, existing: pd.DataFrame):
+        start, end = bounds
+        if existing is not None:
+            existing = existing.loc[existing.index >= start]
+            if existing.empty:
+                existing = None
+            else:
+                start = max(start, existing.index.max() - timedelta(days=DAILY_OVERLAP_DAYS - 1))
+        return daily_windows(start, end), existing
+
+    def _fetch_stitched(self, keywords: List[str], bounds, geo: str, priority: int, anchor: str,
+                        existing: pd.DataFrame):
+        windows, existing = self._stitch_plan(bounds, existing)
+
+        def fetch_window(window):
+            return self._fetch_interest_over_time(keywords, window_timeframe(window), geo, priority, anchor)
+
+        with ThreadPoolExecutor(max_workers=min(len(windows), settings.PYTRENDS_WORKERS * 2)) as pool:
+            frames = list(pool.map(fetch_window, windows))
+        return stitch_windows(frames, existing)
+
+    async def _fetch_stitched_async(self, keywords: List[str], bounds, geo: str, priority: int, anchor: str,
+                                    existing: pd.DataFrame):
+        windows, existing = self._stitch_plan(bounds, existing)
+        frames = await asyncio.gather(*(
+            self._fetch_interest_over_time_async(keywords, window_timeframe(window), geo, priority, anchor)
+            for window in windows
+        ))
+        return stitch_windows(list(frames), existing)
+
+    def get_related_queries(self, keyword: str, geo: str = "", priority: int = INTERACTIVE, refresh: bool = False):
+        key = ("related_queries", (keyword,), "today 12-m", geo)
+        return self._cached(key, ttl_for_timeframe("today 12-m"),
+                            lambda: self._run(related_queries_request(keyword, geo), priority,
+                                              "Error fetching related queries", list),
+                            refresh=refresh)
+
+    async def get_related_queries_async(self, keyword: str, geo: str = "", priority: int = INTERACTIVE,
+                                        refresh: bool = False):
+        key = ("related_queries", (keyword,), "today 12-m", geo)
+        return await self._cached_async(key, ttl_for_timeframe("today 12-m"),
+                                        lambda: self._run_async(related_queries_request(keyword, geo), priority,
+                                                                "Error fetching related queries", list),
+                                        refresh=refresh)
+
+    def get_interest_by_region(self, keyword: str, geo: str = "", priority: int = INTERACTIVE, refresh: bool = False):
+        key = ("interest_by_region", (keyword,), "today 12-m", geo)
+        return self._cached(key, ttl_for_timeframe("today 12-m"),
+                            lambda: self._run(interest_by_region_request(keyword, geo), priority,
+                                              "Error fetching regional data", pd.DataFrame),
+                            refresh=refresh)
+
+    async def get_interest_by_region_async(self, keyword: str, geo: str = "", priority: int = INTERACTIVE,
+                                           refresh: bool = False):
+        key = ("interest_by_region", (keyword,), "today 12-m", geo)
+        return await self._cached_async(key, ttl_for_timeframe("today 12-m"),
+                                        lambda: self._run_async(interest_by_region_request(keyword, geo), priority,
+                                                                "Error fetching regional data", pd.DataFrame),
+                                        refresh=refresh)
+
+    def detect_emerging_trends(self, category: int = 0, priority: int = INTERACTIVE):
+        key = ("emerging_trends", (), "trending_searches", "united_states")
+        return self._cached(key, EMERGING_TRENDS_TTL,
+                            lambda: self._run(emerging_trends_request, priority, "Error detecting emerging trends", list))
+
+    async def detect_emerging_trends_async(self, category: int = 0, priority: int = INTERACTIVE):
+        key = ("emerging_trends", (), "trending_searches", "united_states")
+        return await self._cached_async(key, EMERGING_TRENDS_TTL,
+                                        lambda: self._run_async(emerging_trends_request, priority,
+                                                                "Error detecting emerging trends", list))
@@ -0,0 +1,138 @@
+import asyncio
+import itertools
+import queue
+import random
+import threading
+import time
+from concurrent.futures import Future
+
+INTERACTIVE = 0
+BACKGROUND = 10
+
+def is_rate_limited(exc: Exception):
+    response = getattr(exc, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    return exc.__class__.__name__ == "TooManyRequestsError"
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self):
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            wait = max(-self._tokens / self.rate, self._blocked_until - now, 0.0)
+            return wait
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self):
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def pause(self, seconds: float):
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+class RequestScheduler:
+    def __init__(self, client_factory, rate: float = 1.0, burst: float = 1, workers: int = 1,
+                 max_retries: int = 4, backoff_base: float = 2.0, backoff_max: float = 60.0):
+        self.client_factory = client_factory
+        self.bucket = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "rate_limited": 0, "retries": 0, "wait_seconds": 0.0}
+        self._workers = [
+            threading.Thread(target=self._work, name=f"gtis-trends-worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, func, priority: int = INTERACTIVE):
+        future = Future()
+        with self._lock:
+            self._stats["submitted"] += 1
+        self._queue.put((priority, next(self._sequence), func, future))
+        return future
+
+    def run(self, func, priority: int = INTERACTIVE):
+        return self.submit(func, priority).result()
+
+    async def run_async(self, func, priority: int = INTERACTIVE):
+        return await asyncio.wrap_future(self.submit(func, priority))
+
+    def _backoff(self, attempt: int):
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _work(self):
+        client = None
+        while True:
+            priority, _, func, future = self._queue.get()
+            if func is None:
+                break
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                if client is None:
+                    client = self.client_factory()
+                attempt = 0
+                while True:
+                    waited = self.bucket.acquire()
+                    with self._lock:
+                        self._stats["wait_seconds"] += waited
+                    try:
+                        result = func(client)
+                        break
+                    except Exception as e:
+                        if not is_rate_limited(e) or attempt >= self.max_retries:
+                            raise
+                        delay = self._backoff(attempt)
+                        with self._lock:
+                            self._stats["rate_limited"] += 1
+                            self._stats["retries"] += 1
+                        self.bucket.pause(delay)
+                        attempt += 1
+                future.set_result(result)
+                with self._lock:
+                    self._stats["completed"] += 1
+            except Exception as e:
+                future.set_exception(e)
+                with self._lock:
+                    self._stats["failed"] += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                **self._stats,
+                "queued": self._queue.qsize(),
+                "workers": len(self._workers),
+                "rate_per_second": self.bucket.rate
+            }
+
+    def shutdown(self):
+        for _ in self._workers:
+            self._queue.put((float("inf"), next(self._sequence), None, None))
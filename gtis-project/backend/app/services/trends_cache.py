@@ -0,0 +1,202 @@
+import asyncio
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+TIMEFRAME_TTLS = {
+    "now 1-H": 5 * 60,
+    "now 4-H": 10 * 60,
+    "now 1-d": 30 * 60,
+    "now 7-d": 60 * 60,
+    "today 1-m": 6 * 3600,
+    "today 3-m": 6 * 3600,
+    "today 12-m": 12 * 3600,
+    "today 5-y": 24 * 3600,
+    "all": 24 * 3600,
+}
+DEFAULT_TTL = 3600
+
+def ttl_for_timeframe(timeframe: str, overrides: dict = None):
+    ttls = {**TIMEFRAME_TTLS, **(overrides or {})}
+    return ttls.get(timeframe, DEFAULT_TTL)
+
+def _copy(value):
+    if hasattr(value, "copy"):
+        return value.copy()
+    return value
+
+class TrendsCache:
+    def __init__(self, max_entries: int = 512, cache_dir: str = None):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "coalesced": 0, "evictions": 0}
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _disk_path(self, key):
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.pkl")
+
+    def _load_from_disk(self, key):
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                stored_key, expires_at, value = pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError, ValueError):
+            return None
+        if stored_key != key or expires_at <= time.time():
+            return None
+        return expires_at, value
+
+    def _save_to_disk(self, key, expires_at, value):
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump((key, expires_at, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Trends cache write error: {e}")
+
+    def _remove_from_disk(self, key=None):
+        if not self.cache_dir:
+            return
+        if key is not None:
+            paths = [self._disk_path(key)]
+        else:
+            paths = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir) if name.endswith(".pkl")]
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Trends cache delete error: {e}")
+
+    def _store(self, key, expires_at, value):
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _claim(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.time():
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry, None, False
+            future = self._inflight.get(key)
+            if future is not None:
+                self._stats["coalesced"] += 1
+                return None, future, False
+            future = Future()
+            self._inflight[key] = future
+            return None, future, True
+
+    def _load_or_miss(self, key):
+        stored = self._load_from_disk(key)
+        with self._lock:
+            if stored is not None:
+                self._stats["disk_hits"] += 1
+                self._store(key, *stored)
+            else:
+                self._stats["misses"] += 1
+        return stored
+
+    def _keep(self, key, ttl: float, value, cacheable):
+        if cacheable is None or cacheable(value):
+            expires_at = time.time() + ttl
+            with self._lock:
+                self._store(key, expires_at, value)
+            self._save_to_disk(key, expires_at, value)
+
+    def _release(self, key):
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def get_or_fetch(self, key, ttl: float, fetch, cacheable=None):
+        entry, future, leader = self._claim(key)
+        if entry is not None:
+            return _copy(entry[1])
+        if not leader:
+            return _copy(future.result())
+
+        try:
+            stored = self._load_or_miss(key)
+            if stored is not None:
+                value = stored[1]
+            else:
+                value = fetch()
+                self._keep(key, ttl, value, cacheable)
+            future.set_result(value)
+            return _copy(value)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._release(key)
+
+    async def _off_loop(self, func, *args):
+        if not self.cache_dir:
+            return func(*args)
+        return await asyncio.to_thread(func, *args)
+
+    async def get_or_fetch_async(self, key, ttl: float, fetch, cacheable=None):
+        entry, future, leader = self._claim(key)
+        if entry is not None:
+            return _copy(entry[1])
+        if not leader:
+            return _copy(await asyncio.wrap_future(future))
+
+        try:
+            stored = await self._off_loop(self._load_or_miss, key)
+            if stored is not None:
+                value = stored[1]
+            else:
+                value = await fetch()
+                await self._off_loop(self._keep, key, ttl, value, cacheable)
+            future.set_result(value)
+            return _copy(value)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._release(key)
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+        # The persisted copy would otherwise be reloaded by the next lookup
+        self._remove_from_disk(key)
+
+    def stats(self):
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["disk_hits"] + self._stats["misses"] + self._stats["coalesced"]
+            served = lookups - self._stats["misses"]
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "inflight": len(self._inflight),
+                "hit_rate": served / lookups if lookups else 0.0,
+                "persistent": bool(self.cache_dir)
+            }
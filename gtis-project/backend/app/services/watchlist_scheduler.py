@@ -0,0 +1,124 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from .rate_limiter import BACKGROUND
+
+def watch_jobs(trend_refresher, pytrends_service, forecast_service):
+    async def warm_trends(watch: dict):
+        await trend_refresher.refresh([watch["keyword"]], timeframe=watch["timeframe"], geo=watch["geo"],
+                                      priority=BACKGROUND)
+
+    async def warm_regional_interest(watch: dict):
+        await pytrends_service.get_interest_by_region_async(watch["keyword"], geo=watch["geo"], priority=BACKGROUND,
+                                                           refresh=True)
+
+    async def warm_related_queries(watch: dict):
+        await pytrends_service.get_related_queries_async(watch["keyword"], geo=watch["geo"], priority=BACKGROUND,
+                                                        refresh=True)
+
+    async def warm_forecast(watch: dict):
+        await forecast_service.forecast(watch["keyword"], watch["horizon"], priority=BACKGROUND, geo=watch["geo"])
+
+    return {
+        "trends": warm_trends,
+        "regional_interest": warm_regional_interest,
+        "related_queries": warm_related_queries,
+        "forecast": warm_forecast
+    }
+
+class WatchlistScheduler:
+    def __init__(self, db_manager, jobs: dict, poll_seconds: float = 60, concurrency: int = 2):
+        self.db_manager = db_manager
+        self.jobs = jobs
+        self.poll_seconds = poll_seconds
+        self.concurrency = concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._running = set()
+        self._job_stats = {
+            name: {"runs": 0, "failures": 0, "last_seconds": None, "max_seconds": 0.0, "total_seconds": 0.0}
+            for name in jobs
+        }
+        self._lag = {"last_seconds": None, "max_seconds": 0.0}
+        self._state = {"ticks": 0, "last_tick": None, "watched": 0, "due": 0, "refreshed": 0}
+
+    @staticmethod
+    def due_at(watch: dict):
+        if watch["last_refreshed_at"] is None:
+            return None
+        return watch["last_refreshed_at"] + timedelta(minutes=watch["refresh_minutes"])
+
+    def _is_due(self, watch: dict, now: datetime):
+        if (watch["keyword"], watch["geo"]) in self._running:
+            return False
+        due_at = self.due_at(watch)
+        return due_at is None or due_at <= now
+
+    async def tick(self, now: datetime = None):
+        now = now or datetime.now()
+        watches = await self.db_manager.list_watches_async()
+        due = [watch for watch in watches if self._is_due(watch, now)]
+        self._state.update(ticks=self._state["ticks"] + 1, last_tick=now.isoformat(), watched=len(watches), due=len(due))
+        await asyncio.gather(*(self._refresh(watch) for watch in due))
+        return len(due)
+
+    async def _run_job(self, name: str, job, watch: dict):
+        stats = self._job_stats[name]
+        started = time.perf_counter()
+        try:
+            await job(watch)
+            return None
+        except Exception as e:
+            stats["failures"] += 1
+            print(f"Watchlist {name} refresh error for {watch['keyword']}: {e}")
+            return f"{name}: {e}"
+        finally:
+            elapsed = time.perf_counter() - started
+            stats["runs"] += 1
+            stats["last_seconds"] = round(elapsed, 3)
+            stats["max_seconds"] = round(max(stats["max_seconds"], elapsed), 3)
+            stats["total_seconds"] += elapsed
+
+    async def _refresh(self, watch: dict):
+        key = (watch["keyword"], watch["geo"])
+        self._running.add(key)
+        try:
+            async with self._semaphore:
+                due_at = self.due_at(watch)
+                if due_at is not None:
+                    lag = max(0.0, (datetime.now() - due_at).total_seconds())
+                    self._lag["last_seconds"] = round(lag, 3)
+                    self._lag["max_seconds"] = round(max(self._lag["max_seconds"], lag), 3)
+                errors = []
+                for name, job in self.jobs.items():
+                    error = await self._run_job(name, job, watch)
+                    if error:
+                        errors.append(error)
+                await self.db_manager.mark_watch_refreshed_async(*key, datetime.now(), "; ".join(errors) or None)
+                self._state["refreshed"] += 1
+        finally:
+            self._running.discard(key)
+
+    async def run_forever(self):
+        while True:
+            try:
+                await self.tick()
+            except Exception as e:
+                print(f"Watchlist scheduler error: {e}")
+            await asyncio.sleep(self.poll_seconds)
+
+    def stats(self):
+        jobs = {}
+        for name, stats in self._job_stats.items():
+            jobs[name] = {
+                **{k: v for k, v in stats.items() if k != "total_seconds"},
+                "avg_seconds": round(stats["total_seconds"] / stats["runs"], 3) if stats["runs"] else None
+            }
+        return {
+            **self._state,
+            "running": len(self._running),
+            "concurrency": self.concurrency,
+            "poll_seconds": self.poll_seconds,
+            "lag": dict(self._lag),
+            "jobs": jobs
+        }
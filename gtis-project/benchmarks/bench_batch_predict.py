@@ -0,0 +1,59 @@
+import asyncio
+import os
+import tempfile
+import time
+
+from common import isolate_model_cache, make_frame
+from app.database.db_manager import DatabaseManager
+from app.models.forecast_executor import ForecastExecutor
+from app.models.model_cache import ModelCache
+from app.models.trend_predictor import TrendPredictor
+from app.services.forecast_service import ForecastService
+
+N_KEYWORDS = int(os.environ.get("BENCH_KEYWORDS", 24))
+PERIODS = 30
+WORKERS = int(os.environ.get("BENCH_WORKERS", os.cpu_count() or 2))
+
+def run_serial(db: DatabaseManager, keywords):
+    predictor = TrendPredictor(model_cache=ModelCache())
+    for keyword in keywords:
+        predictor.predict(db.get_trend_history(keyword), keyword, PERIODS)
+
+async def run_batch(service: ForecastService, keywords):
+    first = None
+    started = time.perf_counter()
+    async for result in service.stream_batch(keywords, PERIODS, force_refresh=True):
+        if first is None:
+            first = time.perf_counter() - started
+        summary = result
+    return first, summary
+
+def report(name: str, elapsed: float, n: int, extra: str = ""):
+    print(f"{name:<28} {elapsed:8.2f}s  {n / elapsed:7.2f} keywords/s {extra}")
+
+def main():
+    keywords = [f"keyword-{i}" for i in range(N_KEYWORDS)]
+    warmup = [f"warmup-{i}" for i in range(WORKERS)]
+    with tempfile.TemporaryDirectory() as tmp:
+        # Each pass fits from scratch: no fitted model may be shared between passes or with earlier runs
+        isolate_model_cache(os.path.join(tmp, "models"), persist=False)
+        db = DatabaseManager(os.path.join(tmp, "bench.db"))
+        db.store_trends(make_frame(keywords + warmup, 365, seed=7, level=(50, 50), amplitude=(20, 20), slope=0, noise=5), keywords + warmup)
+        print(f"{N_KEYWORDS} keywords x 365 days, horizon {PERIODS}, {WORKERS} worker processes")
+
+        started = time.perf_counter()
+        run_serial(db, keywords)
+        report("serial predict (before)", time.perf_counter() - started, N_KEYWORDS)
+
+        executor = ForecastExecutor(max_workers=WORKERS, max_pending=4 * WORKERS)
+        service = ForecastService(db, TrendPredictor(executor=executor), batch_concurrency=WORKERS)
+        asyncio.run(run_batch(service, warmup))
+        started = time.perf_counter()
+        first, summary = asyncio.run(run_batch(service, keywords))
+        report("batch stream (after)", time.perf_counter() - started, N_KEYWORDS,
+               f"first result {first:.2f}s, {summary['failed']} failed")
+        executor.shutdown(wait=True)
+        db.close()
+
+if __name__ == "__main__":
+    main()
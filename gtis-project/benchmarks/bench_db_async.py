@@ -0,0 +1,81 @@
+import asyncio
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+from app.database.db_manager import DatabaseManager
+
+KEYWORDS = ["python", "javascript", "rust", "golang", "kotlin"]
+N_REQUESTS = int(os.environ.get("BENCH_REQUESTS", 500))
+WRITE_EVERY = 5
+ARRIVAL_INTERVAL = float(os.environ.get("BENCH_ARRIVAL_MS", 2)) / 1000
+HEARTBEAT_INTERVAL = 0.01
+# Writes after the first load are incremental refreshes of the most recent days
+WRITE_DAYS = int(os.environ.get("BENCH_WRITE_DAYS", 30))
+
+def make_frame(seed: int):
+    dates = pd.date_range(end=pd.Timestamp.today().normalize(), periods=5 * 365, freq='D')
+    rng = np.random.default_rng(seed)
+    values = rng.integers(0, 100, size=(len(dates), len(KEYWORDS))).astype(float)
+    return pd.DataFrame(values, index=dates, columns=KEYWORDS)
+
+async def blocking_request(db: DatabaseManager, i: int, frame: pd.DataFrame):
+    if i % WRITE_EVERY == 0:
+        db.store_trends(frame, KEYWORDS)
+    else:
+        db.get_trend_history(KEYWORDS[i % len(KEYWORDS)])
+
+async def async_request(db: DatabaseManager, i: int, frame: pd.DataFrame):
+    if i % WRITE_EVERY == 0:
+        await db.store_trends_async(frame, KEYWORDS)
+    else:
+        await db.get_trend_history_async(KEYWORDS[i % len(KEYWORDS)])
+
+async def heartbeat(lags: list):
+    # Every other coroutine on the loop (health checks, streaming responses) waits as long as this one
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + HEARTBEAT_INTERVAL
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        lags.append(loop.time() - expected)
+
+async def run_load(db: DatabaseManager, handler, frame: pd.DataFrame):
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    latencies = []
+    lags = []
+    ticker = asyncio.ensure_future(heartbeat(lags))
+
+    async def request(i):
+        arrival = start + i * ARRIVAL_INTERVAL
+        await asyncio.sleep(max(0.0, arrival - loop.time()))
+        await handler(db, i, frame)
+        latencies.append(loop.time() - arrival)
+
+    await asyncio.gather(*(request(i) for i in range(N_REQUESTS)))
+    ticker.cancel()
+    return np.array(latencies) * 1000, np.array(lags or [0.0]) * 1000
+
+def report(name: str, result):
+    latencies, lags = result
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    print(f"{name:<22} p50={p50:8.2f}ms  p95={p95:8.2f}ms  p99={p99:8.2f}ms  max={latencies.max():8.2f}ms  "
+          f"loop lag p99={np.percentile(lags, 99):7.2f}ms")
+
+def main():
+    frame = make_frame(42)
+    refresh = frame.tail(WRITE_DAYS)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, "bench.db"))
+        db.store_trends(frame, KEYWORDS)
+        print(f"{N_REQUESTS} requests, 1 write per {WRITE_EVERY}, {len(refresh)} days x {len(KEYWORDS)} keywords per write")
+        report("blocking (before)", asyncio.run(run_load(db, blocking_request, refresh)))
+        report("async executor (after)", asyncio.run(run_load(db, async_request, refresh)))
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from common import isolate_model_cache, make_frame
+from app.database.db_manager import DatabaseManager
+from app.models.trend_predictor import TrendPredictor
+
+N_KEYWORDS = int(os.environ.get("BENCH_KEYWORDS", 200))
+ACCURATE_SAMPLE = int(os.environ.get("BENCH_ACCURATE_SAMPLE", 10))
+HORIZON = 30
+HISTORY_DAYS = 365
+
+def load_histories(db: DatabaseManager, keywords):
+    wide = db.get_trend_histories(keywords)
+    return {keyword: wide[keyword].dropna().tail(HISTORY_DAYS).to_frame('interest_value') for keyword in keywords}
+
+def holdout_mape(predictions: dict, actual: np.ndarray):
+    actual = np.maximum(np.abs(actual), 1.0)
+    return {name: float(np.mean(np.abs(np.array(pred['values']) - actual) / actual))
+            for name, pred in predictions.items()}
+
+def report(name: str, elapsed: float, n: int, mapes: dict):
+    scores = "  ".join(f"{model}={np.mean(values):.3f}" for model, values in mapes.items())
+    print(f"{name:<10} {n:4d} keywords  {1000 * elapsed / n:9.2f} ms/keyword  holdout MAPE: {scores}")
+
+def collect(mapes: dict, scores: dict):
+    for model, score in scores.items():
+        mapes.setdefault(model, []).append(score)
+
+def main():
+    # BENCH_DATABASE_URL + BENCH_KEYWORD_LIST (comma separated) benchmark real stored histories
+    url = os.environ.get("BENCH_DATABASE_URL")
+    with tempfile.TemporaryDirectory() as tmp:
+        isolate_model_cache(os.path.join(tmp, "models"), persist=False)
+        if url:
+            db = DatabaseManager(database_url=url)
+            keywords = os.environ["BENCH_KEYWORD_LIST"].split(",")
+        else:
+            db = DatabaseManager(os.path.join(tmp, "bench.db"))
+            keywords = [f"keyword-{i}" for i in range(N_KEYWORDS)]
+            db.store_trends(make_frame(keywords, HISTORY_DAYS, seed=11), keywords)
+        histories = load_histories(db, keywords)
+        train = {k: h.iloc[:-HORIZON] for k, h in histories.items() if len(h) > 2 * HORIZON}
+        actual = {k: histories[k]['interest_value'].values[-HORIZON:] for k in train}
+        print(f"{len(train)} stored histories, holdout {HORIZON} days")
+
+        predictor = TrendPredictor()
+        started = time.perf_counter()
+        fast = predictor.predict_fast(train, HORIZON)
+        elapsed = time.perf_counter() - started
+        mapes = {}
+        for keyword, predictions in fast.items():
+            collect(mapes, holdout_mape(predictions, actual[keyword]))
+        report("fast", elapsed, len(fast), mapes)
+
+        sample = list(train)[:ACCURATE_SAMPLE]
+        mapes = {}
+        started = time.perf_counter()
+        for keyword in sample:
+            collect(mapes, holdout_mape(predictor.predict(train[keyword], None, HORIZON), actual[keyword]))
+        report("accurate", time.perf_counter() - started, len(sample), mapes)
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import asyncio
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from common import isolate_model_cache, make_frame
+from app.database.db_manager import DatabaseManager
+from app.models.model_cache import ModelCache
+from app.models.trend_predictor import TrendPredictor
+from app.services.global_training import GlobalModelTrainer
+
+N_KEYWORDS = int(os.environ.get("BENCH_KEYWORDS", 2000))
+PER_SERIES_SAMPLE = int(os.environ.get("BENCH_ACCURATE_SAMPLE", 10))
+HORIZON = 30
+HISTORY_DAYS = 365
+
+def holdout_mape(predictions: dict, actual: np.ndarray):
+    actual = np.maximum(np.abs(actual), 1.0)
+    return {name: float(np.mean(np.abs(np.array(pred['values']) - actual) / actual))
+            for name, pred in predictions.items()}
+
+def report(name: str, elapsed: float, n: int, mapes: dict):
+    scores = "  ".join(f"{model}={np.mean(values):.3f}" for model, values in mapes.items())
+    print(f"{name:<12} {n:5d} keywords  {1000 * elapsed / n:9.2f} ms/keyword  holdout MAPE: {scores}")
+
+def collect(mapes: dict, scores: dict):
+    for model, score in scores.items():
+        mapes.setdefault(model, []).append(score)
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        isolate_model_cache(os.path.join(tmp, "models"))
+        keywords = [f"keyword-{i}" for i in range(N_KEYWORDS)]
+        frame = make_frame(keywords, HISTORY_DAYS, seed=11)
+        db = DatabaseManager(os.path.join(tmp, "bench.db"))
+        db.store_trends(frame.iloc[:-HORIZON], keywords)
+        train = {keyword: frame[[keyword]].iloc[:-HORIZON] for keyword in keywords}
+        actual = {keyword: frame[keyword].values[-HORIZON:] for keyword in keywords}
+
+        predictor = TrendPredictor(model_cache=ModelCache())
+        info = asyncio.run(GlobalModelTrainer(db, predictor).train())
+        print(f"trained {info['kind']} global model on {info['series']} series / {info['samples']} windows: "
+              f"load {info['load_seconds']:.2f}s, fit {info['train_seconds']:.2f}s")
+
+        started = time.perf_counter()
+        results = predictor.predict_many(train, HORIZON, mode="global")
+        elapsed = time.perf_counter() - started
+        mapes = {}
+        for keyword, predictions in results.items():
+            collect(mapes, holdout_mape(predictions, actual[keyword]))
+        report("global", elapsed, len(results), mapes)
+
+        sample = keywords[:PER_SERIES_SAMPLE]
+        mapes = {}
+        started = time.perf_counter()
+        for keyword in sample:
+            collect(mapes, holdout_mape(predictor.predict(train[keyword], None, HORIZON), actual[keyword]))
+        report("per-series", time.perf_counter() - started, len(sample), mapes)
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+REPEATS = int(os.environ.get("BENCH_REPEATS", 3))
+
+STAGES = {
+    "import app.main": "import app.main",
+    "forecasting warm-up": "from app.models.trend_predictor import TrendPredictor; TrendPredictor().load()",
+    "nlp warm-up": "from app.models.nlp_analyzer import NLPAnalyzer; NLPAnalyzer().load()",
+}
+
+TIMER = """
+import time
+started = time.perf_counter()
+{statement}
+print(time.perf_counter() - started)
+"""
+
+def time_stage(statement: str):
+    setup, _, timed = statement.rpartition("; ")
+    code = f"{setup}\n{TIMER.format(statement=timed)}" if setup else TIMER.format(statement=timed)
+    result = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None, result.stderr.strip().splitlines()[-1]
+    return float(result.stdout.strip().splitlines()[-1]), None
+
+def heaviest_imports(limit: int = 8):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.main"], cwd=BACKEND_DIR,
+                            capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit() and len(parts[2]) - len(parts[2].lstrip()) == 3:
+            rows.append((int(parts[1]), parts[2].strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+def main():
+    for name, statement in STAGES.items():
+        timings = []
+        for _ in range(REPEATS):
+            elapsed, error = time_stage(statement)
+            if error:
+                print(f"{name:<22} failed: {error}")
+                break
+            timings.append(elapsed)
+        if timings:
+            print(f"{name:<22} median {statistics.median(timings):6.2f}s  (min {min(timings):.2f}s, {REPEATS} runs)")
+
+    print("\nheaviest top-level imports of app.main:")
+    for cumulative_us, module in heaviest_imports():
+        print(f"  {cumulative_us / 1e6:6.2f}s  {module}")
+
+if __name__ == "__main__":
+    main()
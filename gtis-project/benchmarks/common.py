@@ -0,0 +1,25 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+from app.config import settings
+
+def isolate_model_cache(cache_dir: str, persist: bool = True):
+    # The environment copy reaches spawned forecast workers, which build their own settings on import
+    os.environ["MODEL_CACHE_DIR"] = settings.MODEL_CACHE_DIR = cache_dir
+    settings.MODEL_CACHE_PERSIST = persist
+    os.environ["MODEL_CACHE_PERSIST"] = str(persist).lower()
+
+def make_frame(keywords, days: int, seed: int, level=(20, 60), amplitude=(2, 15), slope: float = 0.05,
+               noise: float = 3.0):
+    # Per-keyword level, trend and weekly phase, on a 0-100 scale like Google Trends
+    dates = pd.date_range(end=pd.Timestamp.today().normalize(), periods=days, freq='D')
+    rng = np.random.default_rng(seed)
+    t = np.arange(days)[:, None]
+    n = len(keywords)
+    weekly = rng.uniform(*amplitude, n) * np.sin(2 * np.pi * t / 7 + rng.random(n) * 6)
+    values = rng.uniform(*level, n) + rng.normal(0, slope, n) * t + weekly + rng.normal(0, noise, (days, n))
+    return pd.DataFrame(values.clip(0, 100).round(), index=dates, columns=keywords)
@@ -0,0 +1,29 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Settings are read from the environment on import, so this must run before any test imports the app
+STATE_DIR = tempfile.mkdtemp(prefix="gtis-tests-")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{STATE_DIR}/gtis.db",
+    "MODEL_CACHE_DIR": os.path.join(STATE_DIR, "models"),
+    "EMBEDDING_CACHE_DIR": os.path.join(STATE_DIR, "embeddings"),
+})
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(STATE_DIR, ignore_errors=True)
+
+def sine_frame(columns=("interest_value",), periods=200, start="2024-01-01", seed=0,
+               level=50.0, amplitude=10.0, noise=2.0):
+    # A (low, high) level or amplitude draws a separate value for each column
+    rng = np.random.default_rng(seed)
+    t = np.arange(periods)[:, None]
+    if isinstance(amplitude, tuple):
+        amplitude = rng.uniform(*amplitude, len(columns))
+    if isinstance(level, tuple):
+        level = rng.uniform(*level, len(columns))
+    values = level + amplitude * np.sin(2 * np.pi * t / 7) + rng.normal(0, noise, (periods, len(columns)))
+    dates = pd.date_range(start, periods=periods, freq="D", name="date")
+    return pd.DataFrame(values, index=dates, columns=list(columns))
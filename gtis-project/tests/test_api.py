@@ -1,7 +1,9 @@
 import pytest
 from fastapi.testclient import TestClient
 import sys
+import threading
 sys.path.append('..')
+from backend.app import main
 from backend.app.main import app
 
 client = TestClient(app)
@@ -25,3 +27,27 @@ def test_fetch_trends():
     response = client.post("/api/fetch-trends", json=payload)
     assert response.status_code == 200
     assert response.json()["status"] == "success"
+
+def test_related_queries_are_clustered_off_the_event_loop(monkeypatch):
+    threads = {}
+
+    async def related_queries(keyword, geo=""):
+        threads["loop"] = threading.get_ident()
+        return ["python course", "python snake"]
+
+    def cluster(queries):
+        threads["cluster"] = threading.get_ident()
+        return {"0": queries}
+
+    monkeypatch.setattr(main.pytrends_service, "get_related_queries_async", related_queries)
+    monkeypatch.setattr(main.nlp_analyzer, "cluster_related_topics", cluster)
+    response = client.get("/api/related-queries/python")
+    assert response.status_code == 200
+    assert response.json()["topic_clusters"] == {"0": ["python course", "python snake"]}
+    assert threads["cluster"] != threads["loop"]
+
+def test_compaction_returns_501_on_backends_without_it(monkeypatch):
+    monkeypatch.setattr(main.db_manager.backend, "supports_compaction", False)
+    response = client.post("/api/admin/compact")
+    assert response.status_code == 501
+    assert "not supported" in response.json()["detail"]
@@ -0,0 +1,78 @@
+import pytest
+import sys
+import threading
+sys.path.append('..')
+import numpy as np
+import pandas as pd
+from backend.app.models import arima_order, trend_predictor
+from backend.app.models.arima_order import choose_differencing, select_arima_order
+from backend.app.models.model_cache import ModelCache
+from backend.app.models.trend_predictor import TrendPredictor
+
+def ar_series(n, phi=0.7, seed=0):
+    noise = np.random.default_rng(seed).normal(0, 1, n)
+    y = np.zeros(n)
+    for t in range(1, n):
+        y[t] = phi * y[t - 1] + noise[t]
+    return 50 + y
+
+def test_differencing_follows_stationarity():
+    assert choose_differencing(ar_series(300)) == 0
+    assert choose_differencing(np.cumsum(ar_series(300) - 50)) == 1
+
+def test_search_finds_ar_order_and_prunes(monkeypatch):
+    fit_threads = set()
+    score_order = arima_order.score_order
+
+    def recording_score(*args, **kwargs):
+        fit_threads.add(threading.get_ident())
+        return score_order(*args, **kwargs)
+
+    monkeypatch.setattr(arima_order, "score_order", recording_score)
+    order, info = select_arima_order(ar_series(300), max_p=3, max_d=2, max_q=3)
+    assert order[0] >= 1 and order[1] == 0
+    assert info["evaluated"] + info["pruned"] == 16 and info["pruned"] > 0
+    assert fit_threads == {threading.get_ident()}
+
+def test_chosen_order_is_reused_on_refit(monkeypatch):
+    searches = []
+    original = trend_predictor.select_arima_order
+
+    def counting_search(y, **kwargs):
+        searches.append(len(y))
+        return original(y, **kwargs)
+
+    monkeypatch.setattr(trend_predictor, "select_arima_order", counting_search)
+    predictor = TrendPredictor(model_cache=ModelCache())
+    dates = pd.date_range("2024-01-01", periods=200, freq="D")
+    df = pd.DataFrame({"ds": dates, "y": ar_series(200)})
+
+    first = predictor._predict_arima(df.iloc[:180], 7, "golang")
+    appended = predictor._predict_arima(df.iloc[10:], 7, "golang")
+    assert appended["fit_mode"] == "warm" and appended["order"] == first["order"]
+    assert searches == [180]
+
+def test_cold_refit_reuses_cached_order_until_search_is_due(monkeypatch):
+    searches = []
+    original = trend_predictor.select_arima_order
+
+    def counting_search(y, **kwargs):
+        searches.append(len(y))
+        return original(y, **kwargs)
+
+    monkeypatch.setattr(trend_predictor, "select_arima_order", counting_search)
+    predictor = TrendPredictor(model_cache=ModelCache())
+    dates = pd.date_range("2024-01-01", periods=200, freq="D")
+    df = pd.DataFrame({"ds": dates, "y": ar_series(200)})
+
+    first = predictor._predict_arima(df.iloc[:180], 7, "golang")
+    rescaled = df.iloc[:185].assign(y=lambda frame: frame["y"] * 1.1)
+    refit = predictor._predict_arima(rescaled, 7, "golang")
+    assert refit["fit_mode"] == "cold" and refit["order"] == first["order"]
+    assert searches == [180]
+
+    predictor._predict_arima(df.iloc[:100], 7, "golang")
+    assert searches == [180, 100]
+    monkeypatch.setattr(trend_predictor.settings, "ARIMA_ORDER_MAX_AGE_HOURS", 0)
+    predictor._predict_arima(df.iloc[:100].assign(y=lambda frame: frame["y"] + 1), 7, "golang")
+    assert searches == [180, 100, 100]
@@ -0,0 +1,36 @@
+import pytest
+import sys
+sys.path.append('..')
+import numpy as np
+from backend.app.models.backtest import backtest, rolling_origins
+from backend.app.models.model_cache import ModelCache
+from backend.app.models.trend_predictor import TrendPredictor
+from tests.conftest import sine_frame
+
+def test_rolling_origins_cover_holdout():
+    origins = rolling_origins(100, holdout=28, horizon=7, n_origins=4)
+    assert origins[0] == 72 and origins[-1] == 93 and len(origins) == 4
+    with pytest.raises(ValueError):
+        rolling_origins(40, holdout=28, horizon=7, n_origins=4)
+
+def test_backtest_scores_forecast_windows():
+    y = np.arange(100, dtype=float) + 1
+    exact = backtest(y, np.array([80, 90]), 5, lambda origin, horizon: y[origin:origin + horizon])
+    assert exact["mape"] == 0 and exact["rmse"] == 0 and exact["origins"] == 2
+    shifted = backtest(y, np.array([80, 90]), 5, lambda origin, horizon: y[origin:origin + horizon] + 2)
+    assert shifted["rmse"] == pytest.approx(2.0) and len(shifted["mape_by_step"]) == 5
+
+def test_backtest_is_cached_and_attached_to_forecasts():
+    predictor = TrendPredictor(model_cache=ModelCache())
+    history = sine_frame(periods=150, seed=1)
+
+    results = predictor.backtest(history, "python")
+    assert set(results) == {"prophet", "arima"}
+    assert all(result["origins"] == 4 and result["horizon"] == 7 for result in results.values())
+    assert predictor.backtest(history, "python") == results
+    assert predictor.backtests.stats()["hits"] == 2
+
+    predictions = predictor.predict(history, "python", periods=10)
+    assert predictions["prophet"]["backtest"] == results["prophet"]
+    assert len(predictions["prophet"]["values"]) == 10
+    assert predictions["prophet"]["dates"][0] == "2024-05-30"
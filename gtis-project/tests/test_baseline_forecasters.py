@@ -0,0 +1,74 @@
+import pytest
+import asyncio
+import sys
+import threading
+sys.path.append('..')
+import numpy as np
+import pandas as pd
+from backend.app.models.baseline_forecasters import damped_trend, forecast_matrix, holt_winters, seasonal_naive
+from backend.app.models.trend_predictor import TrendPredictor, mode_predictions
+
+def seasonal_series(n_series=5, periods=140, noise=0.0):
+    t = np.arange(periods)
+    rng = np.random.default_rng(3)
+    return np.vstack([
+        40 + 0.1 * i * t + 10 * np.sin(2 * np.pi * t / 7 + i) + rng.normal(0, noise, periods)
+        for i in range(n_series)
+    ])
+
+def test_seasonal_naive_repeats_last_season():
+    Y = seasonal_series()
+    _, forecast = seasonal_naive(Y, 10)
+    assert np.allclose(forecast[:, :7], Y[:, -7:])
+    assert np.allclose(forecast[:, 7:], Y[:, -7:-4])
+
+def test_smoothers_track_trend_and_season():
+    Y = seasonal_series(noise=0.5)
+    train, test = Y[:, :-14], Y[:, -14:]
+    _, hw = holt_winters(train, 14)
+    _, damped = damped_trend(train, 14)
+    hw_error = np.abs(hw - test).mean()
+    assert hw_error < 2.0
+    assert hw_error < np.abs(damped - test).mean()
+
+def test_matrix_forecast_matches_row_by_row():
+    Y = seasonal_series(n_series=8)
+    batch = forecast_matrix(Y, 7)
+    for i in range(len(Y)):
+        single = forecast_matrix(Y[i:i + 1], 7)
+        for name in batch:
+            assert np.allclose(batch[name]["values"][i], single[name]["values"][0])
+            assert batch[name]["mape"][i] == pytest.approx(single[name]["mape"][0])
+
+def test_fast_mode_predictions():
+    dates = pd.date_range("2024-01-01", periods=140, freq="D", name="date")
+    Y = seasonal_series(n_series=3)
+    histories = {f"kw{i}": pd.DataFrame({"interest_value": Y[i]}, index=dates) for i in range(3)}
+    histories["short"] = histories["kw0"].tail(10)
+    predictions = TrendPredictor().predict_fast(histories, periods=5)
+    assert set(predictions["kw0"]) == {"seasonal_naive", "holt_winters", "damped_trend", "ensemble_fast"}
+    assert predictions["kw0"]["holt_winters"]["dates"][0] == "2024-05-20"
+    assert "holt_winters" not in predictions["short"] and "seasonal_naive" in predictions["short"]
+
+    single = TrendPredictor().predict(histories["kw1"], "kw1", periods=5, mode="fast")
+    assert np.allclose(single["ensemble_fast"]["values"], predictions["kw1"]["ensemble_fast"]["values"])
+    assert mode_predictions({**single, "arima": {}}, "fast") == single
+    assert mode_predictions(single, "accurate") == {}
+
+def test_fast_mode_async_predictions_run_off_the_event_loop():
+    dates = pd.date_range("2024-01-01", periods=140, freq="D", name="date")
+    history = pd.DataFrame({"interest_value": seasonal_series(n_series=1)[0]}, index=dates)
+    predictor = TrendPredictor()
+    fit_threads = []
+    predict = predictor.predict
+    def recording_predict(*args, **kwargs):
+        fit_threads.append(threading.get_ident())
+        return predict(*args, **kwargs)
+    predictor.predict = recording_predict
+
+    async def run():
+        return threading.get_ident(), await predictor.predict_async(history, "kw", periods=5, mode="fast")
+
+    loop_thread, predictions = asyncio.run(run())
+    assert "ensemble_fast" in predictions
+    assert fit_threads and fit_threads[0] != loop_thread
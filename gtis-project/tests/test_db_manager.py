@@ -0,0 +1,230 @@
+import pytest
+import sys
+sys.path.append('..')
+import asyncio
+import threading
+import time
+import pandas as pd
+from backend.app.database.db_manager import DatabaseManager
+from backend.app.database.backends.sqlite_backend import (
+    TREND_HISTORY_QUERY, PREDICTIONS_QUERY, PREDICTION_RUNS_QUERY, trend_histories_query
+)
+from backend.app.database.migrations import MIGRATIONS
+
+HOT_QUERIES = [
+    (TREND_HISTORY_QUERY, ("python", "", 365)),
+    (trend_histories_query(2, True, True), ("python", "rust", "", "2024-01-01", "2024-02-01")),
+    (PREDICTIONS_QUERY, ("python", "abc123", 30)),
+    (PREDICTION_RUNS_QUERY, ("python", "abc123", 30)),
+    ("""
+        SELECT prediction_date, predicted_value
+        FROM predictions
+        WHERE keyword = ? AND model_name = ?
+        ORDER BY prediction_date
+    """, ("python", "prophet")),
+]
+
+@pytest.fixture
+def db(tmp_path):
+    manager = DatabaseManager(str(tmp_path / "gtis.db"))
+    yield manager
+    manager.close()
+
+def test_migrations_applied_once(db):
+    assert db.backend.schema_version() == max(version for version, _, _ in MIGRATIONS)
+    reopened = DatabaseManager(db.db_path)
+    assert reopened.backend.applied_migrations == []
+    reopened.close()
+
+@pytest.mark.parametrize("query,params", HOT_QUERIES)
+def test_hot_queries_use_indexes(db, query, params):
+    plan = db.backend.pool.connection().execute("EXPLAIN QUERY PLAN " + query, params).fetchall()
+    details = [row[-1] for row in plan]
+    assert details
+    assert not any(detail.startswith("SCAN") for detail in details), details
+    assert not any("TEMP B-TREE" in detail for detail in details), details
+
+def test_bulk_upsert_counts_and_geo_scoped_reads(db):
+    dates = pd.date_range("2024-01-01", periods=10, freq="D", name="date")
+    data = pd.DataFrame({"python": range(10), "rust": range(10, 20)}, index=dates, dtype=float)
+    assert db.store_trends(data, ["python", "rust"]) == {"rows_written": 20, "rows_inserted": 20, "rows_updated": 0}
+    assert db.store_trends(data * 2, ["python"], geo="US") == {
+        "rows_written": 10, "rows_inserted": 10, "rows_updated": 0
+    }
+
+    revised = pd.DataFrame({"python": [100.0, 101.0]}, index=pd.date_range("2024-01-10", periods=2, name="date"))
+    assert db.store_trends(revised, ["python"]) == {"rows_written": 2, "rows_inserted": 1, "rows_updated": 1}
+
+    worldwide = db.get_trend_history("python", days=30)
+    assert list(worldwide["interest_value"]) == [float(v) for v in range(9)] + [100.0, 101.0]
+    assert list(db.get_trend_history("python", days=30, geo="US")["interest_value"]) == [2.0 * v for v in range(10)]
+    assert db.get_trend_history("rust", geo="US").empty
+    assert db.list_keywords(geo="US") == ["python"]
+
+def test_pool_reuses_one_connection_per_thread(db):
+    pool = db.backend.pool
+    conn = pool.connection()
+    before = db.pool_stats()
+    assert pool.connection() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    worker_conns = []
+    worker = threading.Thread(target=lambda: worker_conns.extend([pool.connection(), pool.connection()]))
+    worker.start()
+    worker.join()
+    assert worker_conns[0] is worker_conns[1] is not conn
+
+    stats = db.pool_stats()
+    assert stats["backend"] == "sqlite" and stats["journal_mode"] == "WAL"
+    assert stats["checkouts"] == before["checkouts"] + 3
+    assert stats["connections_opened"] == before["connections_opened"] + 1
+    assert stats["open_connections"] == before["open_connections"]
+    assert stats["connections_closed"] == before["connections_closed"] + 1
+
+def test_parquet_archive_matches_sqlite_api(tmp_path):
+    pytest.importorskip("pyarrow")
+    import pandas as pd
+    archive = DatabaseManager(str(tmp_path / "gtis.db"), trend_archive_dir=str(tmp_path / "archive"))
+    dates = pd.date_range("2024-01-25", periods=14, freq="D", name="date")
+    data = pd.DataFrame({"python": range(14), "rust": range(14)}, index=dates, dtype=float)
+    assert archive.store_trends(data, ["python", "rust"], geo="US")["rows_inserted"] == 28
+    assert archive.store_trends(data, ["python"], geo="US")["rows_updated"] == 14
+    history = archive.get_trend_history("python", days=10, geo="US")
+    assert list(history["interest_value"]) == [float(v) for v in range(4, 14)]
+    assert archive.get_trend_history("python", geo="").empty
+    wide = archive.get_trend_histories(["rust", "python"], geo="US", start="2024-02-01")
+    assert list(wide.columns) == ["rust", "python"]
+    assert len(wide) == 7
+    archive.close()
+
+def test_parquet_dataset_never_lists_partitions_being_written(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    import os
+    from backend.app.database import parquet_store
+    archive = parquet_store.ParquetTrendStore(str(tmp_path / "archive"))
+    visible = []
+    replace = os.replace
+
+    def checked_replace(src, dst):
+        visible.append((src, archive.dataset().files))
+        replace(src, dst)
+
+    monkeypatch.setattr(parquet_store.os, "replace", checked_replace)
+    dates = pd.date_range("2024-01-25", periods=14, freq="D", name="date")
+    archive.store_trends(pd.DataFrame({"python": 1.0}, index=dates), ["python"])
+    assert len(visible) == 2
+    for src, files in visible:
+        assert os.path.basename(src).startswith(".")
+        assert not any(name.endswith(".tmp") for name in files)
+    assert archive.list_keywords() == ["python"]
+
+def test_compaction_downsamples_by_age(db):
+    import pandas as pd
+    from datetime import datetime
+    dates = pd.date_range("2020-01-01", "2024-06-30", freq="D", name="date")
+    db.store_trends(pd.DataFrame({"python": 50.0}, index=dates), ["python"])
+    db.backend.compactor.daily_days, db.backend.compactor.weekly_days = 30, 365
+    db.backend.compactor.min_daily_days = db.backend.compactor.min_weekly_days = 0
+    result = db.backend.compactor.run(now=datetime(2024, 7, 1))
+    history = db.get_trend_history("python", days=len(dates))
+    assert result["rows_after"] == len(history) < len(dates)
+    assert history.index.min() >= pd.Timestamp("2024-05-01")
+    assert history.index.to_series().diff().dt.days.max() == 1
+
+    rollups = db.get_trend_rollups("python")
+    assert result["rollup_rows"] == len(rollups)
+    assert (rollups["interest_value"] == 50.0).all()
+    assert rollups["n_rows"].sum() + len(history) == len(dates)
+    assert set(rollups.loc[:"2023-06-30", "resolution"]) == {"M"}
+    assert rollups.loc[:"2023-06-30"].index.day.unique().tolist() == [1]
+    assert set(rollups.loc["2023-08-01":, "resolution"]) == {"W"}
+
+    again = db.backend.compactor.run(now=datetime(2024, 7, 1))
+    assert (again["rows_after"], again["rollup_rows"]) == (result["rows_after"], result["rollup_rows"])
+    later = db.backend.compactor.run(now=datetime(2024, 10, 1))
+    assert db.get_trend_rollups("python")["n_rows"].sum() + later["rows_after"] == len(dates)
+
+class ConcurrencyProbe:
+    def __init__(self, delay=0.05, barrier=None):
+        self.delay = delay
+        self.barrier = barrier
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.threads = set()
+        self.finished = 0
+
+    def __call__(self, *args, **kwargs):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.threads.add(threading.current_thread().name)
+        try:
+            if self.barrier is not None:
+                self.barrier.wait()
+            time.sleep(self.delay)
+        finally:
+            with self.lock:
+                self.active -= 1
+                self.finished += 1
+        return pd.DataFrame()
+
+def test_compaction_keeps_the_windows_history_readers_request(db):
+    from datetime import datetime
+    daily = pd.date_range("2022-07-01", "2024-06-30", freq="D", name="date")
+    weekly = pd.date_range("2018-06-03", "2024-06-30", freq="W-SUN", name="date")
+    db.store_trends(pd.DataFrame({"python": 50.0}, index=daily), ["python"])
+    db.store_trends(pd.DataFrame({"rust": 30.0}, index=weekly), ["rust"])
+    db.backend.compactor.run(now=datetime(2024, 7, 1))
+
+    history = db.get_trend_history("python", days=365)
+    assert len(history) == 365 and history.index.max() == pd.Timestamp("2024-06-30")
+    assert history.index.to_series().diff().dt.days.max() == 1
+    assert db.get_trend_rollups("python", resolution="W").index.max() < pd.Timestamp("2023-06-25")
+    recent_weeks = db.get_trend_histories(["rust"], start="2019-05-01")
+    assert len(recent_weeks) == (weekly >= "2019-05-01").sum()
+    assert set(db.get_trend_rollups("rust")["resolution"]) == {"M"}
+
+    refetched = pd.date_range("2022-07-03", periods=14, freq="D", name="date")
+    db.store_trends(pd.DataFrame({"python": 80.0}, index=refetched), ["python"])
+    db.backend.compactor.run(now=datetime(2024, 7, 1))
+    rollups = db.get_trend_rollups("python", resolution="W")
+    assert rollups.loc["2022-07-03":"2022-07-10", "n_rows"].tolist() == [7, 7]
+    assert rollups.loc["2022-07-03":"2022-07-10", "interest_value"].tolist() == [80.0, 80.0]
+
+def test_async_writes_are_serialised_on_one_thread(db, monkeypatch):
+    probe = ConcurrencyProbe()
+    monkeypatch.setattr(db.backend, "store_trends", probe)
+
+    async def write_all():
+        await asyncio.gather(*(db.store_trends_async(pd.DataFrame(), ["python"]) for _ in range(5)))
+
+    asyncio.run(write_all())
+    assert probe.finished == 5 and probe.max_active == 1
+    assert len(probe.threads) == 1 and probe.threads.pop().startswith("gtis-db-writer")
+
+def test_async_reads_run_concurrently(db, monkeypatch):
+    probe = ConcurrencyProbe(barrier=threading.Barrier(2, timeout=5))
+    monkeypatch.setattr(db.backend, "get_trend_history", probe)
+
+    async def read_pair():
+        await asyncio.gather(db.get_trend_history_async("python"), db.get_trend_history_async("rust"))
+
+    asyncio.run(read_pair())
+    assert probe.max_active == 2
+    assert all(name.startswith("gtis-db-reader") for name in probe.threads)
+
+def test_close_drains_pending_writes_then_rejects_calls(db, monkeypatch):
+    probe = ConcurrencyProbe(delay=0.2)
+    monkeypatch.setattr(db.backend, "store_trends", probe)
+
+    async def write_then_close():
+        write = asyncio.ensure_future(db.store_trends_async(pd.DataFrame(), ["python"]))
+        await asyncio.sleep(0.05)
+        await asyncio.to_thread(db.close)
+        assert probe.finished == 1
+        await write
+        with pytest.raises(RuntimeError):
+            await db.get_trend_history_async("python")
+
+    asyncio.run(write_then_close())
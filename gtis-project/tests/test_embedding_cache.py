@@ -0,0 +1,63 @@
+import pytest
+import sys
+sys.path.append('..')
+import numpy as np
+from backend.app.models.embedding_cache import EmbeddingCache, EmbeddingStore
+from backend.app.models.nlp_analyzer import NLPAnalyzer
+
+class CountingEncoder:
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, texts):
+        self.batches.append(list(texts))
+        return np.array([[len(text), text.count("a"), 1.0] for text in texts])
+
+class FakeModel(CountingEncoder):
+    def encode(self, texts, **kwargs):
+        return self(texts)
+
+def test_only_unseen_texts_are_encoded_in_one_batch(tmp_path):
+    encoder = CountingEncoder()
+    cache = EmbeddingCache(encoder, "test-model", cache_dir=str(tmp_path), max_entries=2)
+    first = cache.encode(["ai", "llm", "ai"])
+    assert first.dtype == np.float32 and first.shape == (3, 3)
+    assert np.array_equal(first[0], first[2])
+    assert encoder.batches == [["ai", "llm"]]
+
+    cache.encode(["llm", "banana", "ai"])
+    assert encoder.batches[-1] == ["banana"]
+    cache.encode(["llm"])
+    assert len(encoder.batches) == 2
+    stats = cache.stats()
+    assert stats["misses"] == 4 and stats["memory_hits"] == 2 and stats["disk_hits"] == 1
+    assert stats["encode_calls"] == 2 and stats["stored_vectors"] == 3
+
+def test_vectors_survive_restart_via_memmap(tmp_path):
+    expected = EmbeddingCache(CountingEncoder(), "test-model", cache_dir=str(tmp_path)).encode(["rust", "go"])
+    encoder = CountingEncoder()
+    restarted = EmbeddingCache(encoder, "test-model", cache_dir=str(tmp_path))
+    assert np.array_equal(restarted.encode(["go", "rust"]), expected[::-1])
+    assert encoder.batches == [] and restarted.stats()["hit_rate"] == 1.0
+
+def test_stores_sharing_a_directory_append_after_each_other(tmp_path):
+    first = EmbeddingStore(str(tmp_path), "test-model")
+    second = EmbeddingStore(str(tmp_path), "test-model")
+    first.put_many(["a", "b"], np.array([[1, 1], [2, 2]]))
+    second.put_many(["c", "a"], np.array([[3, 3], [9, 9]]))
+    first.put_many(["d"], np.array([[4, 4]]))
+
+    with open(first.matrix_path, "ab") as f:
+        f.write(b"\x00" * 6)
+    reopened = EmbeddingStore(str(tmp_path), "test-model")
+    assert reopened.index == {"a": 0, "b": 1, "c": 2, "d": 3}
+    vectors = reopened.get_many(["a", "b", "c", "d"])
+    assert [vectors[key][0] for key in "abcd"] == [1, 2, 3, 4]
+
+def test_topic_similarity_encodes_both_queries_together(tmp_path):
+    analyzer = NLPAnalyzer(cache_dir=str(tmp_path))
+    analyzer._model = FakeModel()
+    assert analyzer.get_topic_similarity("data", "data") == pytest.approx(1.0)
+    assert analyzer._model.batches == [["data"]]
+    analyzer.get_topic_similarity("data", "banana")
+    assert analyzer._model.batches[-1] == ["banana"]
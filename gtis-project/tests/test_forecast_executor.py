@@ -0,0 +1,50 @@
+import pytest
+import sys
+sys.path.append('..')
+import asyncio
+import numpy as np
+from backend.app.models.forecast_executor import ForecastExecutor, ForecastQueueFull, ForecastTimeout
+from backend.app.models.trend_predictor import TrendPredictor
+from tests.conftest import sine_frame
+
+@pytest.fixture
+def executor(tmp_path, monkeypatch):
+    monkeypatch.setenv("MODEL_CACHE_DIR", str(tmp_path / "models"))
+    executor = ForecastExecutor(max_workers=2, max_pending=4, timeout=60)
+    yield executor
+    executor.shutdown(wait=True)
+
+def test_predict_async_fits_models_in_worker_processes(executor):
+    data = sine_frame()
+    predictor = TrendPredictor(executor=executor)
+    predictions = asyncio.run(predictor.predict_async(data, "python", periods=14))
+    assert set(predictions) == {"prophet", "arima", "ensemble"}
+    assert len(predictions["ensemble"]["values"]) == 14
+
+    expected = TrendPredictor()._predict_arima(predictor._prepare(data), 14)
+    assert np.allclose(predictions["arima"]["values"], expected["values"])
+    assert executor.stats()["completed"] == 2 and executor.stats()["pending"] == 0
+
+    cache = predictor.model_cache_stats()
+    assert cache["cold_fits"] == 2 and cache["workers_reporting"] >= 1
+    asyncio.run(predictor.predict_async(data, "python", periods=14))
+    assert predictor.model_cache_stats()["hits"] + predictor.model_cache_stats()["cold_fits"] == 4
+
+    executor._executor(restart=True)
+    assert executor.stats()["pool_restarts"] == 1
+    assert predictor.model_cache_stats()["workers_reporting"] == 0
+
+def test_queue_is_bounded(executor):
+    df = TrendPredictor()._prepare(sine_frame())
+    futures = [executor.submit("arima", df, 7) for _ in range(4)]
+    with pytest.raises(ForecastQueueFull):
+        executor.submit("arima", df, 7)
+    for future in futures:
+        future.result()
+    assert executor.stats()["rejected"] == 1
+    executor.submit("arima", df, 7).result()
+
+def test_slow_fits_time_out(executor):
+    df = TrendPredictor()._prepare(sine_frame(periods=730))
+    with pytest.raises(ForecastTimeout):
+        asyncio.run(executor.run("prophet", df, 30, timeout=0.01))
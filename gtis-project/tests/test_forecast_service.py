@@ -0,0 +1,75 @@
+import pytest
+import sys
+sys.path.append('..')
+import asyncio
+import numpy as np
+import pandas as pd
+from backend.app.database.db_manager import DatabaseManager
+from backend.app.models.trend_predictor import TrendPredictor
+from backend.app.services.forecast_service import ForecastService
+
+class FakePredictor:
+    def __init__(self):
+        self.fitted = []
+
+    async def predict_async(self, data, keyword, periods=30, timeout=None, mode="accurate"):
+        self.fitted.append(keyword)
+        if keyword == "broken":
+            return {}
+        dates = pd.date_range(data.index.max(), periods=periods + 1, freq="D")[1:].strftime("%Y-%m-%d").tolist()
+        last = float(data.iloc[-1, 0])
+        return {"arima": {"dates": dates, "values": [last] * periods, "mape": 0.1, "rmse": 1.0}}
+
+@pytest.fixture
+def db(tmp_path):
+    manager = DatabaseManager(str(tmp_path / "gtis.db"))
+    dates = pd.date_range("2024-01-01", periods=400, freq="D", name="date")
+    values = np.random.default_rng(0).integers(1, 100, size=(len(dates), 4)).astype(float)
+    manager.store_trends(pd.DataFrame(values, index=dates, columns=["python", "rust", "go", "broken"]),
+                         ["python", "rust", "go", "broken"])
+    yield manager
+    manager.close()
+
+def collect(service, keywords, periods=7):
+    async def run():
+        return [result async for result in service.stream_batch(keywords, periods)]
+    return asyncio.run(run())
+
+def test_batch_streams_one_result_per_keyword(db):
+    predictor = FakePredictor()
+    service = ForecastService(db, predictor)
+    results = collect(service, ["python", "rust", "go", "broken", "missing"])
+    summary = results[-1]
+    by_keyword = {result["keyword"]: result for result in results[:-1]}
+
+    assert summary["status"] == "complete" and summary["keywords"] == 5
+    assert summary["succeeded"] == 3 and summary["failed"] == 2
+    assert by_keyword["python"]["status"] == "success" and not by_keyword["python"]["cached"]
+    assert len(by_keyword["python"]["predictions"]["arima"]["values"]) == 7
+    assert by_keyword["missing"]["detail"] == "no history available"
+    assert sorted(predictor.fitted) == ["broken", "go", "python", "rust"]
+
+def test_batch_and_single_forecasts_share_stored_results(db):
+    predictor = FakePredictor()
+    service = ForecastService(db, predictor)
+    collect(service, ["python", "rust"])
+    single = asyncio.run(service.forecast("python", 7))
+    assert single["cached"]
+
+    again = collect(service, ["python", "rust"])
+    assert again[-1]["cached"] == 2
+    assert sorted(predictor.fitted) == ["python", "rust"]
+
+def test_fast_mode_fits_the_batch_in_one_pass(db):
+    service = ForecastService(db, TrendPredictor())
+    async def run(mode):
+        return [result async for result in service.stream_batch(["python", "rust", "go"], 7, mode=mode)]
+    results = asyncio.run(run("fast"))
+    assert results[-1]["succeeded"] == 3
+    assert all("ensemble_fast" in result["predictions"] for result in results[:-1])
+
+    assert asyncio.run(run("fast"))[-1]["cached"] == 3
+    service.trend_predictor = FakePredictor()
+    accurate = asyncio.run(run("accurate"))
+    assert accurate[-1]["cached"] == 0
+    assert all(set(result["predictions"]) == {"arima"} for result in accurate[:-1])
@@ -0,0 +1,57 @@
+import asyncio
+import pytest
+import sys
+sys.path.append('..')
+import numpy as np
+from backend.app.config import settings
+from backend.app.database.db_manager import DatabaseManager
+from backend.app.models.global_model import GlobalForecaster, GlobalModelUnavailable
+from backend.app.models.model_cache import ModelCache
+from backend.app.models.trend_predictor import TrendPredictor
+from backend.app.services.global_training import GlobalModelTrainer
+from tests.conftest import sine_frame
+
+def make_frame(n_keywords):
+    return sine_frame([f"kw{i}" for i in range(n_keywords)], seed=3, level=(30, 60), amplitude=(5, 15), noise=1.0)
+
+@pytest.fixture
+def predictor(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "MODEL_CACHE_DIR", str(tmp_path / "models"))
+    return TrendPredictor(model_cache=ModelCache())
+
+def test_global_model_learns_shared_seasonality():
+    frame = make_frame(20)
+    Y = frame.iloc[:-14].T.values
+    model = GlobalForecaster().fit(Y, frame.index.dayofweek.values[:-14])
+    forecast = model.forecast(Y, frame.index.dayofweek[-14], 14)
+    actual = frame.iloc[-14:].T.values
+    assert forecast["values"].shape == (20, 14)
+    assert np.mean(np.abs(forecast["values"] - actual) / actual) < 0.1
+    assert (forecast["lower_bound"] < forecast["values"]).all()
+
+def test_training_job_reads_stored_keywords(tmp_path, predictor):
+    db = DatabaseManager(str(tmp_path / "gtis.db"))
+    frame = make_frame(12)
+    db.store_trends(frame, list(frame.columns))
+    info = asyncio.run(GlobalModelTrainer(db, predictor, history_days=10000).train())
+    assert info["series"] == 12 and info["keywords"] == 12
+    db.close()
+
+    restarted = TrendPredictor(model_cache=ModelCache())
+    histories = {keyword: frame[[keyword]] for keyword in ("kw0", "kw5")}
+    results = restarted.predict_many(histories, periods=7, mode="global")
+    assert set(results) == {"kw0", "kw5"}
+    assert len(results["kw0"]["global"]["values"]) == 7 and results["kw0"]["global"]["dates"][0] == "2024-07-19"
+    assert restarted.predict(frame[["kw1"]], "kw1", periods=3, mode="global")["global"]["mape"] < 0.2
+
+def test_training_skips_weekly_histories(predictor):
+    daily = make_frame(6)
+    weekly = daily.resample("W-SUN").mean().add_prefix("weekly_")
+    info = predictor.train_global(daily.join(weekly, how="outer"))
+    assert info["series"] == 6 and info["skipped_series"] == 6
+    with pytest.raises(ValueError, match="daily histories"):
+        predictor.train_global(weekly)
+
+def test_untrained_global_model_is_reported(predictor):
+    with pytest.raises(GlobalModelUnavailable):
+        predictor.predict(make_frame(1), "kw0", periods=7, mode="global")
@@ -0,0 +1,43 @@
+import pytest
+import sys
+sys.path.append('..')
+import asyncio
+import numpy as np
+import pandas as pd
+from backend.app.database.db_manager import DatabaseManager
+from backend.app.services.incremental_refresh import IncrementalRefresher
+from tests.test_pytrends_service import make_service
+from tests.trends_stub import StubTrendsClient
+
+def test_refresh_fetches_only_the_missing_tail(tmp_path):
+    dates = pd.date_range("2024-01-01", "2024-07-20", freq="D", name="date")
+    volumes = {
+        "python": np.linspace(100, 400, len(dates)),
+        "rust": np.linspace(50, 100, len(dates)) * (1 + 0.1 * np.sin(np.arange(len(dates))))
+    }
+    client = StubTrendsClient(volumes=volumes, dates=dates)
+    service = make_service(client)
+    db = DatabaseManager(str(tmp_path / "gtis.db"))
+    refresher = IncrementalRefresher(db, service)
+
+    _, first = asyncio.run(refresher.refresh(list(volumes), timeframe="2024-01-01 2024-06-30"))
+    assert first["mode"] == "full"
+
+    data, second = asyncio.run(refresher.refresh(list(volumes), timeframe="2024-01-01 2024-07-20"))
+    assert second["mode"] == "incremental"
+    assert second["new_points"] == 20
+    assert client.payloads[-1][1] == "2024-06-26 2024-07-20"
+    assert data.index.max() == pd.Timestamp("2024-07-20")
+
+    expected = service.fetch_interest_over_time(list(volumes), timeframe="2024-01-01 2024-07-20")
+    assert np.allclose(data.values, expected.values, atol=1.5)
+
+    n_payloads = len(client.payloads)
+    _, third = asyncio.run(refresher.refresh(list(volumes), timeframe="2024-01-01 2024-07-20"))
+    assert third["mode"] == "up_to_date"
+    assert len(client.payloads) == n_payloads
+
+    stored = db.get_trend_histories(list(volumes))
+    assert stored.index.max() == pd.Timestamp("2024-07-20")
+    service.shutdown()
+    db.close()
@@ -0,0 +1,37 @@
+import pytest
+import os
+import subprocess
+import sys
+sys.path.append('..')
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+HEAVY_MODULES = ["prophet", "statsmodels", "sentence_transformers", "umap", "hdbscan", "torch", "scipy.stats", "pyarrow.dataset", "pyarrow.parquet"]
+
+@pytest.fixture
+def run_backend(tmp_path):
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{tmp_path}/gtis.db", "MODEL_CACHE_DIR": str(tmp_path / "models"),
+           "EMBEDDING_CACHE_DIR": str(tmp_path / "embeddings")}
+
+    def run(code: str):
+        result = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=env, capture_output=True,
+                                text=True, timeout=300)
+        assert result.returncode == 0, result.stderr
+        return result.stdout.split()
+    return run
+
+def test_app_import_skips_heavy_ml_dependencies(run_backend):
+    loaded = run_backend(
+        "import sys, app.main\n"
+        f"print(*[module for module in {HEAVY_MODULES!r} if module in sys.modules] or ['none'])\n"
+        "print(app.main.trend_predictor.is_ready(), app.main.nlp_analyzer.is_ready())"
+    )
+    assert loaded == ["none", "False", "False"]
+
+def test_forecasting_readiness_follows_loading(run_backend):
+    assert run_backend(
+        "from app.models.trend_predictor import TrendPredictor\n"
+        "predictor = TrendPredictor()\n"
+        "print(predictor.is_ready())\n"
+        "predictor.load()\n"
+        "print(predictor.is_ready())"
+    ) == ["False", "True"]
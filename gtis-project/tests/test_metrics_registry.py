@@ -0,0 +1,41 @@
+import pytest
+import sys
+sys.path.append('..')
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from backend.app.models.metrics_registry import MetricsRegistry
+from backend.app.models.model_cache import ModelCache
+from backend.app.models.trend_predictor import TrendPredictor
+
+def test_concurrent_records_are_merged():
+    registry = MetricsRegistry(latency_buckets=(0.1, 1.0), mape_buckets=(0.1,))
+
+    def record(i):
+        registry.record_fit("arima", fit_seconds=0.05 if i % 2 else 0.5, mape=0.05, fit_mode="cold")
+        if i % 10 == 0:
+            registry.record_failure("arima", "ForecastTimeout")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(record, range(1000)))
+
+    arima = registry.snapshot()["arima"]
+    assert arima["fits"] == 1000 and arima["fit_modes"] == {"cold": 1000}
+    assert arima["failures"] == 100 and arima["failure_reasons"] == {"ForecastTimeout": 100}
+    assert arima["fit_latency_seconds"]["buckets"] == {"le_0.1": 500, "le_1": 1000, "inf": 1000}
+    assert arima["mape"]["count"] == 1000 and arima["mape"]["mean"] == pytest.approx(0.05)
+
+def test_predictions_carry_their_own_metrics():
+    predictor = TrendPredictor(model_cache=ModelCache())
+    dates = pd.date_range("2024-01-01", periods=60, freq="D", name="date")
+    rng = np.random.default_rng(0)
+    histories = {
+        "steady": pd.DataFrame({"interest_value": 50 + rng.normal(0, 1, 60)}, index=dates),
+        "noisy": pd.DataFrame({"interest_value": 50 + rng.normal(0, 15, 60)}, index=dates)
+    }
+    results = predictor.predict_fast(histories, periods=7)
+    assert results["noisy"]["damped_trend"]["mape"] > results["steady"]["damped_trend"]["mape"]
+    assert results["steady"]["damped_trend"]["fit_seconds"] >= 0
+
+    snapshot = predictor.metrics_registry.snapshot()
+    assert snapshot["damped_trend"]["fits"] == 2 and snapshot["damped_trend"]["failures"] == 0
@@ -0,0 +1,53 @@
+import pytest
+import sys
+sys.path.append('..')
+import numpy as np
+from backend.app.models.model_cache import ModelCache
+from backend.app.models.trend_predictor import TrendPredictor
+from tests.conftest import sine_frame
+
+def test_fitted_models_are_reused_then_warm_started(tmp_path):
+    cache = ModelCache(cache_dir=str(tmp_path), max_entries=4)
+    predictor = TrendPredictor(model_cache=cache)
+    history = sine_frame(periods=200)
+
+    first = predictor.predict(history.iloc[:180], "python", periods=7)
+    assert first["arima"]["fit_mode"] == "cold" and first["prophet"]["fit_mode"] == "cold"
+
+    again = predictor.predict(history.iloc[:180], "python", periods=14)
+    assert again["arima"]["fit_mode"] == "cached" and again["prophet"]["fit_mode"] == "cached"
+    assert np.allclose(again["arima"]["values"][:7], first["arima"]["values"])
+
+    appended = predictor.predict(history.iloc[10:], "python", periods=7)
+    assert appended["arima"]["fit_mode"] == "warm" and appended["prophet"]["fit_mode"] == "warm"
+    cold = TrendPredictor(model_cache=ModelCache())._predict_arima(predictor._prepare(history.iloc[10:]), 7)
+    assert np.allclose(appended["arima"]["values"], cold["values"], rtol=1e-2, atol=0.5)
+
+    revised = history.iloc[:190].copy()
+    revised.iloc[100, 0] += 5
+    assert predictor.predict(revised, "python", periods=7)["arima"]["fit_mode"] == "cold"
+    assert cache.stats()["hits"] == 2 and cache.stats()["warm_starts"] == 2
+
+def test_disk_cache_survives_restart(tmp_path):
+    predictor = TrendPredictor(model_cache=ModelCache(cache_dir=str(tmp_path)))
+    df = predictor._prepare(sine_frame(periods=120))
+    predictor._predict_arima(df, 7, "rust")
+    restarted = ModelCache(cache_dir=str(tmp_path))
+    result = TrendPredictor(model_cache=restarted)._predict_arima(df, 7, "rust")
+    assert result["fit_mode"] == "cached" and restarted.stats()["disk_hits"] == 1
+
+def test_disk_entries_hold_parameters_and_stay_within_budget(tmp_path):
+    cache = ModelCache(cache_dir=str(tmp_path), max_disk_bytes=40_000)
+    predictor = TrendPredictor(model_cache=cache)
+    df = predictor._prepare(sine_frame(periods=365))
+    predictor._predict_arima(df, 7, "python")
+    (arima_entry,) = (tmp_path / "arima").iterdir()
+    assert arima_entry.stat().st_size < 20_000
+
+    for i in range(10):
+        cache.store("prophet", f"kw{i}", df, "x" * 8_000, {})
+    on_disk = [path for path in tmp_path.rglob("*.pkl")]
+    assert sum(path.stat().st_size for path in on_disk) <= 40_000
+    assert cache.stats()["disk_evictions"] > 0
+    restarted = ModelCache(cache_dir=str(tmp_path))
+    assert restarted.latest("prophet", "kw9") is not None and restarted.latest("prophet", "kw0") is None
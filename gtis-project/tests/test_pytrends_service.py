@@ -0,0 +1,99 @@
+import pytest
+import sys
+sys.path.append('..')
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from backend.app.services.rate_limiter import RequestScheduler
+from backend.app.services.pytrends_service import PyTrendsService, chunk_keywords, daily_windows
+from backend.app.services.trends_cache import TrendsCache
+from tests.trends_stub import StubTrendsClient
+
+def make_service(client, workers=1):
+    scheduler = RequestScheduler(lambda: client, rate=1000, burst=1000, workers=workers)
+    return PyTrendsService(scheduler=scheduler)
+
+def test_chunk_keywords_share_anchor():
+    keywords = [f"kw{i}" for i in range(10)]
+    batches = chunk_keywords(keywords, "kw0")
+    assert all(batch[0] == "kw0" and len(batch) <= 5 for batch in batches)
+    assert sorted({kw for batch in batches for kw in batch}) == sorted(keywords)
+
+def test_large_comparisons_are_rescaled_onto_one_scale():
+    dates = pd.date_range("2024-01-01", periods=30, freq="D", name="date")
+    rng = np.random.default_rng(1)
+    volumes = {f"kw{i}": (i + 1) * 1000 * (1 + rng.random(len(dates))) for i in range(12)}
+    client = StubTrendsClient(volumes=volumes, dates=dates)
+    service = make_service(client, workers=3)
+
+    data = service.fetch_interest_over_time(list(volumes), anchor="kw5")
+    assert list(data.columns) == list(volumes)
+    assert all(len(kw_list) <= 5 and kw_list[0] == "kw5" for kw_list, _, _ in client.payloads)
+    assert data.values.max() == pytest.approx(100)
+
+    truth = pd.DataFrame(volumes, index=dates)
+    expected = truth.mean() / truth.mean().max()
+    observed = data.mean() / data.mean().max()
+    assert np.allclose(observed, expected, rtol=0.05)
+    service.shutdown()
+
+def test_long_timeframes_are_stitched_from_daily_windows():
+    dates = pd.date_range("2022-01-01", "2023-12-31", freq="D", name="date")
+    trend = np.linspace(10, 200, len(dates)) * (1 + 0.2 * np.sin(np.arange(len(dates)) / 7))
+    client = StubTrendsClient(volumes={"python": trend, "rust": trend / 4}, dates=dates)
+    service = make_service(client, workers=2)
+
+    stitched = service.fetch_daily_interest_over_time(["python", "rust"], timeframe="2022-01-01 2023-12-31")
+    assert len(stitched) == len(dates)
+    assert (stitched.index.to_series().diff().dropna() == pd.Timedelta(days=1)).all()
+    assert len(client.payloads) == len(daily_windows(dates[0], dates[-1]))
+    expected = pd.Series(trend, index=dates) * 100 / trend.max()
+    assert np.allclose(stitched["python"], expected, atol=1.5)
+
+    existing = stitched.loc[:"2023-10-31"]
+    client.payloads.clear()
+    refreshed = service.fetch_daily_interest_over_time(["python", "rust"], timeframe="2022-01-01 2023-12-31",
+                                                       existing=existing)
+    assert len(client.payloads) == 1
+    assert client.payloads[0][1].startswith("2023-09-")
+    assert np.allclose(refreshed["python"], expected, atol=1.5)
+    service.shutdown()
+
+class NoDefaultExecutor(ThreadPoolExecutor):
+    def submit(self, *args, **kwargs):
+        raise AssertionError("async PyTrends calls must not occupy default executor threads")
+
+def test_async_fetches_await_the_scheduler_directly():
+    dates = pd.date_range("2024-01-01", periods=30, freq="D", name="date")
+    volumes = {f"kw{i}": np.full(len(dates), (i + 1) * 10.0) for i in range(7)}
+    client = StubTrendsClient(volumes=volumes, dates=dates)
+    service = make_service(client, workers=2)
+
+    async def main():
+        asyncio.get_running_loop().set_default_executor(NoDefaultExecutor())
+        return await asyncio.gather(
+            service.fetch_interest_over_time_async(["kw0"]),
+            service.fetch_interest_over_time_async(["kw0"]),
+            service.fetch_interest_over_time_async(list(volumes), anchor="kw6")
+        )
+
+    single, coalesced, chunked = asyncio.run(main())
+    assert single.equals(coalesced) and list(chunked.columns) == list(volumes)
+    assert len(client.payloads) == 1 + 2
+    assert service.cache_stats()["coalesced"] == 1
+    service.shutdown()
+
+def test_refresh_bypasses_the_persisted_cache_entry(tmp_path):
+    client = StubTrendsClient()
+    scheduler = RequestScheduler(lambda: client, rate=1000, burst=1000, workers=1)
+    service = PyTrendsService(cache=TrendsCache(cache_dir=str(tmp_path)), scheduler=scheduler)
+    assert service.get_related_queries("python") == ["v1"]
+    assert service.get_related_queries("python") == ["v1"]
+    assert service.get_related_queries("python", refresh=True) == ["v2"]
+    assert asyncio.run(service.get_related_queries_async("python", refresh=True)) == ["v3"]
+
+    restarted = PyTrendsService(cache=TrendsCache(cache_dir=str(tmp_path)), scheduler=scheduler)
+    assert restarted.get_related_queries("python") == ["v3"]
+    assert len(client.calls) == 3
+    service.shutdown()
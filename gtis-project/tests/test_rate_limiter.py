@@ -0,0 +1,61 @@
+import asyncio
+import threading
+import time
+import pytest
+import sys
+sys.path.append('..')
+from backend.app.services.rate_limiter import BACKGROUND, INTERACTIVE, RequestScheduler, TokenBucket
+from backend.app.services.pytrends_service import PyTrendsService
+from tests.trends_stub import StubTrendsClient
+
+def test_token_bucket_paces_requests():
+    bucket = TokenBucket(rate=20, capacity=1)
+    started = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    assert time.monotonic() - started >= 4 / 20 * 0.9
+
+def test_interactive_requests_jump_background_queue():
+    scheduler = RequestScheduler(lambda: None, rate=1000, burst=1000, workers=1)
+    gate = threading.Event()
+    order = []
+    scheduler.submit(lambda client: gate.wait(), BACKGROUND)
+    time.sleep(0.05)
+    background = [scheduler.submit(lambda client, i=i: order.append(f"bg{i}"), BACKGROUND) for i in range(3)]
+    interactive = scheduler.submit(lambda client: order.append("interactive"), INTERACTIVE)
+    gate.set()
+    for future in background + [interactive]:
+        future.result(timeout=5)
+    assert order[0] == "interactive"
+    scheduler.shutdown()
+
+def test_rate_limited_calls_back_off_and_retry():
+    client = StubTrendsClient(throttled_calls=2)
+    scheduler = RequestScheduler(lambda: client, rate=1000, burst=1, max_retries=3, backoff_base=0.05)
+    service = PyTrendsService(scheduler=scheduler)
+    data = service.fetch_interest_over_time(["python"])
+    assert list(data.columns) == ["python"]
+    assert len(client.calls) == 3
+    assert client.calls[2] - client.calls[1] >= 0.05
+    assert scheduler.stats()["rate_limited"] == 2
+    scheduler.shutdown()
+
+def test_async_interface_does_not_block_event_loop():
+    scheduler = RequestScheduler(lambda: None, rate=5, burst=1, workers=1)
+
+    async def main():
+        ticks = 0
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+        task = asyncio.create_task(ticker())
+        results = await asyncio.gather(*(scheduler.run_async(lambda client, i=i: i) for i in range(3)))
+        task.cancel()
+        return results, ticks
+
+    results, ticks = asyncio.run(main())
+    assert results == [0, 1, 2]
+    assert ticks > 10
+    scheduler.shutdown()
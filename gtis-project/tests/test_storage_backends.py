@@ -0,0 +1,99 @@
+import time
+from datetime import datetime
+import pytest
+import sys
+sys.path.append('..')
+import numpy as np
+import pandas as pd
+from backend.app.database.db_manager import DatabaseManager
+from backend.app.database.backends import StorageBackend
+
+BACKENDS = ["sqlite", "duckdb"]
+
+@pytest.fixture(params=BACKENDS)
+def db(request, tmp_path):
+    if request.param == "duckdb":
+        pytest.importorskip("duckdb")
+    manager = DatabaseManager(database_url=f"{request.param}:///{tmp_path}/gtis.{request.param}")
+    yield manager
+    manager.close()
+
+def make_frame(keywords, periods, start="2020-01-01"):
+    dates = pd.date_range(start, periods=periods, freq="D", name="date")
+    values = np.random.default_rng(0).integers(0, 100, size=(periods, len(keywords))).astype(float)
+    return pd.DataFrame(values, index=dates, columns=keywords)
+
+def test_store_trends_upserts_and_reports(db):
+    data = make_frame(["python", "rust"], 10)
+    assert db.store_trends(data, ["python", "rust", "absent"], geo="US") == {
+        "rows_written": 20, "rows_inserted": 20, "rows_updated": 0
+    }
+    data["python"] += 1
+    assert db.store_trends(data, ["python"], geo="US")["rows_updated"] == 10
+    history = db.get_trend_history("python", days=5, geo="US")
+    assert list(history["interest_value"]) == list(data["python"].tail(5))
+    assert db.get_trend_history("python").empty
+
+def test_trend_histories_aligned_and_filtered(db):
+    dates = pd.date_range("2024-01-01", periods=10, freq="D", name="date")
+    db.store_trends(pd.DataFrame({"python": range(10)}, index=dates, dtype=float), ["python"])
+    db.store_trends(pd.DataFrame({"rust": range(5)}, index=dates[5:], dtype=float), ["rust"])
+    wide = db.get_trend_histories(["rust", "python", "missing"], start="2024-01-04", end="2024-01-07")
+    assert list(wide.columns) == ["rust", "python", "missing"]
+    assert list(wide.index.strftime("%Y-%m-%d")) == ["2024-01-04", "2024-01-05", "2024-01-06", "2024-01-07"]
+    assert wide["rust"].isna().sum() == 2
+    assert wide["missing"].isna().all()
+    assert len(db.get_trend_histories(["python"])) == 10
+    assert db.list_keywords() == ["python", "rust"] and db.list_keywords(geo="US") == []
+
+def test_predictions_round_trip(db):
+    predictions = {
+        "prophet": {"dates": ["2024-01-01", "2024-01-02"], "values": [1.0, 2.0],
+                    "lower_bound": [0.5, 1.5], "upper_bound": [1.5, 2.5], "mape": 0.1, "rmse": 2.0},
+        "ensemble": {"dates": ["2024-01-01", "2024-01-02"], "values": [1.0, 2.0],
+                     "weights": {"prophet": 1.0}}
+    }
+    forecast = {"keyword": "python", "horizon": 2, "fingerprint": "abc123", "predictions": predictions}
+    assert db.store_predictions([forecast]) == 4
+    assert db.store_predictions([forecast]) == 4
+    stored = db.get_predictions([("python", 2, "abc123"), ("python", 2, "stale")])
+    assert stored == {("python", 2, "abc123"): predictions}
+
+def test_bulk_load_throughput(db):
+    keywords = [f"keyword_{i}" for i in range(20)]
+    data = make_frame(keywords, 5 * 365)
+    started = time.perf_counter()
+    result = db.store_trends(data, keywords)
+    elapsed = time.perf_counter() - started
+    assert result["rows_inserted"] == data.size
+    assert data.size / elapsed > 5000, f"{data.size / elapsed:.0f} rows/s"
+    started = time.perf_counter()
+    wide = db.get_trend_histories(keywords)
+    assert wide.shape == data.shape
+    assert time.perf_counter() - started < 5
+
+def test_watchlist_round_trip(db):
+    db.add_watch("python", geo="US", refresh_minutes=30, horizon=14)
+    db.add_watch("python", geo="US", timeframe="today 5-y", refresh_minutes=60, horizon=14)
+    db.add_watch("rust")
+    watches = db.list_watches()
+    assert [(w["keyword"], w["geo"]) for w in watches] == [("python", "US"), ("rust", "")]
+    assert watches[0]["timeframe"] == "today 5-y" and watches[0]["refresh_minutes"] == 60
+    assert watches[0]["last_refreshed_at"] is None
+
+    refreshed_at = datetime(2024, 1, 1, 12, 30)
+    db.mark_watch_refreshed("python", "US", refreshed_at, error="forecast: boom")
+    watch = db.list_watches()[0]
+    assert watch["last_refreshed_at"] == refreshed_at and watch["last_error"] == "forecast: boom"
+
+    assert db.remove_watch("rust")
+    assert not db.remove_watch("rust")
+    assert len(db.list_watches()) == 1
+
+def test_incomplete_backend_fails_at_construction():
+    class PartialBackend(StorageBackend):
+        def store_trends(self, data, keywords, geo=""):
+            return {}
+
+    with pytest.raises(TypeError, match="abstract"):
+        PartialBackend()
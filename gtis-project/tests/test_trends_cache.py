@@ -0,0 +1,56 @@
+import threading
+import time
+import pytest
+import sys
+sys.path.append('..')
+from backend.app.services.trends_cache import TrendsCache, ttl_for_timeframe
+
+def test_ttl_depends_on_timeframe():
+    assert ttl_for_timeframe("now 1-H") < ttl_for_timeframe("today 12-m") <= ttl_for_timeframe("today 5-y")
+    assert ttl_for_timeframe("2020-01-01 2020-06-01") == ttl_for_timeframe("unknown")
+
+def test_hits_expiry_and_lru_eviction():
+    cache = TrendsCache(max_entries=2)
+    calls = []
+    fetch = lambda name: (lambda: calls.append(name) or [name])
+    assert cache.get_or_fetch("a", 60, fetch("a")) == ["a"]
+    assert cache.get_or_fetch("a", 60, fetch("a")) == ["a"]
+    cache.get_or_fetch("b", 60, fetch("b"))
+    cache.get_or_fetch("c", 60, fetch("c"))
+    cache.get_or_fetch("a", 60, fetch("a"))
+    cache.get_or_fetch("expired", -1, fetch("expired"))
+    cache.get_or_fetch("expired", -1, fetch("expired"))
+    assert calls == ["a", "b", "c", "a", "expired", "expired"]
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 6 and stats["evictions"] >= 2
+
+def test_empty_results_are_not_cached():
+    cache = TrendsCache()
+    calls = []
+    for _ in range(2):
+        cache.get_or_fetch("k", 60, lambda: calls.append(1) or [], cacheable=lambda v: len(v) > 0)
+    assert len(calls) == 2
+
+def test_concurrent_identical_requests_share_one_fetch():
+    cache = TrendsCache()
+    calls = []
+    def slow_fetch():
+        calls.append(1)
+        time.sleep(0.2)
+        return ["value"]
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch("k", 60, slow_fetch)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert results == [["value"]] * 8
+    assert cache.stats()["coalesced"] == 7
+
+def test_disk_persistence_survives_restart(tmp_path):
+    TrendsCache(cache_dir=str(tmp_path)).get_or_fetch(("m", ("kw",), "today 12-m", ""), 60, lambda: ["v"])
+    restarted = TrendsCache(cache_dir=str(tmp_path))
+    assert restarted.get_or_fetch(("m", ("kw",), "today 12-m", ""), 60, lambda: pytest.fail("refetched")) == ["v"]
+    assert restarted.stats()["disk_hits"] == 1
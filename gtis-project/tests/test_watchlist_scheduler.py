@@ -0,0 +1,82 @@
+import pytest
+import sys
+sys.path.append('..')
+import asyncio
+from datetime import datetime, timedelta
+import pandas as pd
+from backend.app.database.db_manager import DatabaseManager
+from backend.app.services.forecast_service import ForecastService
+from backend.app.services.rate_limiter import BACKGROUND
+from backend.app.services.watchlist_scheduler import WatchlistScheduler, watch_jobs
+
+class RecordingPredictor:
+    def __init__(self):
+        self.fitted = []
+
+    async def predict_async(self, data, keyword, periods=30, timeout=None, mode="accurate"):
+        self.fitted.append((keyword, float(data.iloc[-1, 0])))
+        return {"arima": {"dates": ["2024-02-01"] * periods, "values": [1.0] * periods, "mape": 0.1, "rmse": 1.0}}
+
+class RecordingTrendsService:
+    def __init__(self):
+        self.calls = []
+
+    async def refresh(self, keywords, timeframe="today 12-m", geo="", anchor=None, priority=None):
+        self.calls.append(("trends", geo, priority))
+
+    async def get_interest_by_region_async(self, keyword, geo="", priority=None, refresh=False):
+        self.calls.append(("regional_interest", geo, priority))
+
+    async def get_related_queries_async(self, keyword, geo="", priority=None, refresh=False):
+        self.calls.append(("related_queries", geo, priority))
+
+def test_due_watches_are_refreshed_and_observed(tmp_path):
+    db = DatabaseManager(str(tmp_path / "gtis.db"))
+    db.add_watch("python", refresh_minutes=60)
+    db.add_watch("rust", geo="US", refresh_minutes=60)
+    calls = []
+
+    async def trends(watch):
+        calls.append(("trends", watch["keyword"]))
+
+    async def forecast(watch):
+        calls.append(("forecast", watch["keyword"]))
+        if watch["keyword"] == "rust":
+            raise RuntimeError("no history")
+
+    async def run_ticks():
+        scheduler = WatchlistScheduler(db, jobs={"trends": trends, "forecast": forecast}, concurrency=1)
+        due = [await scheduler.tick()]
+        watches = {w["keyword"]: w for w in db.list_watches()}
+        due.append(await scheduler.tick())
+        due.append(await scheduler.tick(now=datetime.now() + timedelta(minutes=90)))
+        return scheduler, watches, due
+
+    scheduler, watches, due = asyncio.run(run_ticks())
+    assert due == [2, 0, 2]
+    assert sorted(calls[:4]) == [("forecast", "python"), ("forecast", "rust"), ("trends", "python"), ("trends", "rust")]
+
+    assert watches["python"]["last_refreshed_at"] is not None and watches["python"]["last_error"] is None
+    assert watches["rust"]["last_error"] == "forecast: no history"
+
+    stats = scheduler.stats()
+    assert stats["refreshed"] == 4 and stats["ticks"] == 3
+    assert stats["jobs"]["forecast"]["runs"] == 4 and stats["jobs"]["forecast"]["failures"] == 2
+    assert stats["lag"]["last_seconds"] is not None
+    db.close()
+
+def test_watch_jobs_use_the_watched_geo(tmp_path):
+    db = DatabaseManager(str(tmp_path / "gtis.db"))
+    dates = pd.date_range("2024-01-01", periods=30, freq="D", name="date")
+    db.store_trends(pd.DataFrame({"python": 10.0}, index=dates), ["python"])
+    db.store_trends(pd.DataFrame({"python": 70.0}, index=dates), ["python"], geo="US")
+    db.add_watch("python", geo="US", horizon=7)
+    predictor = RecordingPredictor()
+    trends = RecordingTrendsService()
+    jobs = watch_jobs(trends, trends, ForecastService(db, predictor))
+
+    assert asyncio.run(WatchlistScheduler(db, jobs=jobs).tick()) == 1
+    assert trends.calls == [(name, "US", BACKGROUND) for name in ("trends", "regional_interest", "related_queries")]
+    assert predictor.fitted == [("python@US", 70.0)]
+    assert db.list_watches()[0]["last_error"] is None
+    db.close()
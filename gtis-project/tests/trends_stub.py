@@ -0,0 +1,55 @@
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+class StubResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+class StubTrendsError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"The request failed: Google returned a response with code {status_code}")
+        self.response = StubResponse(status_code)
+
+class StubTrendsClient:
+    def __init__(self, volumes: dict = None, dates: pd.DatetimeIndex = None, throttled_calls: int = 0):
+        self.dates = dates if dates is not None else pd.date_range("2024-01-01", periods=3, freq="D", name="date")
+        self.volumes = volumes or {}
+        self.throttled_calls = throttled_calls
+        self.calls = []
+        self.payloads = []
+        self._payload = threading.local()
+
+    def build_payload(self, kw_list, cat=0, timeframe='today 12-m', geo='', gprop=''):
+        self._payload.kw_list = kw_list
+        self._payload.timeframe = timeframe
+        self.payloads.append((list(kw_list), timeframe, geo))
+
+    def _raw_volume(self, keyword):
+        if keyword in self.volumes:
+            return pd.Series(self.volumes[keyword], index=self.dates).reindex(self.dates)
+        return pd.Series(np.arange(1.0, len(self.dates) + 1), index=self.dates)
+
+    def interest_over_time(self):
+        self.calls.append(time.monotonic())
+        if self.throttled_calls:
+            self.throttled_calls -= 1
+            raise StubTrendsError(429)
+        kw_list, timeframe = self._payload.kw_list, self._payload.timeframe
+        if len(kw_list) > 5:
+            raise StubTrendsError(400)
+        raw = pd.DataFrame({kw: self._raw_volume(kw) for kw in kw_list}, index=self.dates)
+        if " " in timeframe and not timeframe.startswith(("today", "now")):
+            start, end = timeframe.split(" ")
+            raw = raw.loc[start:end]
+        raw = raw.dropna()
+        data = (raw * 100 / raw.max().max()).round()
+        data.index.name = "date"
+        data["isPartial"] = False
+        return data
+
+    def related_queries(self):
+        self.calls.append(time.monotonic())
+        version = f"v{len(self.calls)}"
+        return {kw: {"top": pd.DataFrame({"query": [version]}), "rising": None} for kw in self._payload.kw_list}